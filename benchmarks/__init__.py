@@ -0,0 +1,6 @@
+"""
+Benchmarks Package
+
+Microbenchmarks for the parsing and lookup hot paths of the backend, run
+against the BOM sample products in benchmarks/fixtures. See run.py.
+"""
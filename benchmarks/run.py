@@ -0,0 +1,317 @@
+"""
+Benchmark Runner
+
+Times the parsing and lookup hot paths against the checked-in BOM fixtures
+and writes the results as JSON, so a change can be compared with an
+earlier run:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --filter forecast --compare benchmarks/results/before.json
+
+Each benchmark is calibrated to run for at least --min-time seconds per
+repeat; the per-call minimum, median, mean and standard deviation across
+repeats are reported. The median is what --compare uses.
+
+Upstream downloads go through the real upstream/single-flight/cache code
+with an httpx mock transport serving the fixtures, so no network is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from unittest import mock
+
+import feedparser
+import httpx
+
+from src.api.v1.endpoints.weather import fetch_historical_data, parse_history_csv
+from src.core import bom, helpers, upstream
+from src.core.bom_warnings import parse_warning_details, parse_warnings_feed
+from src.core.config import settings
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Station registry sizes for the nearest-station lookup
+STATION_COUNTS = (9, 1_000, 10_000, 100_000)
+
+HISTORY_STATION = {
+    "station_id": "94610",
+    "history_url_template": "https://www.bom.gov.au/climate/dwo/YYYYMM/text/IDCJDW6111.YYYYMM.csv",
+}
+OBSERVATION_URL = "http://www.bom.gov.au/fwo/IDW60801/IDW60801.94610.json"
+
+# name -> (params, setup); setup(stack, loop) returns the callable to time
+BENCHMARKS: Dict[str, Tuple[Dict[str, Any], Callable[[ExitStack, asyncio.AbstractEventLoop], Callable[[], Any]]]] = {}
+
+
+def benchmark(name: str, **params: Any):
+    """Register a benchmark setup function under name."""
+    def register(setup):
+        BENCHMARKS[name] = (params, setup)
+        return setup
+    return register
+
+
+def read_fixture(name: str) -> bytes:
+    """Read a file from benchmarks/fixtures."""
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def mock_bom(stack: ExitStack, loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Serve BOM URLs from the fixtures through the pooled BOM client.
+
+    Requests are answered by file name (the last path segment), so the
+    history, observation and warning URLs map onto the fixture files.
+    """
+    def handler(request):
+        name = request.url.path.rsplit("/", 1)[-1]
+        path = os.path.join(FIXTURES_DIR, name)
+        if not os.path.exists(path):
+            return httpx.Response(404)
+        return httpx.Response(200, content=read_fixture(name))
+
+    upstream._clients[upstream.BOM] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    stack.callback(lambda: loop.run_until_complete(upstream.close_clients()))
+
+
+@benchmark("parse_forecast_for_station", fixture="IDW14199.xml", aac="WA_PT053")
+def bench_parse_forecast(stack, loop):
+    content = read_fixture("IDW14199.xml")
+    return lambda: bom.parse_forecast_for_station(content, "WA_PT053")
+
+
+@benchmark("bom_observations_download", fixture="IDW60801.94610.json")
+def bench_observations(stack, loop):
+    mock_bom(stack, loop)
+    return lambda: loop.run_until_complete(bom._download_observations(OBSERVATION_URL))
+
+
+@benchmark("parse_history_csv", fixture="IDCJDW6111.202501.csv")
+def bench_parse_history_csv(stack, loop):
+    content = read_fixture("IDCJDW6111.202501.csv")
+    return lambda: parse_history_csv(content)
+
+
+def _history_setup(stack, loop, warm):
+    mock_bom(stack, loop)
+    root = tempfile.mkdtemp(prefix="history-bench-")
+    stack.callback(shutil.rmtree, root, ignore_errors=True)
+    stack.enter_context(mock.patch.object(settings, "HISTORY_CACHE_DIR", root))
+    start, end = datetime(2025, 1, 1), datetime(2025, 3, 31)
+    if warm:
+        loop.run_until_complete(fetch_historical_data(HISTORY_STATION, start, end))
+
+    def run():
+        if not warm:
+            # An empty store each time, so every month is downloaded and parsed
+            settings.HISTORY_CACHE_DIR = tempfile.mkdtemp(dir=root)
+        return loop.run_until_complete(fetch_historical_data(HISTORY_STATION, start, end))
+    return run
+
+
+@benchmark("fetch_historical_data_cold", months=3, store="empty")
+def bench_history_cold(stack, loop):
+    return _history_setup(stack, loop, warm=False)
+
+
+@benchmark("fetch_historical_data_warm", months=3, store="populated")
+def bench_history_warm(stack, loop):
+    return _history_setup(stack, loop, warm=True)
+
+
+@benchmark("feedparser_warnings_rss", fixture="IDZ00060.warnings_wa.xml")
+def bench_feedparser(stack, loop):
+    content = read_fixture("IDZ00060.warnings_wa.xml")
+    return lambda: feedparser.parse(content)
+
+
+@benchmark("parse_warnings_feed", fixture="IDZ00060.warnings_wa.xml", fetch_details=False)
+def bench_parse_warnings_feed(stack, loop):
+    feed_data = {"feed": feedparser.parse(read_fixture("IDZ00060.warnings_wa.xml")), "url": None}
+    return lambda: loop.run_until_complete(parse_warnings_feed(feed_data, fetch_details=False))
+
+
+@benchmark("parse_warning_details", fixture="IDW21033.shtml")
+def bench_parse_warning_details(stack, loop):
+    content = read_fixture("IDW21033.shtml")
+    return lambda: parse_warning_details(content)
+
+
+def scaled_stations(count: int) -> List[Dict[str, Any]]:
+    """
+    Build a station registry of the given size from data/station.json.
+
+    The real stations come first; the rest are copies spread deterministically
+    across Western Australia.
+    """
+    real = helpers.load_stations().get("PerthStations", [])
+    stations = list(real[:count])
+    for i in range(len(stations), count):
+        template = real[i % len(real)]
+        stations.append(dict(template, station_id=f"bench{i}",
+                             lat=-35.0 + (i * 0.6180339887) % 21.0,
+                             lon=113.0 + (i * 0.4142135623) % 16.0))
+    return stations
+
+
+def _nearest_setup(count):
+    def setup(stack, loop):
+        index = helpers.StationIndex(scaled_stations(count))
+        stack.enter_context(mock.patch.object(helpers, "get_station_index", return_value=index))
+        return lambda: helpers.find_nearest_station(-31.95, 115.86)
+    return setup
+
+
+for _count in STATION_COUNTS:
+    benchmark(f"find_nearest_station[{_count}]", stations=_count)(_nearest_setup(_count))
+
+
+def time_callable(fn: Callable[[], Any], repeat: int, min_time: float) -> Tuple[int, List[float]]:
+    """
+    Time fn like timeit's autorange.
+
+    Args:
+        fn (Callable[[], Any]): Code under test
+        repeat (int): Number of timed repeats
+        min_time (float): Minimum seconds per repeat
+
+    Returns:
+        Tuple[int, List[float]]: Calls per repeat and seconds per call for
+            each repeat
+    """
+    fn()  # warm up caches, imports and lazily built state
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return number, timings
+
+
+def run_benchmarks(names: Optional[List[str]] = None, repeat: int = 5,
+                   min_time: float = 0.2) -> Dict[str, Dict[str, Any]]:
+    """
+    Run benchmarks and summarize their timings.
+
+    Args:
+        names (Optional[List[str]]): Benchmarks to run (default: all)
+        repeat (int): Timed repeats per benchmark
+        min_time (float): Minimum seconds per repeat
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per benchmark: params, calls per repeat,
+            repeat count and min/median/mean/stdev in milliseconds
+    """
+    results = {}
+    loop = asyncio.new_event_loop()
+    try:
+        for name in names or list(BENCHMARKS):
+            params, setup = BENCHMARKS[name]
+            with ExitStack() as stack:
+                fn = setup(stack, loop)
+                number, timings = time_callable(fn, repeat, min_time)
+            ms = [t * 1000 for t in timings]
+            results[name] = {
+                "params": params,
+                "number": number,
+                "repeat": len(ms),
+                "min_ms": round(min(ms), 6),
+                "median_ms": round(statistics.median(ms), 6),
+                "mean_ms": round(statistics.mean(ms), 6),
+                "stdev_ms": round(statistics.stdev(ms), 6) if len(ms) > 1 else 0.0,
+            }
+            print(f"[BENCH] {name}: median {results[name]['median_ms']:.3f} ms "
+                  f"({number} calls x {len(ms)} repeats)")
+    finally:
+        loop.close()
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """Current git commit of the tree, if available."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(FIXTURES_DIR)).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> None:
+    """Print the median of each benchmark relative to a baseline run."""
+    for name, result in current.items():
+        before = baseline.get(name)
+        if not before:
+            print(f"[BENCH] {name}: no baseline")
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        print(f"[BENCH] {name}: {before['median_ms']:.3f} -> {result['median_ms']:.3f} ms "
+              f"({ratio:.2f}x)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the flood-backend microbenchmarks.")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repeats per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds per repeat")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare medians with")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        print(f"[BENCH] No benchmark matches {args.filter!r}")
+        return 1
+
+    started = datetime.now(timezone.utc)
+    results = run_benchmarks(names, repeat=args.repeat, min_time=args.min_time)
+    report = {
+        "timestamp": started.isoformat(),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, started.strftime("%Y%m%dT%H%M%SZ") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCH] Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["benchmarks"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
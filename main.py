@@ -6,22 +6,76 @@ This FastAPI application provides weather data, forecasts, warnings, and risk
 assessments to support flood monitoring and prediction systems.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.api.v1.endpoints import metrics
 from src.api.v1.routes import api_router
+from src.core.bom_warnings import start_warnings_poller
+from src.core.compression import CompressionMiddleware
+from src.core.http_cache import HTTPCacheMiddleware
+from src.core.metrics import MetricsMiddleware
+from src.core.tracing import TracingMiddleware, flush_traces, start_trace_exporter
+from src.core.report_queue import start_report_flusher
+from src.core.responses import ORJSONResponse
+from src.core.upstream import close_clients
 from fastapi import FastAPI
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
+
+    Runs once around the lifetime of the application. On startup it launches
+    the background warnings poller, report flusher and trace exporter; on
+    shutdown it stops them, writes the remaining buffered traces and closes
+    the pooled upstream HTTP clients so keep-alive connections are released.
+    Reports still queued are delivered after the next start.
+
+    Args:
+        app (FastAPI): The application instance being served
+    """
+    tasks = [task for task in (start_warnings_poller(), start_report_flusher(),
+                               start_trace_exporter())
+             if task is not None]
+    yield
+    for task in tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    try:
+        await flush_traces()
+    except Exception as e:
+        print(f"[TRACING] Failed to export traces: {str(e)}")
+    await close_clients()
+
+
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application.
 
     Sets up the main FastAPI application with the API router and configures
-    the application title. All API routes are prefixed with /api/v1.
+    the application title, lifespan, orjson default response class and the
+    HTTP caching, compression, tracing and metrics middleware. All API routes are
+    prefixed with /api/v1; the Prometheus /metrics endpoint is at the root.
 
     Returns:
         FastAPI: Configured FastAPI application instance
     """
-    app = FastAPI(title="flood-backend")
+    app = FastAPI(title="flood-backend", lifespan=lifespan,
+                  default_response_class=ORJSONResponse)
+    # Added last runs outermost: bodies are compressed after ETags are set
+    app.add_middleware(HTTPCacheMiddleware)
+    app.add_middleware(CompressionMiddleware)
+    # Server-Timing is added once the (compressed) response starts
+    app.add_middleware(TracingMiddleware)
+    # Outermost, so timings include caching and compression
+    app.add_middleware(MetricsMiddleware)
     app.include_router(api_router, prefix="/api/v1")
+    app.include_router(metrics.router)
     return app
 
 
@@ -12,4 +12,6 @@ Endpoint Modules:
     gweather: Google Weather API integration endpoints
     risk: Flood risk assessment endpoints
     report: Issue reporting and user feedback endpoints
+    location: Combined per-location summary endpoint
+    metrics: Prometheus metrics export (mounted at the application root)
 """
@@ -4,19 +4,31 @@ Weather Forecast Endpoint Module
 
 This module provides weather forecast API endpoints for the urban flooding backend.
 It includes functionality for retrieving weather forecasts and current weather
-conditions from the Bureau of Meteorology.
+conditions from the Bureau of Meteorology, falling back to Google and to the
+last known condition when BOM cannot answer.
 """
 
+import asyncio
+import time
+
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from src.core.bom import fetch_weather_observation
-from src.core.bom import parse_forecast_for_station
-from src.core.bom import fetch_bom_forecast_xml
+from src.core.bom import get_forecast_for_station, get_forecast_version
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.core.google import fetch_google_conditions
 from src.core.helpers import find_nearest_station
+from src.core.http_cache import add_data_version
+from src.core.tracing import span
+from src.core.upstream import describe_error
 from src.core.auth import verify_token
 
 router = APIRouter()
 
+# Last successful condition per station: (condition, source, unix time)
+_last_known_conditions = TTLCache("weather_condition_last_known", 1024)
+
 
 class WeatherRequest(BaseModel):
     """
@@ -31,7 +43,7 @@ class WeatherRequest(BaseModel):
 
 
 @router.post("/forecast", tags=["forecast"])
-def get_forecast(request: WeatherRequest, token: str = Depends(verify_token)):
+async def get_forecast(request: WeatherRequest, token: str = Depends(verify_token)):
     """
     Get weather forecast for specified coordinates.
 
@@ -53,24 +65,159 @@ def get_forecast(request: WeatherRequest, token: str = Depends(verify_token)):
         nearest_station = find_nearest_station(request.lat, request.lon)
         if not nearest_station:
             return {"code": 1, "message": "No weather station found", "data": None}
-        xml_content = fetch_bom_forecast_xml()
-        forecasts = parse_forecast_for_station(
-            xml_content, nearest_station['AAC'])
+        forecasts = await get_forecast_for_station(nearest_station['AAC'])
+        add_data_version("forecast", get_forecast_version())
         return {"code": 0, "message": "Success", "data": forecasts}
     except Exception as e:
         return {"code": 1, "message": f"Error: {str(e)}", "data": None}
 
+
+async def bom_condition(request, station):
+    """
+    Build the condition summary from the BOM forecast and observations.
+
+    Args:
+        request (WeatherRequest): Request containing latitude and longitude
+        station (dict): Nearest weather station
+
+    Returns:
+        dict: precis, temperature, forecast_icon_code and forecast_icon_uri
+
+    Raises:
+        Exception: If BOM returned neither a forecast nor an observation
+    """
+    # Forecast product and station observations are independent, fetch both
+    # at once; either one failing still leaves a usable condition
+    forecasts, observations = await asyncio.gather(
+        get_forecast_for_station(station['AAC']),
+        fetch_weather_observation(station), return_exceptions=True)
+    errors = [describe_error(result) for result in (forecasts, observations)
+              if isinstance(result, Exception)]
+    if isinstance(forecasts, Exception):
+        forecasts = None
+    if isinstance(observations, Exception):
+        observations = None
+    # Get first precis and element (icon code) from forecast
+    precis = None
+    forecast_icon_code = None
+    if forecasts:
+        precis = forecasts[0]['forecast'].get('precis')
+        # Find the first 'element' tag value in the first forecast period
+        # The 'element' tag is usually used for icon codes in BOM XML
+        forecast_icon_code = forecasts[0]['forecast'].get('element')
+    # Get temperature from weather observation
+    temperature = None
+    if observations:
+        temperature = observations[0].get('air_temp')
+    if precis is None and temperature is None:
+        raise Exception("; ".join(errors) or "No forecast or observation from BOM")
+    if forecasts is not None:
+        add_data_version("forecast", get_forecast_version())
+    if observations is not None:
+        add_data_version("observation", station['station_id'],
+                         observations[0].get('local_date_time_full') if observations else None)
+    return {
+        "precis": precis,
+        "temperature": temperature,
+        "forecast_icon_code": forecast_icon_code,
+        "forecast_icon_uri": None,
+    }
+
+
+async def google_condition(request, station):
+    """
+    Build the condition summary from Google current conditions.
+
+    Args:
+        request (WeatherRequest): Request containing latitude and longitude
+        station (dict): Nearest weather station (unused)
+
+    Returns:
+        dict: precis, temperature, forecast_icon_code and forecast_icon_uri
+
+    Raises:
+        Exception: If the Google lookup failed
+    """
+    data = await fetch_google_conditions((request.lat, request.lon))
+    if isinstance(data, Exception):
+        # The httpx error text contains the request URL and API key
+        raise Exception(f"Google Weather lookup failed ({describe_error(data)})")
+    if not data or data.get("code") == 1:
+        raise Exception((data or {}).get("message") or "No data returned from Google Weather API")
+    weatherCondition = data.get("weatherCondition") or {}
+    return {
+        "precis": weatherCondition.get("description", {}).get("text"),
+        "temperature": (data.get("temperature") or {}).get("degrees"),
+        "forecast_icon_code": None,
+        "forecast_icon_uri": weatherCondition.get("iconBaseUri"),
+    }
+
+
+CONDITION_SOURCES = {
+    "bom": bom_condition,
+    "google": google_condition,
+}
+
+
+async def resolve_condition(request, station):
+    """
+    Walk the WEATHER_CONDITION_SOURCES chain until a source answers.
+
+    Live answers are remembered per station so the "cache" source can
+    serve the last known condition when every live source fails.
+
+    Args:
+        request (WeatherRequest): Request containing latitude and longitude
+        station (dict): Nearest weather station
+
+    Returns:
+        dict: Condition summary with "source" set to the answering source
+            and, for the cache, "age_seconds"
+
+    Raises:
+        Exception: If no source in the chain could answer
+    """
+    errors = []
+    for source in [s.strip() for s in settings.WEATHER_CONDITION_SOURCES.split(",") if s.strip()]:
+        if source == "cache":
+            cached = _last_known_conditions.get(station['station_id'])
+            if cached is not None:
+                condition, origin, stored_at = cached
+                return {**condition, "source": "cache", "cached_source": origin,
+                        "age_seconds": round(time.time() - stored_at)}
+            errors.append("cache: no recent condition")
+            continue
+        fetch = CONDITION_SOURCES.get(source)
+        if fetch is None:
+            errors.append(f"{source}: unknown source")
+            continue
+        try:
+            with span(f"condition.{source}"):
+                condition = await fetch(request, station)
+        except Exception as e:
+            print(f"[WEATHER CONDITION] {source} failed: {describe_error(e)}")
+            errors.append(f"{source}: {describe_error(e)}")
+            continue
+        _last_known_conditions.set(
+            station['station_id'], (condition, source, time.time()),
+            ttl=settings.WEATHER_CONDITION_MAX_AGE_SECONDS)
+        return {**condition, "source": source}
+    raise Exception("; ".join(errors) or "No condition sources configured")
+
+
 # New endpoint: /weathercondition
 
 
 @router.post("/weathercondition", tags=["weather"])
-def get_weather_condition(request: WeatherRequest, token: str = Depends(verify_token)):
+async def get_weather_condition(request: WeatherRequest, token: str = Depends(verify_token)):
     """
     Get current weather condition summary for specified coordinates.
 
     Retrieves a simplified weather condition summary including the forecast
     précis (brief description) and icon code from the Bureau of Meteorology.
     This endpoint provides a quick overview of current weather conditions.
+    If BOM fails, the sources in WEATHER_CONDITION_SOURCES are tried in
+    order (Google, then the last known condition by default).
 
     Args:
         request (WeatherRequest): Request containing latitude and longitude
@@ -80,36 +227,18 @@ def get_weather_condition(request: WeatherRequest, token: str = Depends(verify_t
         dict: Response containing:
             - code (int): Status code (0 for success, 1 for error)
             - message (str): Status message
-            - data: Weather condition summary with précis and icon code
+            - data: Weather condition summary with précis, icon code and
+              the source that answered ("bom", "google" or "cache")
     """
     try:
         nearest_station = find_nearest_station(request.lat, request.lon)
         if not nearest_station:
             return {"code": 1, "message": "No weather station found", "data": None}
-        # Get first precis and element (icon code) from forecast
-        xml_content = fetch_bom_forecast_xml()
-        forecasts = parse_forecast_for_station(
-            xml_content, nearest_station['AAC'])
-        precis = None
-        forecast_icon_code = None
-        if forecasts:
-            precis = forecasts[0]['forecast'].get('precis')
-            # Find the first 'element' tag value in the first forecast period
-            # The 'element' tag is usually used for icon codes in BOM XML
-            forecast_icon_code = forecasts[0]['forecast'].get('element')
-        # Get temperature from weather observation
-        observations = fetch_weather_observation(nearest_station)
-        temperature = None
-        if observations:
-            temperature = observations[0].get('air_temp')
+        condition = await resolve_condition(request, nearest_station)
         return {
             "code": 0,
             "message": "Success",
-            "data": {
-                "precis": precis,
-                "temperature": temperature,
-                "forecast_icon_code": forecast_icon_code
-            }
+            "data": condition
         }
     except Exception as e:
         return {"code": 1, "message": f"Error: {str(e)}", "data": None}
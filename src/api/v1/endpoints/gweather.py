@@ -6,9 +6,16 @@ backend. It includes functionality for retrieving current conditions, forecasts,
 and historical weather data from Google's Weather API service.
 """
 
+import asyncio
+from typing import List, Literal
+
 from fastapi import APIRouter
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from src.core.config import settings
 from src.core.google import fetch_google_conditions, fetch_google_hourly_forecast, fetch_google_daily_forecast, fetch_google_history
+from src.core.helpers import snap_to_grid
+from src.core.responses import ORJSONResponse
+from src.core.upstream import describe_error
 
 router = APIRouter()
 
@@ -25,71 +32,161 @@ class WeatherRequest(BaseModel):
     lon: float
 
 
+class BatchWeatherRequest(BaseModel):
+    """
+    Request model for the multi-point Google Weather endpoint.
+
+    Attributes:
+        points (List[WeatherRequest]): Coordinates to look up, in display order
+        kind (str): Lookup to run for every point: "conditions", "hourly",
+            "daily" or "history" (default: "conditions")
+    """
+    points: List[WeatherRequest] = Field(..., min_length=1)
+    kind: Literal["conditions", "hourly", "daily", "history"] = "conditions"
+
+
+BATCH_FETCHERS = {
+    "conditions": fetch_google_conditions,
+    "hourly": fetch_google_hourly_forecast,
+    "daily": fetch_google_daily_forecast,
+    "history": fetch_google_history,
+}
+
+
+def summarize_conditions(data):
+    """
+    Build the /google/conditions payload from a current conditions response.
+
+    Args:
+        data (dict): JSON response from the currentConditions lookup
+
+    Returns:
+        dict: The raw response plus a condensed conditions summary
+    """
+    weatherCondition = data.get("weatherCondition")
+    return {
+        "weatherConditions": data,
+        "conditions": {
+            "condition": weatherCondition['description']['text'],
+            "temperature": data.get("temperature")['degrees'],
+            "feels_like": data.get("feelsLikeTemperature")['degrees'],
+            "forecast_icon_uri": weatherCondition['iconBaseUri'],
+        }
+    }
+
+
+async def fetch_batch(points, kind):
+    """
+    Run one Google lookup per grid cell and map the results back to points.
+
+    Points are collapsed to their GOOGLE_GRID_DEGREES cells so each cell is
+    requested once, with at most GOOGLE_BATCH_CONCURRENCY lookups in flight.
+
+    Args:
+        points (List[WeatherRequest]): Requested coordinates
+        kind (str): Key of BATCH_FETCHERS
+
+    Returns:
+        List[dict]: One {"lat", "lon", "code", "message", "data"} entry per
+            input point, in input order. A failed cell sets code 1 for its
+            points only.
+    """
+    fetch = BATCH_FETCHERS[kind]
+    cells = [snap_to_grid(p.lat, p.lon, settings.GOOGLE_GRID_DEGREES) for p in points]
+    unique_cells = list(dict.fromkeys(cells))
+    semaphore = asyncio.Semaphore(max(1, settings.GOOGLE_BATCH_CONCURRENCY))
+
+    async def fetch_cell(cell):
+        async with semaphore:
+            data = await fetch(cell)
+        if isinstance(data, Exception):
+            reason = describe_error(data)
+            print(f"[GOOGLE BATCH] {kind} lookup for {cell} failed: {reason}")
+            return {"code": 1, "message": f"Google Weather lookup failed ({reason})", "data": None}
+        if not data:
+            return {"code": 1, "message": "No data returned from Google Weather API", "data": None}
+        if data.get("code") == 1:
+            return {"code": 1, "message": data.get("message"), "data": None}
+        try:
+            if kind == "conditions":
+                data = summarize_conditions(data)
+        except Exception as e:
+            return {"code": 1, "message": f"Error: {str(e)}", "data": None}
+        return {"code": 0, "message": "Success", "data": data}
+
+    results = await asyncio.gather(*[fetch_cell(cell) for cell in unique_cells])
+    by_cell = dict(zip(unique_cells, results))
+    return [{"lat": p.lat, "lon": p.lon, **by_cell[cell]} for p, cell in zip(points, cells)]
+
+
 @router.post("/google/conditions", tags=["gweather"])
-def get_google_conditions(request: WeatherRequest):
+async def get_google_conditions(request: WeatherRequest):
     try:
         coordinates = (request.lat, request.lon)
-        data = fetch_google_conditions(coordinates)
+        data = await fetch_google_conditions(coordinates)
         print(f"[GOOGLE CONDITIONS] Successfully retrieved weather data")
 
         if not data:
             return {"code": 1, "message": "No data returned from Google Weather API", "data": None}
-        weatherCondition = data.get("weatherCondition")
-        condition = weatherCondition['description']['text']
-        forecast_icon_uri = weatherCondition['iconBaseUri']
-
-        temp = data.get("temperature")['degrees']
-        feels_like = data.get("feelsLikeTemperature")['degrees']
-        ret = {"code": 0, "message": "Success", "data": {
-            "weatherConditions":	data,
-            "conditions":	{
-                "condition": condition,
-                "temperature": temp,
-                "feels_like": feels_like,
-                "forecast_icon_uri": forecast_icon_uri
-            }
-        }
-        }
-        return ret
+        return {"code": 0, "message": "Success", "data": summarize_conditions(data)}
     except Exception as e:
         print(f"[GOOGLE CONDITIONS] Error occurred: {str(e)}")
         return {"code": 1, "message": f"Error: {str(e)}", "data": None}
 
 
 @router.post("/google/forecast/hourly", tags=["gweather"])
-def get_google_forecast_hourly(request: WeatherRequest):
+async def get_google_forecast_hourly(request: WeatherRequest):
     try:
         coordinates = (request.lat, request.lon)
-        data = fetch_google_hourly_forecast(coordinates)
+        data = await fetch_google_hourly_forecast(coordinates)
         print(f"[GOOGLE HOURLY] Successfully retrieved hourly forecast data")
-
-        return {"code": 0, "message": "Success", "data": data}
+        return ORJSONResponse({"code": 0, "message": "Success", "data": data})
     except Exception as e:
         print(f"[GOOGLE HOURLY] Error occurred: {str(e)}")
         return {"code": 1, "message": f"Error: {str(e)}", "data": None}
 
 
 @router.post("/google/forecast/daily", tags=["gweather"])
-def get_google_forecast_daily(request: WeatherRequest):
+async def get_google_forecast_daily(request: WeatherRequest):
     try:
         coordinates = (request.lat, request.lon)
-        data = fetch_google_daily_forecast(coordinates)
+        data = await fetch_google_daily_forecast(coordinates)
         print(f"[GOOGLE DAILY] Successfully retrieved daily forecast data")
 
-        return {"code": 0, "message": "Success", "data": data}
+        return ORJSONResponse({"code": 0, "message": "Success", "data": data})
     except Exception as e:
         print(f"[GOOGLE DAILY] Error occurred: {str(e)}")
         return {"code": 1, "message": f"Error: {str(e)}", "data": None}
 
 
 @router.post("/google/history", tags=["gweather"])
-def get_google_history(request: WeatherRequest):
+async def get_google_history(request: WeatherRequest):
     try:
         coordinates = (request.lat, request.lon)
-        data = fetch_google_history(coordinates)
+        data = await fetch_google_history(coordinates)
         print(f"[GOOGLE HISTORY] Successfully retrieved weather history data")
 
-        return {"code": 0, "message": "Success", "data": data}
+        return ORJSONResponse({"code": 0, "message": "Success", "data": data})
     except Exception as e:
         print(f"[GOOGLE HISTORY] Error occurred: {str(e)}")
         return {"code": 1, "message": f"Error: {str(e)}", "data": None}
+
+
+@router.post("/google/batch", tags=["gweather"])
+async def get_google_batch(request: BatchWeatherRequest):
+    try:
+        if len(request.points) > settings.GOOGLE_BATCH_MAX_POINTS:
+            return {"code": 1, "message": f"Too many points (max {settings.GOOGLE_BATCH_MAX_POINTS})", "data": None}
+        results = await fetch_batch(request.points, request.kind)
+        failed = sum(1 for r in results if r["code"] != 0)
+        print(f"[GOOGLE BATCH] Retrieved {request.kind} for {len(results)} points ({failed} failed)")
+
+        return {"code": 0, "message": "Success", "data": {
+            "kind": request.kind,
+            "count": len(results),
+            "failed": failed,
+            "results": results,
+        }}
+    except Exception as e:
+        print(f"[GOOGLE BATCH] Error occurred: {str(e)}")
+        return {"code": 1, "message": f"Error: {str(e)}", "data": None}
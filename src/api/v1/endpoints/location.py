@@ -0,0 +1,177 @@
+"""
+Location Summary Endpoint Module
+
+This module provides a composite endpoint that answers everything the mobile
+app shows on launch (current condition, forecast, nearby warnings, flood risk
+and Google conditions) in one round trip. The nearest station is resolved
+once and every section is gathered concurrently under its own deadline, so a
+slow upstream only blanks its own section.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from src.api.v1.endpoints.forecast import resolve_condition
+from src.api.v1.endpoints.gweather import summarize_conditions
+from src.api.v1.endpoints.warnings import filter_warnings_by_location
+from src.core.auth import verify_token
+from src.core.bom import get_forecast_for_station
+from src.core.bom_warnings import get_warnings_snapshot
+from src.core.config import settings
+from src.core.digitaltwin import fetch_digital_twin_risk
+from src.core.google import fetch_google_conditions
+from src.core.helpers import get_station_index
+from src.core.tracing import span
+from src.core.upstream import describe_error
+
+router = APIRouter()
+
+Section = Literal["condition", "forecast", "warnings", "risk", "google"]
+SECTIONS = ["condition", "forecast", "warnings", "risk", "google"]
+
+
+class LocationSummaryRequest(BaseModel):
+    """
+    Request model for the location summary endpoint.
+
+    Attributes:
+        lat (float): Latitude coordinate in decimal degrees
+        lon (float): Longitude coordinate in decimal degrees
+        radius_km (Optional[float]): Warning search radius in kilometers (default: 100.0)
+        rainfall_event_id (Optional[str]): Rainfall event for the risk section
+        include (Optional[List[str]]): Sections to build (default: all)
+    """
+    lat: float
+    lon: float
+    radius_km: Optional[float] = 100.0
+    rainfall_event_id: Optional[str] = None
+    include: Optional[List[Section]] = None
+
+
+async def _condition(request, station):
+    return await resolve_condition(request, station)
+
+
+async def _forecast(request, station):
+    forecasts = await get_forecast_for_station(station['AAC'])
+    return [{
+        "start_time": period.get("start_time"),
+        "end_time": period.get("end_time"),
+        "precis": period["forecast"].get("precis"),
+        "forecast_icon_code": period["forecast"].get("element"),
+    } for period in forecasts[:settings.LOCATION_SUMMARY_FORECAST_PERIODS]]
+
+
+async def _warnings(request, station, nearest):
+    snapshot = await get_warnings_snapshot()
+    warnings = filter_warnings_by_location(
+        snapshot.warnings, request.lat, request.lon,
+        request.radius_km or 100.0, nearest=nearest)
+    return {
+        "total": len(warnings),
+        "version": snapshot.version,
+        "items": [{
+            "title": w["title"],
+            "link": w["link"],
+            "pub_date": w["pub_date"],
+            "areas": w.get("matched_areas") or w.get("areas") or [],
+        } for w in warnings],
+    }
+
+
+async def _risk(request, station):
+    result = await fetch_digital_twin_risk(
+        lat=request.lat, lon=request.lon, rainfall_event_id=request.rainfall_event_id)
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+async def _google(request, station):
+    data = await fetch_google_conditions((request.lat, request.lon))
+    if isinstance(data, Exception):
+        raise data
+    if not data or data.get("code") == 1:
+        raise Exception((data or {}).get("message") or "No data returned from Google Weather API")
+    return summarize_conditions(data)["conditions"]
+
+
+async def _run_section(name, coro, timeout):
+    """
+    Await one section under its deadline.
+
+    Returns:
+        tuple: (value, error message or None). Failures are reported as a
+            generic "upstream error", since upstream error text can contain
+            request URLs and API keys.
+    """
+    try:
+        with span(f"location.{name}"):
+            return await asyncio.wait_for(coro, timeout), None
+    except asyncio.TimeoutError:
+        return None, f"Timed out after {timeout}s"
+    except Exception as e:
+        print(f"[LOCATION SUMMARY] {name} failed: {describe_error(e)}")
+        return None, "upstream error"
+
+
+@router.post("/location/summary", tags=["location"])
+async def get_location_summary(request: LocationSummaryRequest, token: str = Depends(verify_token)):
+    """
+    Get a combined dashboard document for a location.
+
+    Resolves the nearest station once, then builds the requested sections
+    concurrently. Each section has LOCATION_SUMMARY_TIMEOUT_SECONDS to
+    answer; sections that fail or time out are returned as null with the
+    reason listed under errors.
+
+    Args:
+        request (LocationSummaryRequest): Location and sections to include
+        token (str): Authenticated user token (from Authorization header)
+
+    Returns:
+        dict: Response containing:
+            - code (int): Status code (0 for success, 1 for error)
+            - message (str): Status message
+            - data: location, nearest_station, one entry per section and errors
+    """
+    try:
+        nearest = get_station_index().nearest(request.lat, request.lon)
+        if not nearest:
+            return {"code": 1, "message": "No weather station found", "data": None}
+        station, distance_km = nearest
+
+        builders = {
+            "condition": lambda: _condition(request, station),
+            "forecast": lambda: _forecast(request, station),
+            "warnings": lambda: _warnings(request, station, nearest),
+            "risk": lambda: _risk(request, station),
+            "google": lambda: _google(request, station),
+        }
+        names = [name for name in SECTIONS if request.include is None or name in request.include]
+        timeout = settings.LOCATION_SUMMARY_TIMEOUT_SECONDS
+        results = await asyncio.gather(
+            *[_run_section(name, builders[name](), timeout) for name in names])
+
+        data: Dict[str, Any] = {
+            "location": {"lat": request.lat, "lon": request.lon},
+            "nearest_station": {
+                "name": station["name"],
+                "station_id": station["station_id"],
+                "distance_km": round(distance_km, 2),
+            },
+        }
+        errors = {}
+        for name, (value, error) in zip(names, results):
+            data[name] = value
+            if error is not None:
+                errors[name] = error
+        data["errors"] = errors
+        print(f"[LOCATION SUMMARY] Built {len(names) - len(errors)}/{len(names)} sections")
+        return {"code": 0, "message": "Success", "data": data}
+    except Exception as e:
+        print(f"[LOCATION SUMMARY] Error occurred: {str(e)}")
+        return {"code": 1, "message": f"Error: {str(e)}", "data": None}
@@ -0,0 +1,30 @@
+"""
+Metrics Endpoint Module
+
+This module serves the application metrics (request latency, upstream calls,
+cache activity, circuit breakers, report queue) in the Prometheus text
+format. The router is mounted at the application root as /metrics, where
+scrapers expect it, rather than under /api/v1.
+"""
+
+from fastapi import APIRouter, Response
+
+from src.core.metrics import CONTENT_TYPE, render
+
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["metrics"])
+async def metrics():
+    """
+    Export metrics for scraping.
+
+    Like /health this endpoint needs no token, so monitoring can scrape it
+    without the API credentials; it only exposes counts and timings. Async
+    so rendering runs on the event loop that updates the (unlocked) metrics,
+    never concurrently with it in a worker thread.
+
+    Returns:
+        Response: text/plain exposition (version 0.0.4) of every metric
+    """
+    return Response(render(), media_type=CONTENT_TYPE)
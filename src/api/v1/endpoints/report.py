@@ -4,13 +4,18 @@ Issue Reporting Endpoint Module
 This module provides issue reporting API endpoints for the urban flooding backend.
 It allows users to submit reports about flooding, infrastructure issues, or other
 concerns directly to the digital twin platform for processing and response.
+Reports are accepted into a durable local queue and delivered in the
+background, so they survive a slow or unavailable digital twin.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Any, Dict
 
+from src.core.config import settings
 from src.core.digitaltwin import post_user_report
+from src.core.report_queue import get_report_queue, notify_flusher, run_queue
 
 router = APIRouter()
 
@@ -34,26 +39,84 @@ class IssueReport(BaseModel):
         ..., description="User information with uid, display_name, and email")
 
 
+@router.get("/report/queue", tags=["report"])
+async def get_report_queue_stats() -> Dict[str, Any]:
+    """
+    Report delivery queue statistics.
+
+    Returns:
+        Dict[str, Any]: Response whose data holds depth (reports awaiting
+            delivery), lag_seconds (age of the oldest one), sent and failed
+    """
+    try:
+        stats = await run_queue(get_report_queue().stats)
+        return {"code": 0, "message": "Success", "data": stats}
+    except Exception as e:
+        print(f"[REPORT] Queue stats error: {str(e)}")
+        return {"code": 1, "message": f"Error: {str(e)}", "data": None}
+
+
+@router.get("/report/{idempotency_key}", tags=["report"])
+async def get_report_status(idempotency_key: str) -> Dict[str, Any]:
+    """
+    Delivery status of a queued report.
+
+    Args:
+        idempotency_key (str): Key returned when the report was submitted
+
+    Returns:
+        Dict[str, Any]: Response whose data holds the report status
+            (pending, sent or failed), attempts and the digital twin response
+    """
+    report = await run_queue(get_report_queue().get, idempotency_key)
+    if report is None:
+        return {"code": 1, "message": "Report not found", "data": None}
+    return {"code": 0, "message": "Success", "data": report}
+
+
 @router.post("/report", tags=["report"])
-def submit_issue_report(request: IssueReport) -> Dict[str, Any]:
+async def submit_issue_report(
+        request: IssueReport,
+        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+) -> Any:
     """
     Submit an issue report to the digital twin platform.
 
     Accepts user-submitted issue reports containing details about flooding,
-    infrastructure problems, or other concerns. The report is forwarded to
-    the digital twin platform for processing, analysis, and appropriate response.
+    infrastructure problems, or other concerns. With REPORT_QUEUE_ENABLED the
+    report is committed to the local queue and 202 Accepted is returned right
+    away; otherwise it is forwarded to the digital twin synchronously.
 
     Args:
         request (IssueReport): Issue report containing type, description, location, and user info
+        idempotency_key (Optional[str]): Idempotency-Key header; resubmitting
+            a key returns the already queued report
 
     Returns:
         Dict[str, Any]: Response containing:
             - code (int): Status code (0 for success, 1 for error)
             - message (str): Status message
-            - data: Report submission confirmation or None if error
+            - data: Queued report status, report submission confirmation
+              or None if error
     """
+    if settings.REPORT_QUEUE_ENABLED:
+        try:
+            report, created = await run_queue(
+                get_report_queue().enqueue, request.model_dump(), idempotency_key)
+            if created:
+                notify_flusher()
+                print(f"[REPORT] Queued report {report['report_id']}")
+            return JSONResponse(status_code=202, content={
+                "code": 0,
+                "message": "Accepted" if created else "Already accepted",
+                "data": report,
+            })
+        except Exception as e:
+            print(f"[REPORT] Failed to queue report: {str(e)}")
+            return {"code": 1, "message": f"Error: {str(e)}", "data": None}
+
     try:
-        result = post_user_report(
+        result = await post_user_report(
             IssueReport=request
         )
 
@@ -3,18 +3,53 @@ Flood Risk Assessment Endpoint Module
 
 This module provides flood risk assessment API endpoints for the urban flooding
 backend. It integrates with the digital twin platform to provide flood risk
-analysis based on coordinates and rainfall event scenarios.
+analysis based on coordinates and rainfall event scenarios. Besides single
+points, risk can be assessed across a bounding box or along a route, which
+are sampled into points and aggregated.
 """
 
+import asyncio
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List, Literal, Tuple
 
+from src.core.config import settings
 from src.core.digitaltwin import fetch_digital_twin_risk
+from src.core.helpers import snap_to_grid
+from src.core.spatial import (count_bbox_samples, count_polyline_samples, sample_bbox,
+                              sample_polyline)
 
 router = APIRouter()
 
 
+class Coordinate(BaseModel):
+    """
+    A point on a route.
+
+    Attributes:
+        lat (float): Latitude in decimal degrees
+        lon (float): Longitude in decimal degrees
+    """
+    lat: float
+    lon: float
+
+
+class BoundingBox(BaseModel):
+    """
+    Rectangular area for bbox risk queries.
+
+    Attributes:
+        min_lat (float): Southern edge in decimal degrees
+        min_lon (float): Western edge in decimal degrees
+        max_lat (float): Northern edge in decimal degrees
+        max_lon (float): Eastern edge in decimal degrees
+    """
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+
+
 class RiskRequest(BaseModel):
     """
     Request model for flood risk assessment endpoints.
@@ -24,6 +59,11 @@ class RiskRequest(BaseModel):
         lon (float): Longitude coordinate in decimal degrees
         rainfall_event_id (Optional[str]): Rainfall event identifier for risk modeling
             (e.g., 'design_2yr', 'design_10yr')
+        mode (str): "point" (default), "bbox" or "polyline"
+        bbox (Optional[BoundingBox]): Area to assess in bbox mode
+        path (Optional[List[Coordinate]]): Route vertices in polyline mode
+        spacing_km (Optional[float]): Distance between samples in bbox and
+            polyline modes (default: RISK_SAMPLE_SPACING_KM)
     """
     lat: float = Field(
         None, description="Latitude in decimal degrees")
@@ -33,10 +73,167 @@ class RiskRequest(BaseModel):
         None,
         description="Rainfall event identifier (e.g. design_2yr, design_10yr)."
     )
+    mode: Literal["point", "bbox", "polyline"] = "point"
+    bbox: Optional[BoundingBox] = None
+    path: Optional[List[Coordinate]] = None
+    spacing_km: Optional[float] = Field(
+        None, gt=0, description="Sample spacing for bbox/polyline modes")
+
+
+def risk_score(result: Dict[str, Any]) -> Optional[float]:
+    """
+    Extract the numeric risk score from a Digital Twin risk response.
+
+    Args:
+        result (Dict[str, Any]): Risk response
+
+    Returns:
+        Optional[float]: Value at RISK_SCORE_FIELD, or None if it is missing
+            or not numeric
+    """
+    value: Any = result
+    for part in settings.RISK_SCORE_FIELD.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def assess_samples(samples: List[Tuple[Optional[int], float, float]],
+                         rainfall_event_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Look up risk for sampled points and aggregate the results.
+
+    Samples are collapsed to RISK_GRID_DEGREES cells so each cell is queried
+    once (and answered from the risk cache where possible), with at most
+    RISK_AREA_CONCURRENCY lookups in flight.
+
+    Args:
+        samples (List[Tuple[Optional[int], float, float]]): (segment index or
+            None, lat, lon) samples
+        rainfall_event_id (Optional[str]): Rainfall event identifier
+
+    Returns:
+        Dict[str, Any]: Sample counts, max_risk, hotspots and, for routes,
+            per-segment maxima
+    """
+    cells = [snap_to_grid(lat, lon, settings.RISK_GRID_DEGREES) for _, lat, lon in samples]
+    unique_cells = list(dict.fromkeys(cells))
+    semaphore = asyncio.Semaphore(max(1, settings.RISK_AREA_CONCURRENCY))
+
+    async def score_cell(cell):
+        async with semaphore:
+            result = await fetch_digital_twin_risk(
+                lat=cell[0], lon=cell[1], rainfall_event_id=rainfall_event_id)
+        if isinstance(result, Exception) or not isinstance(result, dict):
+            return None
+        return risk_score(result)
+
+    scores = dict(zip(unique_cells, await asyncio.gather(
+        *[score_cell(cell) for cell in unique_cells])))
+    scored = sorted(((score, cell) for cell, score in scores.items() if score is not None),
+                    reverse=True)
+
+    def point(cell, score):
+        return {"lat": cell[0], "lon": cell[1], "score": score}
+
+    summary: Dict[str, Any] = {
+        "samples": len(samples),
+        "unique_cells": len(unique_cells),
+        "failed": len(unique_cells) - len(scored),
+        "max_risk": point(scored[0][1], scored[0][0]) if scored else None,
+        "hotspots": [point(cell, score) for score, cell in scored[:settings.RISK_HOTSPOT_COUNT]],
+    }
+
+    if samples and samples[0][0] is not None:
+        segments: Dict[int, Dict[str, Any]] = {}
+        for (index, lat, lon), cell in zip(samples, cells):
+            segment = segments.setdefault(index, {
+                "index": index, "start": {"lat": lat, "lon": lon},
+                "max_score": None, "samples": 0})
+            segment["end"] = {"lat": lat, "lon": lon}
+            segment["samples"] += 1
+            score = scores[cell]
+            if score is not None and (segment["max_score"] is None or score > segment["max_score"]):
+                segment["max_score"] = score
+        summary["segments"] = [segments[i] for i in sorted(segments)]
+    return summary
+
+
+def request_geometry(request: "RiskRequest") -> Any:
+    """
+    Validate and return the geometry of a bbox or polyline risk request.
+
+    Args:
+        request (RiskRequest): Request in bbox or polyline mode
+
+    Returns:
+        Any: (min_lon, min_lat, max_lon, max_lat) in bbox mode, or the list of
+            (lat, lon) vertices in polyline mode
+
+    Raises:
+        Exception: If the geometry is missing or invalid
+    """
+    if request.mode == "bbox":
+        box = request.bbox
+        if box is None:
+            raise Exception("bbox is required in bbox mode")
+        if box.min_lat >= box.max_lat or box.min_lon >= box.max_lon:
+            raise Exception("bbox min values must be below max values")
+        return (box.min_lon, box.min_lat, box.max_lon, box.max_lat)
+    if not request.path or len(request.path) < 2:
+        raise Exception("path needs at least two points in polyline mode")
+    return [(p.lat, p.lon) for p in request.path]
+
+
+def count_samples(request: "RiskRequest", spacing_km: float) -> int:
+    """
+    Number of samples build_samples would produce, computed from the
+    geometry alone so oversized requests are rejected before sampling.
+
+    Args:
+        request (RiskRequest): Request in bbox or polyline mode
+        spacing_km (float): Distance between samples
+
+    Returns:
+        int: Sample count
+
+    Raises:
+        Exception: If the geometry is missing or invalid
+    """
+    geometry = request_geometry(request)
+    if request.mode == "bbox":
+        return count_bbox_samples(geometry, spacing_km)
+    return count_polyline_samples(geometry, spacing_km)
+
+
+def build_samples(request: "RiskRequest", spacing_km: float) -> List[Tuple[Optional[int], float, float]]:
+    """
+    Sample the geometry of a bbox or polyline risk request.
+
+    Args:
+        request (RiskRequest): Request in bbox or polyline mode
+        spacing_km (float): Distance between samples
+
+    Returns:
+        List[Tuple[Optional[int], float, float]]: (segment index or None, lat, lon)
+
+    Raises:
+        Exception: If the geometry is missing or invalid
+    """
+    geometry = request_geometry(request)
+    if request.mode == "bbox":
+        return [(None, lat, lon) for lat, lon in sample_bbox(geometry, spacing_km)]
+    return sample_polyline(geometry, spacing_km)
 
 
 @router.post("/risk", tags=["risk"])
-def get_risk(request: RiskRequest) -> Dict[str, Any]:
+async def get_risk(request: RiskRequest) -> Dict[str, Any]:
     """
     Get flood risk assessment for specified coordinates and rainfall scenario.
 
@@ -51,13 +248,16 @@ def get_risk(request: RiskRequest) -> Dict[str, Any]:
         Dict[str, Any]: Risk assessment results from the digital twin platform
             or error information if the request fails
     """
+    if request.mode != "point":
+        return await get_area_risk(request)
+
     print(
         f"[RISK ANALYSIS] Fetching flood risk data for coordinates: ({request.lat}, {request.lon})")
     if request.rainfall_event_id:
         print(
             f"[RISK ANALYSIS] Using rainfall event: {request.rainfall_event_id}")
     try:
-        result = fetch_digital_twin_risk(
+        result = await fetch_digital_twin_risk(
             lat=request.lat,
             lon=request.lon,
             rainfall_event_id=request.rainfall_event_id,
@@ -77,3 +277,42 @@ def get_risk(request: RiskRequest) -> Dict[str, Any]:
     except Exception as e:  # Fallback safeguard
         print(f"[RISK ANALYSIS] Unhandled error: {str(e)}")
         return {"code": 1, "message": f"Unhandled error: {str(e)}", "data": None}
+
+
+async def get_area_risk(request: RiskRequest) -> Dict[str, Any]:
+    """
+    Assess flood risk across a bounding box or along a route.
+
+    Args:
+        request (RiskRequest): Request in bbox or polyline mode
+
+    Returns:
+        Dict[str, Any]: Aggregated risk (max risk, hot spots and, for routes,
+            per-segment risk) or error information
+    """
+    try:
+        spacing_km = request.spacing_km or settings.RISK_SAMPLE_SPACING_KM
+        # Checked on the geometry first: a large box at fine spacing would
+        # otherwise build millions of samples just to be rejected
+        sample_count = count_samples(request, spacing_km)
+        if sample_count > settings.RISK_MAX_SAMPLES:
+            return {"code": 1, "message": (
+                f"Geometry needs {sample_count} samples (max {settings.RISK_MAX_SAMPLES}); "
+                f"increase spacing_km"), "data": None}
+        samples = build_samples(request, spacing_km)
+
+        print(f"[RISK ANALYSIS] Assessing {request.mode} risk over {len(samples)} samples")
+        summary = await assess_samples(samples, request.rainfall_event_id)
+        if summary["max_risk"] is None:
+            return {"code": 1, "message": "No risk data returned from Digital Twin API", "data": None}
+
+        print(f"[RISK ANALYSIS] Max risk {summary['max_risk']['score']} ({summary['failed']} cells failed)")
+        return {"code": 0, "message": "Success", "data": {
+            "mode": request.mode,
+            "rainfall_event_id": request.rainfall_event_id,
+            "spacing_km": spacing_km,
+            **summary,
+        }}
+    except Exception as e:
+        print(f"[RISK ANALYSIS] Area risk error: {str(e)}")
+        return {"code": 1, "message": f"Error: {str(e)}", "data": None}
@@ -6,15 +6,16 @@ It includes functionality for retrieving, parsing, and filtering weather warning
 from the Bureau of Meteorology RSS feeds and web pages.
 """
 
-import requests
-import feedparser
-import re
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-from bs4 import BeautifulSoup
-from src.core.helpers import find_nearest_station, calculate_distance
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional, Tuple
+from src.core.bom_warnings import get_warning_area_index, get_warnings_snapshot
+from src.core.config import settings
+from src.core.helpers import get_station_index
+from src.core.http_cache import add_data_version
+from src.core.pagination import decode_cursor, encode_cursor, parse_fields, project
+from src.core.responses import ORJSONResponse
+from src.core.tracing import span
 from src.core.auth import verify_token
 
 router = APIRouter()
@@ -29,230 +30,110 @@ class WarningsRequest(BaseModel):
         lon (float): Longitude coordinate in decimal degrees
         radius_km (Optional[float]): Search radius in kilometers (default: 100.0)
         fetch_details (Optional[bool]): Whether to fetch detailed warning content (default: True)
+        fields (Optional[List[str]]): Warning keys to return, e.g. ["title", "link"]
+        limit (Optional[int]): Warnings per page (capped at WARNINGS_MAX_PAGE_SIZE)
+        cursor (Optional[str]): next_cursor from the previous page
     """
     lat: float
     lon: float
     radius_km: Optional[float] = 100.0
     fetch_details: Optional[bool] = True
+    fields: Optional[List[str]] = None
+    limit: Optional[int] = Field(None, ge=1)
+    cursor: Optional[str] = None
 
 
-def fetch_warning_details(url: str) -> Dict[str, Any]:
+def _select_details(warnings: List[Dict[str, Any]], fetch_details: bool) -> List[Dict[str, Any]]:
     """
-    Fetch and parse detailed warning content from a BOM warning URL.
+    Return snapshot warnings with or without their detail content.
 
-    Downloads the HTML content from a Bureau of Meteorology warning page
-    and extracts structured information including warning text, areas,
-    and other relevant details.
+    Snapshot warnings are shared between requests, so details are removed
+    on copies rather than in place.
+    """
+    if fetch_details:
+        return warnings
+    return [{k: v for k, v in warning.items() if k != "details"} for warning in warnings]
 
-    Args:
-        url (str): The URL of the BOM warning page to fetch
 
-    Returns:
-        Dict[str, Any]: Dictionary containing parsed warning details including
-            title, content, warning areas, and metadata
+def paginate_warnings(warnings: List[Dict[str, Any]], version: Any, limit: Optional[int],
+                      cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
     """
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive'
-        }
+    Cut one page out of a warnings list.
 
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            return {"error": f"Failed to fetch details: HTTP {response.status_code}"}
-
-        soup = BeautifulSoup(response.content, 'lxml')
-
-        details = {}
-
-        product_content = soup.find('div', {'class': 'product'})
-        if not product_content:
-            product_content = soup.find('div', {'id': 'content'})
-        if not product_content:
-            product_content = soup.find('pre')
-
-        if product_content:
-            # Extract text content
-            text = product_content.get_text(separator='\n', strip=True)
-            details['full_text'] = text
-
-            # Try to extract specific warning details
-            lines = text.split('\n')
-
-            # Extract warning type
-            for line in lines[:5]:
-                if 'WARNING' in line.upper() or 'WEATHER' in line.upper():
-                    details['warning_type'] = line.strip()
-                    break
-
-            # Extract location/area
-            area_pattern = r'for\s+(.+?)(?:\.|$)'
-            for line in lines:
-                match = re.search(area_pattern, line, re.IGNORECASE)
-                if match:
-                    details['affected_areas'] = match.group(1).strip()
-                    break
-
-            # Extract issue time
-            time_pattern = r'Issued at (\d+:\d+\s+\w+\s+\w+)'
-            for line in lines:
-                match = re.search(time_pattern, line)
-                if match:
-                    details['issue_time'] = match.group(1)
-                    break
-
-            # Extract warning level/severity
-            if 'SEVERE' in text.upper():
-                details['severity'] = 'Severe'
-            elif 'MODERATE' in text.upper():
-                details['severity'] = 'Moderate'
-            elif 'MINOR' in text.upper():
-                details['severity'] = 'Minor'
-            else:
-                details['severity'] = 'Standard'
-
-            # Extract next issue time if available
-            next_pattern = r'Next issue[:\s]+(.+?)(?:\.|$)'
-            for line in lines:
-                match = re.search(next_pattern, line, re.IGNORECASE)
-                if match:
-                    details['next_issue'] = match.group(1).strip()
-                    break
-
-            # Extract warning message/summary
-            warning_msg_start = ['WEATHER SITUATION:',
-                                 'WARNING:', 'FORECAST:', 'SITUATION:']
-            for start_phrase in warning_msg_start:
-                if start_phrase in text:
-                    idx = text.index(start_phrase)
-                    # Get next 500 characters or until next section
-                    msg = text[idx:idx+500].split('\n\n')[0]
-                    details['warning_message'] = msg
-                    break
-
-        return details
+    Cursors are bound to the snapshot version they were issued for, so a
+    client never pages across two different feeds and silently skips or
+    repeats warnings.
 
-    except Exception as e:
-        return {"error": f"Failed to parse details: {str(e)}"}
-
-
-def fetch_warnings_rss() -> Dict[str, Any]:
-    """Fetch weather warnings RSS feed from BOM for Western Australia"""
-    # Western Australia RSS feeds
-    urls = [
-        "https://www.bom.gov.au/fwo/IDZ00060.warnings_wa.xml",  # All WA warnings
-        "https://www.bom.gov.au/fwo/IDZ00059.warnings_land_wa.xml",  # Land warnings
-        "https://www.bom.gov.au/fwo/IDZ00058.warnings_marine_wa.xml",  # Marine warnings
-        "http://www.bom.gov.au/fwo/IDZ00060.warnings_wa.xml"  # HTTP fallback
-    ]
-
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1'
-    }
-
-    for url in urls:
-        try:
-            # Try with feedparser first
-            feed = feedparser.parse(url)
-            if feed.entries:
-                return {"feed": feed, "url": url}
-
-            # Try with requests if feedparser doesn't work
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                feed = feedparser.parse(response.content)
-                if feed.entries:
-                    return {"feed": feed, "url": url}
-        except Exception as e:
-            continue
-
-    # Return empty feed if all attempts fail
-    return {"feed": {"entries": []}, "url": None}
-
-
-def parse_warnings_feed(feed_data: Dict[str, Any], fetch_details: bool = False) -> List[Dict[str, Any]]:
-    """Parse RSS feed and extract warning information"""
-    feed = feed_data["feed"]
-    warnings = []
-
-    # Check if feed has entries attribute
-    if not hasattr(feed, 'entries'):
-        return warnings
+    Args:
+        warnings (List[Dict[str, Any]]): Full, ordered result list
+        version (Any): Version of the snapshot the list was built from
+        limit (Optional[int]): Page size (capped at WARNINGS_MAX_PAGE_SIZE);
+            None returns everything from the cursor on
+        cursor (Optional[str]): next_cursor from the previous page
 
-    for entry in feed.entries:
-        warning = {
-            "title": entry.get("title", "").strip(),
-            "description": entry.get("description", entry.get("summary", "")),
-            "link": entry.get("link", ""),
-            "pub_date": entry.get("published", ""),
-            "category": entry.get("category", ""),
-            "guid": entry.get("id", entry.get("guid", "")),
-        }
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[str]]: The page and the cursor
+            of the next one (None on the last page)
 
-        # Clean up title (remove extra whitespace and newlines)
-        warning["title"] = ' '.join(warning["title"].split())
-
-        # Try to parse the publication date
-        if warning["pub_date"]:
-            try:
-                pub_date_parsed = entry.get("published_parsed")
-                if pub_date_parsed:
-                    warning["pub_date_parsed"] = datetime(
-                        *pub_date_parsed[:6]).isoformat()
-                else:
-                    warning["pub_date_parsed"] = None
-            except:
-                warning["pub_date_parsed"] = None
-
-        # Extract warning type from title
-        title_lower = warning["title"].lower()
-        if "marine" in title_lower:
-            warning["type"] = "Marine"
-        elif "severe weather" in title_lower:
-            warning["type"] = "Severe Weather"
-        elif "fire" in title_lower:
-            warning["type"] = "Fire Weather"
-        elif "sheep" in title_lower:
-            warning["type"] = "Agricultural"
-        elif "flood" in title_lower:
-            warning["type"] = "Flood"
-        elif "cyclone" in title_lower:
-            warning["type"] = "Tropical Cyclone"
-        else:
-            warning["type"] = "General"
-
-        # Fetch detailed content if requested
-        if fetch_details and warning["link"]:
-            warning["details"] = fetch_warning_details(warning["link"])
-
-        warnings.append(warning)
-
-    return warnings
-
-
-def filter_warnings_by_location(warnings: List[Dict[str, Any]], lat: float, lon: float, radius_km: float) -> List[Dict[str, Any]]:
+    Raises:
+        Exception: If the cursor is malformed or the warnings changed since
+            it was issued
+    """
+    offset = 0
+    if cursor:
+        state = decode_cursor(cursor)
+        if state.get("v") != version:
+            raise Exception("Warnings have been updated since this cursor was issued, "
+                            "restart from the first page")
+        offset = state.get("o")
+        if not isinstance(offset, int) or offset < 0:
+            raise Exception("Invalid cursor")
+    if limit is None:
+        return warnings[offset:], None
+    limit = min(limit, settings.WARNINGS_MAX_PAGE_SIZE)
+    end = offset + limit
+    next_cursor = encode_cursor({"v": version, "o": end}) if end < len(warnings) else None
+    return warnings[offset:end], next_cursor
+
+
+def filter_warnings_by_location(warnings: List[Dict[str, Any]], lat: float, lon: float, radius_km: float,
+                                nearest: Optional[Tuple[Dict[str, Any], float]] = None) -> List[Dict[str, Any]]:
     """
     Filter warnings based on location radius.
-    Note: This is a basic implementation that returns all warnings with location context.
-    For more accurate filtering, we would need specific location data for each warning.
+
+    Keeps the warnings whose areas (attached at ingest by locate_warnings)
+    intersect the circle of radius_km around the point; the intersecting
+    areas are found through the R-tree of warning area geometries. Warnings
+    that name no known area are kept when WARNINGS_INCLUDE_UNLOCATED is set.
+    If no area geometry is available every warning is returned.
+
+    The nearest station lookup can be passed in as a (station, distance_km)
+    tuple when the caller already has it; otherwise it is computed once here.
     """
 
     # Get nearest station for reference
-    nearest_station = find_nearest_station(lat, lon)
+    if nearest is None:
+        nearest = get_station_index().nearest(lat, lon)
+    nearest_station, nearest_distance = nearest if nearest else (None, None)
 
-    # Add location context to all warnings
+    area_index = get_warning_area_index()
+    nearby_areas = area_index.areas_near(
+        lat, lon, radius_km) if area_index is not None else None
+
+    # Add location context to the warnings that cover the search area
     filtered_warnings = []
     for warning in warnings:
+        areas = warning.get("areas") or []
+        if nearby_areas is not None:
+            if not areas and not settings.WARNINGS_INCLUDE_UNLOCATED:
+                continue
+            if areas and nearby_areas.isdisjoint(areas):
+                continue
+
         # Add location context
         warning_with_location = warning.copy()
+        warning_with_location["matched_areas"] = sorted(
+            nearby_areas.intersection(areas)) if nearby_areas else []
         warning_with_location["request_location"] = {
             "lat": lat,
             "lon": lon,
@@ -262,7 +143,7 @@ def filter_warnings_by_location(warnings: List[Dict[str, Any]], lat: float, lon:
         if nearest_station:
             warning_with_location["nearest_station"] = {
                 "name": nearest_station["name"],
-                "distance_km": calculate_distance(lat, lon, nearest_station["lat"], nearest_station["lon"])
+                "distance_km": nearest_distance
             }
 
         filtered_warnings.append(warning_with_location)
@@ -271,36 +152,43 @@ def filter_warnings_by_location(warnings: List[Dict[str, Any]], lat: float, lon:
 
 
 @router.post("/warnings", tags=["warnings"])
-def get_weather_warnings(request: WarningsRequest, token: str = Depends(verify_token)):
+async def get_weather_warnings(request: WarningsRequest, token: str = Depends(verify_token)):
     """
     Get weather warnings for a specific location within a radius.
-    Returns all active weather warnings from BOM RSS feed with optional detailed content.
+    Returns the active weather warnings from BOM RSS feed whose forecast districts or
+    catchments intersect the radius, with optional detailed content. Warnings are read from the in-memory snapshot kept by the background poller.
     """
     print(
         f"[WARNINGS] Fetching weather warnings for coordinates: ({request.lat}, {request.lon})")
     print(
         f"[WARNINGS] Search radius: {request.radius_km} km, Fetch details: {request.fetch_details}")
     try:
-        feed_data = fetch_warnings_rss()
-
-        # Parse warnings with optional details
-        all_warnings = parse_warnings_feed(
-            feed_data, fetch_details=request.fetch_details or False)
-
-        # Filter by location (basic implementation for now)
-        filtered_warnings = filter_warnings_by_location(
-            all_warnings,
-            request.lat,
-            request.lon,
-            request.radius_km or 100.0
-        )
-
-        # Get nearest station info for context
-        nearest_station = find_nearest_station(request.lat, request.lon)
+        snapshot = await get_warnings_snapshot()
+        fields = parse_fields(request.fields)
+        fetch_details = bool(request.fetch_details) and (fields is None or "details" in fields)
+        all_warnings = _select_details(snapshot.warnings, fetch_details)
+
+        # Nearest station is looked up once and shared with the filter
+        nearest = get_station_index().nearest(request.lat, request.lon)
+        nearest_station = nearest[0] if nearest else None
+
+        # Keep warnings whose areas intersect the search radius
+        with span("warnings.filter"):
+            filtered_warnings = filter_warnings_by_location(
+                all_warnings,
+                request.lat,
+                request.lon,
+                request.radius_km or 100.0,
+                nearest=nearest
+            )
         print(
             f"[WARNINGS] Found {len(filtered_warnings)} warnings in the area")
+        page, next_cursor = paginate_warnings(
+            filtered_warnings, snapshot.version, request.limit, request.cursor)
+        add_data_version("warnings", snapshot.version)
 
-        return {
+        # Returned as a response so warning details skip jsonable_encoder
+        return ORJSONResponse({
             "code": 0,
             "message": "Success",
             "data": {
@@ -316,14 +204,17 @@ def get_weather_warnings(request: WarningsRequest, token: str = Depends(verify_t
                     "lon": nearest_station["lon"] if nearest_station else None
                 } if nearest_station else None,
                 "total_warnings": len(filtered_warnings),
-                "warnings": filtered_warnings,
+                "warnings": [project(warning, fields) for warning in page],
+                "next_cursor": next_cursor,
                 "feed_info": {
                     "source": "Bureau of Meteorology - Western Australia",
-                    "url": feed_data["url"],
-                    "details_fetched": request.fetch_details
+                    "url": snapshot.url,
+                    "details_fetched": fetch_details,
+                    "version": snapshot.version,
+                    "fetched_at": snapshot.fetched_at
                 }
             }
-        }
+        })
 
     except Exception as e:
         print(f"[WARNINGS] Error occurred: {str(e)}")
@@ -335,40 +226,50 @@ def get_weather_warnings(request: WarningsRequest, token: str = Depends(verify_t
 
 
 @router.get("/warnings/all", tags=["warnings"])
-def get_all_weather_warnings(fetch_details: bool = True, token: str = Depends(verify_token)):
+async def get_all_weather_warnings(fetch_details: bool = True,
+                                   fields: Optional[str] = None,
+                                   limit: Optional[int] = Query(None, ge=1),
+                                   cursor: Optional[str] = None,
+                                   token: str = Depends(verify_token)):
     """
     Get all weather warnings without location filtering.
     Returns all active weather warnings from BOM RSS feed with optional detailed content.
+    Warnings are read from the in-memory snapshot kept by the background poller.
 
     Query parameters:
-    - fetch_details: Whether to fetch detailed content from each warning URL (default: True)
+    - fetch_details: Whether to include detailed content from each warning URL (default: True)
+    - fields: Comma-separated warning keys to return, e.g. "title,link,pub_date"
+    - limit: Warnings per page (capped at WARNINGS_MAX_PAGE_SIZE; default: all)
+    - cursor: next_cursor from the previous page
     """
     print(f"[ALL WARNINGS] Fetching all weather warnings from BOM")
     print(f"[ALL WARNINGS] Fetch details: {fetch_details}")
     try:
-        # Fetch RSS feed
-        print(f"[ALL WARNINGS] Connecting to BOM RSS feed...")
-        feed_data = fetch_warnings_rss()
-
-        # Parse warnings with details
-        print(f"[ALL WARNINGS] Parsing RSS feed data...")
-        all_warnings = parse_warnings_feed(
-            feed_data, fetch_details=fetch_details)
+        snapshot = await get_warnings_snapshot()
+        field_list = parse_fields(fields)
+        fetch_details = fetch_details and (field_list is None or "details" in field_list)
+        all_warnings = _select_details(snapshot.warnings, fetch_details)
         print(f"[ALL WARNINGS] Found {len(all_warnings)} total warnings")
+        page, next_cursor = paginate_warnings(all_warnings, snapshot.version, limit, cursor)
+        add_data_version("warnings", snapshot.version)
 
-        return {
+        # Returned as a response so warning details skip jsonable_encoder
+        return ORJSONResponse({
             "code": 0,
             "message": "Success",
             "data": {
                 "total_warnings": len(all_warnings),
-                "warnings": all_warnings,
+                "warnings": [project(warning, field_list) for warning in page],
+                "next_cursor": next_cursor,
                 "feed_info": {
                     "source": "Bureau of Meteorology - Western Australia",
-                    "url": feed_data["url"],
-                    "details_fetched": fetch_details
+                    "url": snapshot.url,
+                    "details_fetched": fetch_details,
+                    "version": snapshot.version,
+                    "fetched_at": snapshot.fetched_at
                 }
             }
-        }
+        })
 
     except Exception as e:
         print(f"[ALL WARNINGS] Error occurred: {str(e)}")
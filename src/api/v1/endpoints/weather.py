@@ -7,14 +7,23 @@ weather data from the Bureau of Meteorology and other weather services.
 """
 
 from fastapi import APIRouter, Depends
-from typing import Dict, Any
-from pydantic import BaseModel
-import requests
-from datetime import datetime
+from typing import Dict, Any, List, Literal, Optional, Tuple
+from pydantic import BaseModel, Field
+from datetime import datetime, timedelta
+import asyncio
 import io
+import numpy as np
 import pandas as pd
 
+from src.core import history_store, upstream
+from src.core.bom import fetch_weather_observation
+from src.core.config import settings
 from src.core.helpers import find_nearest_station
+from src.core.http_cache import add_data_version
+from src.core.pagination import decode_cursor, encode_cursor, parse_fields
+from src.core.responses import ORJSONResponse
+from src.core.singleflight import coalesce, make_key
+from src.core.tracing import span
 from src.core.auth import verify_token
 
 router = APIRouter()
@@ -48,79 +57,218 @@ def get_months_in_range(start_date: datetime, end_date: datetime) -> list:
     return months
 
 
-def fetch_historical_data(station: Dict[str, Any], start_date: datetime, end_date: datetime) -> list:
+def parse_history_csv(content: bytes) -> Optional[pd.DataFrame]:
+    """
+    Parse a BOM monthly daily-observations CSV into a DataFrame.
+
+    BOM prefixes the CSV with free-text notes, so the header row is located
+    by looking for the 'Date' column within the first lines.
+
+    Args:
+        content (bytes): Raw CSV download
+
+    Returns:
+        Optional[pd.DataFrame]: Parsed rows with 'Date' as datetime, or None
+            if no header/Date column was found or the file has no rows
+    """
+    text = content.decode('utf-8', errors='ignore')
+    lines = text.split('\n')
+    header_line = None
+
+    for i, line in enumerate(lines):
+        if 'Date' in line and (',' in line or 'temperature' in line.lower()):
+            header_line = i
+            break
+        if i > 20:
+            break
+
+    if header_line is None:
+        return None
+
+    csv_content = '\n'.join(lines[header_line:])
+    df = pd.read_csv(io.StringIO(csv_content), on_bad_lines='skip')
+    if df.empty or 'Date' not in df.columns:
+        return None
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    return df
+
+
+async def fetch_history_month(station: Dict[str, Any], month: str) -> Optional[pd.DataFrame]:
+    """
+    Return one parsed month of history, from the local store when possible.
+
+    Settled months are downloaded and parsed once and then read from the
+    on-disk store; the current month is refetched once its copy expires.
+
+    Args:
+        station (Dict[str, Any]): Station dictionary with 'history_url_template'
+        month (str): Month in YYYYMM format
+
+    Returns:
+        Optional[pd.DataFrame]: Parsed month, or None if BOM has no usable data
+
+    Raises:
+        Exception: If the download fails
+    """
+    product = history_store.product_key(station)
+    loop = asyncio.get_running_loop()
+    # Store reads and writes are blocking file I/O; months load concurrently
+    with span("history.load_month"):
+        df = await loop.run_in_executor(None, history_store.load_month, product, month)
+    if df is not None:
+        return df
+
+    url = station['history_url_template'].replace(
+        'YYYYMM', month).replace('YYYYMM', month)
+    headers = {
+        'Accept': 'text/csv,application/csv,text/plain,*/*',
+    }
+
+    async def call():
+        response = await upstream.request(
+            upstream.BOM, "GET", url, operation="history_csv", headers=headers)
+        if response.status_code != 200:
+            raise Exception(
+                f"Failed to fetch history for {month}: HTTP {response.status_code}")
+
+        with span("bom.parse_history_csv"):
+            df = await loop.run_in_executor(None, parse_history_csv, response.content)
+        if df is not None:
+            await loop.run_in_executor(None, history_store.save_month, product, month, df)
+        return df
+
+    # Concurrent requests for the same month share one download and parse
+    return await coalesce(make_key("GET", url), call)
+
+
+def clean_history_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize historical rows column by column.
+
+    Blank strings become nulls, text is stripped, rows and columns with no
+    values are dropped and 'Date' is formatted as an ISO timestamp string.
+
+    Args:
+        df (pd.DataFrame): Concatenated history rows
+
+    Returns:
+        pd.DataFrame: Cleaned frame ready for serialization
+    """
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        # .str yields NaN for non-string cells; keep those values as they were
+        stripped = df[col].str.strip()
+        df[col] = stripped.where(stripped.notna(), df[col]).replace('', np.nan)
+    df = df.dropna(how='all').dropna(axis=1, how='all')
+    if 'Date' in df.columns:
+        df['Date'] = df['Date'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+    return df
+
+
+def _column_values(series: pd.Series) -> list:
+    """Convert a column to native Python values with None for nulls."""
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def history_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Build one dict per row, omitting null cells.
+
+    Args:
+        df (pd.DataFrame): Frame returned by clean_history_frame()
+
+    Returns:
+        List[Dict[str, Any]]: Row dictionaries keyed by CSV column name
+    """
+    columns = list(df.columns)
+    values = [_column_values(df[col]) for col in columns]
+    return [{col: val for col, val in zip(columns, row) if val is not None}
+            for row in zip(*values)]
+
+
+def history_columns(df: pd.DataFrame) -> Dict[str, list]:
+    """
+    Build a column-oriented payload: one array per CSV column.
+
+    Args:
+        df (pd.DataFrame): Frame returned by clean_history_frame()
+
+    Returns:
+        Dict[str, list]: Column name to values (None for nulls), row aligned
+    """
+    return {col: _column_values(df[col]) for col in df.columns}
+
+
+async def fetch_historical_data(station: Dict[str, Any], start_date: datetime, end_date: datetime,
+                                columnar: bool = False,
+                                fields: Optional[List[str]] = None) -> Tuple[Any, list]:
     """
     Fetch historical weather data for a specific station within a date range.
 
     Downloads and processes historical weather data from the Bureau of Meteorology
-    for the specified station and date range. Data is retrieved month by month
-    using the station's historical data URL template.
+    for the specified station and date range. Months are fetched concurrently,
+    at most HISTORY_MAX_CONCURRENCY at a time, with completed months served from
+    the local history store. Months still outstanding after
+    HISTORY_REQUEST_DEADLINE_SECONDS are cancelled and reported as failed.
 
     Args:
         station (Dict[str, Any]): Station information dictionary containing
             'history_url_template' and other station metadata
         start_date (datetime): Start date for historical data retrieval
         end_date (datetime): End date for historical data retrieval
+        columnar (bool): Return a dict of column arrays instead of row dicts
+        fields (Optional[List[str]]): CSV columns to return ('Date' is always
+            included); other columns are dropped before rows are built
 
     Returns:
-        list: List of dictionaries containing processed historical weather data
+        Tuple[Any, list]: (data, failed_months) where data is the list of
+            processed historical weather rows in date order (or a dict of
+            column arrays when columnar is True) and failed_months lists
+            {"month", "error"} for every month that could not be loaded
     """
     months = get_months_in_range(start_date, end_date)
-    all_data = []
-
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/csv,application/csv,text/plain,*/*',
-        'Accept-Encoding': 'gzip, deflate, br'
-    }
-
-    for month in months:
-        url = station['history_url_template'].replace(
-            'YYYYMM', month).replace('YYYYMM', month)
-
+    semaphore = asyncio.Semaphore(settings.HISTORY_MAX_CONCURRENCY)
+
+    async def fetch_bounded(month: str) -> Optional[pd.DataFrame]:
+        async with semaphore:
+            return await fetch_history_month(station, month)
+
+    tasks = [asyncio.ensure_future(fetch_bounded(month)) for month in months]
+    pending = set()
+    if tasks:
+        _, pending = await asyncio.wait(
+            tasks, timeout=settings.HISTORY_REQUEST_DEADLINE_SECONDS)
+    for task in pending:
+        task.cancel()
+
+    frames = []
+    failed_months = []
+    for month, task in zip(months, tasks):
+        if task in pending:
+            failed_months.append({"month": month, "error": "Deadline exceeded"})
+            continue
         try:
-            response = requests.get(url, headers=headers, stream=True)
-
-            if response.status_code == 200:
-                try:
-                    content = response.content.decode('utf-8', errors='ignore')
-                    lines = content.split('\n')
-                    header_line = None
-
-                    for i, line in enumerate(lines):
-                        if 'Date' in line and (',' in line or 'temperature' in line.lower()):
-                            header_line = i
-                            break
-                        if i > 20:
-                            break
-
-                    if header_line is not None:
-                        csv_content = '\n'.join(lines[header_line:])
-                        df = pd.read_csv(io.StringIO(
-                            csv_content), on_bad_lines='skip')
-
-                        if not df.empty and 'Date' in df.columns:
-                            df['Date'] = pd.to_datetime(
-                                df['Date'], errors='coerce')
-                            mask = (df['Date'] >= start_date) & (
-                                df['Date'] <= end_date)
-                            filtered_df = df[mask]
-
-                            for _, row in filtered_df.iterrows():
-                                cleaned_row = {}
-                                for col, val in row.items():
-                                    if pd.notna(val) and str(val).strip() != '':
-                                        cleaned_row[col] = val
-                                if cleaned_row:
-                                    all_data.append(cleaned_row)
-
-                except Exception as e:
-                    continue
+            df = task.result()
+            if df is None:
+                continue
+
+            mask = (df['Date'] >= start_date) & (df['Date'] <= end_date)
+            if fields is not None:
+                columns = ['Date'] + [c for c in fields if c in df.columns and c != 'Date']
+                frames.append(df.loc[mask, columns])
+            else:
+                frames.append(df[mask])
 
         except Exception as e:
-            continue
+            print(f"[HISTORICAL] Failed to load {month}: {str(e)}")
+            failed_months.append({"month": month, "error": str(e)})
+
+    if not frames:
+        return ({} if columnar else []), failed_months
 
-    return all_data
+    df = clean_history_frame(pd.concat(frames, ignore_index=True, sort=False))
+    data = history_columns(df) if columnar else history_records(df)
+    return data, failed_months
 
 
 class WeatherRequest(BaseModel):
@@ -144,15 +292,26 @@ class HistoricalWeatherRequest(BaseModel):
         lon (float): Longitude coordinate in decimal degrees
         start_date (str): Start date in YYYY-MM-DD format
         end_date (str): End date in YYYY-MM-DD format
+        format (str): "records" for a list of row objects (default) or
+            "columns" for one array per column, suited to charting clients
+        fields (Optional[List[str]]): CSV columns to return, e.g.
+            ["Rainfall (mm)", "Maximum temperature (°C)"]; 'Date' is always included
+        limit (Optional[int]): Days per page (default and maximum:
+            HISTORY_MAX_PAGE_DAYS)
+        cursor (Optional[str]): next_cursor from the previous page
     """
     lat: float
     lon: float
     start_date: str  # Format: "YYYY-MM-DD"
     end_date: str    # Format: "YYYY-MM-DD"
+    format: Literal["records", "columns"] = "records"
+    fields: Optional[List[str]] = None
+    limit: Optional[int] = Field(None, ge=1)
+    cursor: Optional[str] = None
 
 
 @router.post("/weather", tags=["weather"])
-def get_weather(request: WeatherRequest, token: str = Depends(verify_token)):
+async def get_weather(request: WeatherRequest, token: str = Depends(verify_token)):
     """
     Get current weather data for specified coordinates.
 
@@ -183,30 +342,7 @@ def get_weather(request: WeatherRequest, token: str = Depends(verify_token)):
             }
 
         # Get weather data from BOM API
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        response = requests.get(nearest_station['url'], headers=headers)
-
-        if response.status_code != 200:
-            return {
-                "code": 1,
-                "message": f"Failed to fetch weather data: HTTP {response.status_code}",
-                "data": None
-            }
-
-        weather_data = response.json()
-
-        # Extract data from the response
-        if 'observations' not in weather_data or 'data' not in weather_data['observations']:
-            return {
-                "code": 1,
-                "message": "Invalid weather data format",
-                "data": None
-            }
-
-        observations = weather_data['observations']['data']
+        observations = await fetch_weather_observation(nearest_station)
 
         # Filter and format the relevant data
         filtered_data = []
@@ -231,6 +367,8 @@ def get_weather(request: WeatherRequest, token: str = Depends(verify_token)):
             }
             filtered_data.append(filtered_obs)
 
+        add_data_version("observation", nearest_station["station_id"],
+                         filtered_data[0]["local_date_time_full"] if filtered_data else None)
         return {
             "code": 0,
             "message": "Success",
@@ -254,7 +392,7 @@ def get_weather(request: WeatherRequest, token: str = Depends(verify_token)):
 
 
 @router.post("/weather/historical", tags=["weather"])
-def get_historical_weather(request: HistoricalWeatherRequest, token: str = Depends(verify_token)):
+async def get_historical_weather(request: HistoricalWeatherRequest, token: str = Depends(verify_token)):
     """
     Get historical weather data for specified coordinates and date range.
 
@@ -270,9 +408,13 @@ def get_historical_weather(request: HistoricalWeatherRequest, token: str = Depen
         dict: Response containing:
             - code (int): Status code (0 for success, 1 for error)
             - message (str): Status message
-            - data: List of historical weather records or None if error
+            - data: Historical weather records (row list or column arrays,
+              per the requested format) or None if error
             - station_info: Information about the weather station used
             - date_range: The requested date range
+            - failed_months: Months that could not be loaded, with the reason
+            - page: Date window of this page and next_cursor (None on the
+              last page)
     """
     try:
         # Parse dates
@@ -296,11 +438,32 @@ def get_historical_weather(request: HistoricalWeatherRequest, token: str = Depen
                 "data": None
             }
 
-        # Fetch historical data
-        historical_data = fetch_historical_data(
-            nearest_station, start_date, end_date)
+        # Pages are windows of at most `limit` days (one CSV row per day),
+        # so only the months of the current window are loaded
+        page_start = start_date
+        if request.cursor:
+            try:
+                after = datetime.strptime(decode_cursor(request.cursor)["after"], "%Y-%m-%d")
+            except Exception:
+                raise Exception("Invalid cursor")
+            if not start_date <= after < end_date:
+                return {"code": 1, "message": "Cursor is outside the requested date range", "data": None}
+            page_start = after + timedelta(days=1)
+        limit = min(request.limit or settings.HISTORY_MAX_PAGE_DAYS, settings.HISTORY_MAX_PAGE_DAYS)
+        page_end = min(end_date, page_start + timedelta(days=limit - 1))
+        next_cursor = (encode_cursor({"after": page_end.strftime("%Y-%m-%d")})
+                       if page_end < end_date else None)
 
-        return {
+        # Fetch historical data
+        columnar = request.format == "columns"
+        historical_data, failed_months = await fetch_historical_data(
+            nearest_station, page_start, page_end, columnar=columnar,
+            fields=parse_fields(request.fields))
+        records_count = (len(historical_data.get("Date", [])) if columnar
+                         else len(historical_data))
+
+        # Returned as a response so the rows skip jsonable_encoder
+        return ORJSONResponse({
             "code": 0,
             "message": "Success",
             "data": {
@@ -314,10 +477,18 @@ def get_historical_weather(request: HistoricalWeatherRequest, token: str = Depen
                     "start_date": request.start_date,
                     "end_date": request.end_date
                 },
-                "records_count": len(historical_data),
-                "historical_data": historical_data
+                "records_count": records_count,
+                "format": request.format,
+                "historical_data": historical_data,
+                "failed_months": failed_months,
+                "page": {
+                    "start_date": page_start.strftime("%Y-%m-%d"),
+                    "end_date": page_end.strftime("%Y-%m-%d"),
+                    "limit_days": limit,
+                    "next_cursor": next_cursor
+                }
             }
-        }
+        })
 
     except ValueError as e:
         return {
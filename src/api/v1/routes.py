@@ -7,7 +7,7 @@ tags for API documentation and logical grouping.
 """
 
 from fastapi import APIRouter
-from .endpoints import health, weather, forecast, warnings, gweather, risk, report
+from .endpoints import health, weather, forecast, warnings, gweather, risk, report, location
 
 # Main API router for version 1
 api_router = APIRouter()
@@ -20,3 +20,4 @@ api_router.include_router(warnings.router, prefix="", tags=["warnings"])
 api_router.include_router(gweather.router, prefix="", tags=["google"])
 api_router.include_router(risk.router, prefix="", tags=["risk"])
 api_router.include_router(report.router, prefix="", tags=["report"])
+api_router.include_router(location.router, prefix="", tags=["location"])
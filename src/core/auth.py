@@ -31,7 +31,7 @@ def get_api_token() -> str:
     return token
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> str:
+async def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> str:
     """
     Verify the provided Bearer token against the configured API token.
 
@@ -3,53 +3,185 @@ Bureau of Meteorology (BOM) Integration Module
 
 This module provides functions to fetch and parse weather data from the
 Australian Bureau of Meteorology. It handles weather observations and
-forecast data retrieval from BOM's public APIs.
+forecast data retrieval from BOM's public APIs, and keeps a revalidated
+in-memory copy of the forecast product and of each station's latest
+observations.
 """
 
+import asyncio
+import io
+import time
 import xml.etree.ElementTree as ET
-import requests
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
 
+from src.core import upstream
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.core.metrics import CACHE_HITS, CACHE_MISSES
+from src.core.singleflight import coalesce, make_key
+from src.core.tracing import span
 
-def fetch_weather_observation(station):
+FORECAST_URL = "http://www.bom.gov.au/fwo/IDW14199.xml"
+
+# Latest observations per station feed URL, expiring when the next is due
+_observation_cache = TTLCache(
+    "bom_observations", max_entries=settings.BOM_OBSERVATION_CACHE_SIZE)
+
+
+def observation_ttl(station, observations, now=None):
+    """
+    Seconds until a station is expected to publish its next observation.
+
+    The latest observation's local_date_time_full (station local time, in
+    BOM_OBSERVATION_TIMEZONE) plus the station's cadence gives the expected
+    time of the next observation; a grace period covers publishing delay.
+    The result is clamped between BOM_OBSERVATION_MIN_TTL_SECONDS and the
+    cadence, so a late feed is rechecked regularly but not hammered.
+
+    Args:
+            station (dict): Station dictionary; an optional
+                    'observation_cadence_minutes' key overrides the default cadence
+            observations (list): Observations as returned by BOM, newest first
+            now (datetime, optional): Current time (timezone-aware), for testing
+
+    Returns:
+            float: Cache lifetime in seconds
+    """
+    cadence = 60 * station.get('observation_cadence_minutes',
+                               settings.BOM_OBSERVATION_CADENCE_MINUTES)
+    minimum = settings.BOM_OBSERVATION_MIN_TTL_SECONDS
+    try:
+        latest = datetime.strptime(
+            observations[0]['local_date_time_full'], "%Y%m%d%H%M%S")
+    except (IndexError, KeyError, TypeError, ValueError):
+        return minimum
+    latest = latest.replace(tzinfo=ZoneInfo(settings.BOM_OBSERVATION_TIMEZONE))
+    now = now or datetime.now(timezone.utc)
+    ttl = (latest - now).total_seconds() + cadence + settings.BOM_OBSERVATION_GRACE_SECONDS
+    return max(minimum, min(ttl, cadence))
+
+
+async def fetch_weather_observation(station):
     """
     Fetch current weather observations for a specific weather station.
 
     Retrieves the latest weather observation data from the Bureau of
-    Meteorology for the specified station. Includes proper headers to
-    avoid 403 responses from the BOM servers.
+    Meteorology for the specified station through the shared BOM client,
+    which carries the browser headers needed to avoid 403 responses.
+
+    Observations are cached per station until the next observation is due
+    (see observation_ttl), so each station feed is downloaded at most once
+    per update interval however many requests ask for it.
 
     Args:
             station (dict): Dictionary containing station information including 'url'
                     key with the BOM API endpoint URL
 
     Returns:
-            list: List of weather observation data from the station
+            list: List of weather observation data from the station. Shared
+                    between callers; must not be mutated.
 
     Raises:
             Exception: If the HTTP request fails or the response format is invalid
     """
-    # Use proper User-Agent header to avoid 403 from bom.gov.au
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    response = requests.get(station['url'], headers=headers)
+    url = station['url']
+    observations = _observation_cache.get(url)
+    if observations is not None:
+        return observations
+
+    async def load():
+        observations = await _download_observations(url)
+        _observation_cache.set(url, observations,
+                               ttl=observation_ttl(station, observations))
+        return observations
+
+    # Concurrent misses for the same station share one download
+    return await coalesce(make_key("GET", url), load)
+
+
+async def _download_observations(url):
+    """Download and validate a station's observation JSON."""
+    response = await upstream.request(upstream.BOM, "GET", url, operation="observations")
     if response.status_code != 200:
         raise Exception(
             f"Failed to fetch weather data: HTTP {response.status_code}")
-    weather_data = response.json()
+    with span("bom.parse_observations"):
+        weather_data = response.json()
     if 'observations' not in weather_data or 'data' not in weather_data['observations']:
         raise Exception("Invalid weather data format")
     observations = weather_data['observations']['data']
     return observations
 
 
+def _build_period(area_name, period):
+    """
+    Convert a <forecast-period> element into the API's period dictionary.
+
+    Args:
+            area_name (str): Description of the enclosing <area>
+            period (Element): The <forecast-period> element
+
+    Returns:
+            dict: Period dictionary with area, start_time, end_time and forecast
+    """
+    period_data = {
+        "area": area_name,
+        "start_time": period.attrib.get("start-time-local", ""),
+        "end_time": period.attrib.get("end-time-local", ""),
+        "forecast": {}
+    }
+    for elem in period:
+        if elem.tag == "text":
+            period_data["forecast"][elem.attrib.get(
+                "type", "text")] = elem.text
+        else:
+            period_data["forecast"][elem.tag] = elem.text
+    return period_data
+
+
+def build_forecast_index(xml_content):
+    """
+    Parse a BOM forecast product into an index keyed by AAC.
+
+    Streams the document with iterparse and discards each <area> element
+    once its forecast periods have been converted, so peak memory stays
+    close to one area rather than the whole tree.
+
+    Args:
+            xml_content (bytes | str): Raw XML content from BOM forecast API
+
+    Returns:
+            tuple: (index, issue_time) where index maps each AAC to its list of
+                    forecast period dictionaries (see parse_forecast_for_station)
+                    and issue_time is the product's <issue-time-utc> or None
+    """
+    if isinstance(xml_content, str):
+        xml_content = xml_content.encode("utf-8")
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    issue_time = None
+    for _, elem in ET.iterparse(io.BytesIO(xml_content), events=("end",)):
+        if elem.tag == "area":
+            area_name = elem.attrib.get("description", "")
+            periods = [_build_period(area_name, period)
+                       for period in elem.findall("forecast-period")]
+            index.setdefault(elem.attrib.get("aac", ""), []).extend(periods)
+            elem.clear()
+        elif elem.tag == "issue-time-utc" and issue_time is None:
+            issue_time = elem.text
+    return index, issue_time
+
+
 def parse_forecast_for_station(xml_content, aac):
     """
     Parse BOM forecast XML data for a specific area administrative code (AAC).
 
     Processes the XML forecast data from the Bureau of Meteorology and extracts
     forecast information for the specified area. The AAC is used to filter
-    forecasts to a specific geographic area.
+    forecasts to a specific geographic area. Request handlers should use
+    get_forecast_for_station(), which looks the AAC up in an index built once
+    per product issue instead of parsing the document again.
 
     Args:
             xml_content (str): Raw XML content from BOM forecast API
@@ -62,30 +194,37 @@ def parse_forecast_for_station(xml_content, aac):
                     - end_time: Forecast period end time  
                     - forecast: Dictionary of forecast elements and text
     """
-    root = ET.fromstring(xml_content)
-    forecasts = []
-    for area in root.findall(".//area"):
-        if area.attrib.get("aac", "") != aac:
-            continue
-        area_name = area.attrib.get("description", "")
-        for period in area.findall("forecast-period"):
-            period_data = {
-                "area": area_name,
-                "start_time": period.attrib.get("start-time-local", ""),
-                "end_time": period.attrib.get("end-time-local", ""),
-                "forecast": {}
-            }
-            for elem in period:
-                if elem.tag == "text":
-                    period_data["forecast"][elem.attrib.get(
-                        "type", "text")] = elem.text
-                else:
-                    period_data["forecast"][elem.tag] = elem.text
-            forecasts.append(period_data)
-    return forecasts
-
-
-def fetch_bom_forecast_xml():
+    index, _ = build_forecast_index(xml_content)
+    return index.get(aac, [])
+
+
+class _ForecastProductCache:
+    """
+    Cached copy of the IDW14199 forecast product.
+
+    Holds the raw XML bytes, the HTTP validators BOM returned with them and
+    the AAC index built from that issue. A new product is indexed off the
+    event loop and then published by replacing the content, index and issue
+    time together, so readers always see a consistent issue.
+    """
+
+    def __init__(self):
+        self.content: Optional[bytes] = None
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.checked_at: float = 0.0
+        self.index: Dict[str, List[Dict[str, Any]]] = {}
+        self.issue_time: Optional[str] = None
+
+    def is_fresh(self) -> bool:
+        return (self.content is not None and
+                time.monotonic() - self.checked_at < settings.BOM_FORECAST_TTL_SECONDS)
+
+
+_forecast_cache = _ForecastProductCache()
+
+
+async def fetch_bom_forecast_xml():
     """
     Fetch forecast XML data from the Bureau of Meteorology.
 
@@ -93,20 +232,101 @@ def fetch_bom_forecast_xml():
     This data contains detailed weather forecasts for various areas
     across Australia and can be parsed using parse_forecast_for_station().
 
+    The product is cached in memory. Within BOM_FORECAST_TTL_SECONDS the
+    cached bytes are returned without contacting BOM; after that the copy is
+    revalidated with If-None-Match / If-Modified-Since so an unchanged product
+    costs a 304 instead of a full download. If revalidation fails the cached
+    copy keeps being served. Concurrent revalidations share one request.
+
     Returns:
             bytes: Raw XML content from the BOM forecast API
 
     Raises:
-            Exception: If the HTTP request fails (non-200 status code)
+            Exception: If the HTTP request fails (non-200 status code) and no
+                    cached copy is available
     """
-    url = "http://www.bom.gov.au/fwo/IDW14199.xml"
+    cache = _forecast_cache
+    if cache.is_fresh():
+        CACHE_HITS.inc("bom_forecast")
+        return cache.content
+
+    CACHE_MISSES.inc("bom_forecast")
+    return await coalesce(make_key("GET", FORECAST_URL), _revalidate_forecast)
+
+
+async def _revalidate_forecast():
+    """Download or revalidate the forecast product and update the cache."""
+    cache = _forecast_cache
+    if cache.is_fresh():
+        return cache.content
+
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'Accept-Encoding': 'gzip, deflate'
     }
-    response = requests.get(url, headers=headers)
+    if cache.content is not None:
+        if cache.etag:
+            headers['If-None-Match'] = cache.etag
+        if cache.last_modified:
+            headers['If-Modified-Since'] = cache.last_modified
+
+    try:
+        response = await upstream.request(
+            upstream.BOM, "GET", FORECAST_URL, operation="forecast_xml", headers=headers)
+    except Exception:
+        if cache.content is None:
+            raise
+        print("[BOM FORECAST] Revalidation failed, serving cached product")
+        cache.checked_at = time.monotonic()
+        return cache.content
+
+    if response.status_code == 304 and cache.content is not None:
+        cache.checked_at = time.monotonic()
+        return cache.content
     if response.status_code != 200:
-        raise Exception(
-            f"Failed to fetch forecast data: HTTP {response.status_code}")
-    return response.content
+        if cache.content is None:
+            raise Exception(
+                f"Failed to fetch forecast data: HTTP {response.status_code}")
+        print(
+            f"[BOM FORECAST] Revalidation returned HTTP {response.status_code}, serving cached product")
+        cache.checked_at = time.monotonic()
+        return cache.content
+
+    if response.content != cache.content:
+        loop = asyncio.get_running_loop()
+        with span("bom.forecast_index"):
+            index, issue_time = await loop.run_in_executor(
+                None, build_forecast_index, response.content)
+        cache.content, cache.index, cache.issue_time = (
+            response.content, index, issue_time)
+    cache.etag = response.headers.get("ETag")
+    cache.last_modified = response.headers.get("Last-Modified")
+    cache.checked_at = time.monotonic()
+    return cache.content
+
+
+async def get_forecast_for_station(aac):
+    """
+    Return the forecast periods for an AAC from the cached product index.
+
+    Fetches (or revalidates) the forecast product, which is indexed by AAC
+    once per issue, so the lookup itself is a dictionary access.
+
+    Args:
+            aac (str): Area Administrative Code to return forecasts for
+
+    Returns:
+            list: Forecast period dictionaries as produced by
+                    parse_forecast_for_station(). Callers must not mutate it.
+    """
+    await fetch_bom_forecast_xml()
+    return _forecast_cache.index.get(aac, [])
+
+
+def get_forecast_version():
+    """
+    Identify the forecast product currently served from the cache.
+
+    Returns:
+            Optional[str]: The product's issue time, falling back to its ETag
+    """
+    return _forecast_cache.issue_time or _forecast_cache.etag
@@ -0,0 +1,577 @@
+"""
+BOM Weather Warnings Module
+
+This module fetches and parses the Bureau of Meteorology warnings RSS feeds
+for Western Australia, including the detail page of each warning. A
+background poller keeps the latest parsed feed in memory as a versioned
+snapshot so request handlers never wait on BOM.
+"""
+
+import asyncio
+import feedparser
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from src.core import upstream
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.core.singleflight import coalesce, make_key
+from src.core.spatial import AreaIndex, load_area_index
+from src.core.tracing import span
+
+# Mirrors of the all-WA warnings product, raced against each other
+WARNINGS_FEED_MIRRORS = [
+    "https://www.bom.gov.au/fwo/IDZ00060.warnings_wa.xml",
+    "http://www.bom.gov.au/fwo/IDZ00060.warnings_wa.xml",
+]
+# Partial feeds, tried in order only if no mirror answered
+WARNINGS_SUBSET_FEEDS = [
+    "https://www.bom.gov.au/fwo/IDZ00059.warnings_land_wa.xml",  # Land warnings
+    "https://www.bom.gov.au/fwo/IDZ00058.warnings_marine_wa.xml",  # Marine warnings
+]
+# Western Australia RSS feeds, in order of preference
+WARNINGS_FEED_URLS = WARNINGS_FEED_MIRRORS + WARNINGS_SUBSET_FEEDS
+
+# Parsed warning pages keyed by feed guid (or link)
+_details_cache = TTLCache(
+    "warning_details", max_entries=settings.WARNING_DETAILS_CACHE_SIZE)
+
+# ETag/Last-Modified of the last successful download of each feed URL
+_feed_validators: Dict[str, Dict[str, Optional[str]]] = {}
+
+
+async def fetch_warning_page(url: str) -> bytes:
+    """
+    Download a BOM warning page through the pooled BOM client.
+
+    Args:
+        url (str): The URL of the BOM warning page to fetch
+
+    Returns:
+        bytes: Raw HTML of the page
+
+    Raises:
+        Exception: If the page cannot be fetched (non-200 status code)
+    """
+    headers = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    }
+
+    async def call():
+        response = await upstream.request(
+            upstream.BOM, "GET", url, operation="warning_page", headers=headers, timeout=10)
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}")
+        return response.content
+
+    return await coalesce(make_key("GET", url), call)
+
+
+def parse_warning_details(content: bytes) -> Dict[str, Any]:
+    """
+    Parse the HTML of a BOM warning page into structured details.
+
+    Extracts structured information including warning text, areas,
+    and other relevant details.
+
+    Args:
+        content (bytes): Raw HTML of the warning page
+
+    Returns:
+        Dict[str, Any]: Dictionary containing parsed warning details including
+            title, content, warning areas, and metadata
+    """
+    try:
+        soup = BeautifulSoup(content, 'lxml')
+
+        details = {}
+
+        product_content = soup.find('div', {'class': 'product'})
+        if not product_content:
+            product_content = soup.find('div', {'id': 'content'})
+        if not product_content:
+            product_content = soup.find('pre')
+
+        if product_content:
+            # Extract text content
+            text = product_content.get_text(separator='\n', strip=True)
+            details['full_text'] = text
+
+            # Try to extract specific warning details
+            lines = text.split('\n')
+
+            # Extract warning type
+            for line in lines[:5]:
+                if 'WARNING' in line.upper() or 'WEATHER' in line.upper():
+                    details['warning_type'] = line.strip()
+                    break
+
+            # Extract location/area
+            area_pattern = r'for\s+(.+?)(?:\.|$)'
+            for line in lines:
+                match = re.search(area_pattern, line, re.IGNORECASE)
+                if match:
+                    details['affected_areas'] = match.group(1).strip()
+                    break
+
+            # Extract issue time
+            time_pattern = r'Issued at (\d+:\d+\s+\w+\s+\w+)'
+            for line in lines:
+                match = re.search(time_pattern, line)
+                if match:
+                    details['issue_time'] = match.group(1)
+                    break
+
+            # Extract warning level/severity
+            if 'SEVERE' in text.upper():
+                details['severity'] = 'Severe'
+            elif 'MODERATE' in text.upper():
+                details['severity'] = 'Moderate'
+            elif 'MINOR' in text.upper():
+                details['severity'] = 'Minor'
+            else:
+                details['severity'] = 'Standard'
+
+            # Extract next issue time if available
+            next_pattern = r'Next issue[:\s]+(.+?)(?:\.|$)'
+            for line in lines:
+                match = re.search(next_pattern, line, re.IGNORECASE)
+                if match:
+                    details['next_issue'] = match.group(1).strip()
+                    break
+
+            # Extract warning message/summary
+            warning_msg_start = ['WEATHER SITUATION:',
+                                 'WARNING:', 'FORECAST:', 'SITUATION:']
+            for start_phrase in warning_msg_start:
+                if start_phrase in text:
+                    idx = text.index(start_phrase)
+                    # Get next 500 characters or until next section
+                    msg = text[idx:idx+500].split('\n\n')[0]
+                    details['warning_message'] = msg
+                    break
+
+        return details
+
+    except Exception as e:
+        return {"error": f"Failed to parse details: {str(e)}"}
+
+
+async def fetch_warning_details(url: str) -> Dict[str, Any]:
+    """
+    Fetch and parse detailed warning content from a BOM warning URL.
+
+    Downloads the HTML content from a Bureau of Meteorology warning page
+    and extracts structured information including warning text, areas,
+    and other relevant details.
+
+    Args:
+        url (str): The URL of the BOM warning page to fetch
+
+    Returns:
+        Dict[str, Any]: Dictionary containing parsed warning details including
+            title, content, warning areas, and metadata
+    """
+    try:
+        content = await fetch_warning_page(url)
+    except Exception as e:
+        return {"error": f"Failed to fetch details: {str(e)}"}
+    with span("bom.parse_warning_details"):
+        return parse_warning_details(content)
+
+
+def _fingerprint(*parts: str) -> str:
+    """Stable hash of the given strings."""
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+async def get_warning_details(warning: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return parsed details for a feed warning, reusing cached results.
+
+    Details are cached by guid (or link). If the feed entry is unchanged the
+    cached details are returned without contacting BOM. If the entry changed
+    the page is downloaded again, but only re-parsed when the page content
+    hash differs from the cached copy. Failed fetches are not cached.
+
+    Args:
+        warning (Dict[str, Any]): Warning built by parse_warnings_feed()
+
+    Returns:
+        Dict[str, Any]: Parsed warning details or an {"error": ...} dict
+    """
+    key = warning["guid"] or warning["link"]
+    entry_hash = _fingerprint(warning["link"], warning["title"],
+                              warning["pub_date"], warning["description"])
+    cached = _details_cache.get(key)
+    if cached and cached["entry_hash"] == entry_hash:
+        return cached["details"]
+
+    try:
+        content = await fetch_warning_page(warning["link"])
+    except Exception as e:
+        return {"error": f"Failed to fetch details: {str(e)}"}
+
+    content_hash = hashlib.sha1(content).hexdigest()
+    if cached and cached["content_hash"] == content_hash:
+        details = cached["details"]
+    else:
+        loop = asyncio.get_running_loop()
+        details = await loop.run_in_executor(None, parse_warning_details, content)
+    if "error" not in details:
+        _details_cache.set(key, {"entry_hash": entry_hash,
+                                 "content_hash": content_hash,
+                                 "details": details})
+    return details
+
+
+async def _fetch_feed(url: str, conditional: bool) -> Optional[Dict[str, Any]]:
+    """
+    Download and parse one warnings feed.
+
+    Args:
+        url (str): Feed URL
+        conditional (bool): Send the validators from the last download of
+            this URL and report a 304 as not modified
+
+    Returns:
+        Optional[Dict[str, Any]]: {"feed", "url"} on success,
+            {"feed": None, "url", "not_modified": True} on a 304, or None if the
+            feed could not be used
+    """
+    headers = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Upgrade-Insecure-Requests': '1'
+    }
+    validators = _feed_validators.get(url, {})
+    if conditional:
+        if validators.get("etag"):
+            headers['If-None-Match'] = validators["etag"]
+        if validators.get("last_modified"):
+            headers['If-Modified-Since'] = validators["last_modified"]
+
+    try:
+        # Download through the pooled BOM client so the configured timeouts
+        # apply, then hand the bytes to feedparser
+        response = await upstream.request(
+            upstream.BOM, "GET", url, operation="warnings_rss", headers=headers, timeout=10)
+    except Exception as e:
+        return None
+    if response.status_code == 304 and conditional and validators:
+        return {"feed": None, "url": url, "not_modified": True}
+    if response.status_code != 200:
+        return None
+    with span("bom.parse_warnings_feed"):
+        feed = feedparser.parse(response.content)
+    if not feed.entries:
+        return None
+    _feed_validators[url] = {"etag": response.headers.get("ETag"),
+                             "last_modified": response.headers.get("Last-Modified")}
+    return {"feed": feed, "url": url}
+
+
+async def fetch_warnings_rss(conditional: bool = False) -> Dict[str, Any]:
+    """
+    Fetch weather warnings RSS feed from BOM for Western Australia.
+
+    The mirrors of the all-WA feed are requested at once and the first
+    usable answer wins, so a slow mirror does not hold up the poll; the
+    other request is cancelled. Only if both fail are the land and marine
+    feeds tried, one at a time.
+
+    Args:
+        conditional (bool): Revalidate with the stored ETag/Last-Modified;
+            the result then has "not_modified": True if BOM answered 304
+
+    Returns:
+        Dict[str, Any]: {"feed": parsed feed, "url": source URL}, or an empty
+            feed with url None if every feed failed
+    """
+    tasks = [asyncio.ensure_future(_fetch_feed(url, conditional))
+             for url in WARNINGS_FEED_MIRRORS]
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Prefer the first mirror when both finish together
+            for task in tasks:
+                if task in done and task.result() is not None:
+                    return task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    for url in WARNINGS_SUBSET_FEEDS:
+        result = await _fetch_feed(url, conditional)
+        if result is not None:
+            return result
+
+    # Return empty feed if all attempts fail
+    return {"feed": {"entries": []}, "url": None}
+
+
+async def parse_warnings_feed(feed_data: Dict[str, Any], fetch_details: bool = False) -> List[Dict[str, Any]]:
+    """
+    Parse RSS feed and extract warning information.
+
+    When fetch_details is set, detail pages are fetched concurrently (at most
+    WARNING_DETAILS_CONCURRENCY at a time) through the details cache.
+    """
+    feed = feed_data["feed"]
+    warnings = []
+
+    # Check if feed has entries attribute
+    if not hasattr(feed, 'entries'):
+        return warnings
+
+    for entry in feed.entries:
+        warning = {
+            "title": entry.get("title", "").strip(),
+            "description": entry.get("description", entry.get("summary", "")),
+            "link": entry.get("link", ""),
+            "pub_date": entry.get("published", ""),
+            "category": entry.get("category", ""),
+            "guid": entry.get("id", entry.get("guid", "")),
+        }
+
+        # Clean up title (remove extra whitespace and newlines)
+        warning["title"] = ' '.join(warning["title"].split())
+
+        # Try to parse the publication date
+        if warning["pub_date"]:
+            try:
+                pub_date_parsed = entry.get("published_parsed")
+                if pub_date_parsed:
+                    warning["pub_date_parsed"] = datetime(
+                        *pub_date_parsed[:6]).isoformat()
+                else:
+                    warning["pub_date_parsed"] = None
+            except:
+                warning["pub_date_parsed"] = None
+
+        # Extract warning type from title
+        title_lower = warning["title"].lower()
+        if "marine" in title_lower:
+            warning["type"] = "Marine"
+        elif "severe weather" in title_lower:
+            warning["type"] = "Severe Weather"
+        elif "fire" in title_lower:
+            warning["type"] = "Fire Weather"
+        elif "sheep" in title_lower:
+            warning["type"] = "Agricultural"
+        elif "flood" in title_lower:
+            warning["type"] = "Flood"
+        elif "cyclone" in title_lower:
+            warning["type"] = "Tropical Cyclone"
+        else:
+            warning["type"] = "General"
+
+        warnings.append(warning)
+
+    # Fetch detailed content if requested, several pages at a time
+    if fetch_details:
+        semaphore = asyncio.Semaphore(settings.WARNING_DETAILS_CONCURRENCY)
+
+        async def attach_details(warning: Dict[str, Any]) -> None:
+            async with semaphore:
+                warning["details"] = await get_warning_details(warning)
+
+        await asyncio.gather(*(attach_details(warning)
+                               for warning in warnings if warning["link"]))
+
+    return warnings
+
+
+@lru_cache(maxsize=1)
+def get_warning_area_index() -> Optional[AreaIndex]:
+    """
+    Return the index of warning areas, loading the GeoJSON file on first use.
+
+    The file is WARNING_AREAS_FILE if configured, otherwise
+    data/warning_areas.geojson in the project root.
+
+    Returns:
+        Optional[AreaIndex]: Area index, or None if the file is missing
+    """
+    path = settings.WARNING_AREAS_FILE
+    if not path:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        path = os.path.join(current_dir, "../../data/warning_areas.geojson")
+    return load_area_index(path)
+
+
+def locate_warnings(warnings: List[Dict[str, Any]]) -> None:
+    """
+    Attach the names of the areas each warning covers, in place.
+
+    Areas are found by matching known district and catchment names in the
+    warning title, description and parsed detail text. Done once per
+    snapshot so request-time filtering is a set intersection.
+
+    Args:
+        warnings (List[Dict[str, Any]]): Warnings from parse_warnings_feed()
+    """
+    area_index = get_warning_area_index()
+    for warning in warnings:
+        if area_index is None:
+            warning["areas"] = []
+            continue
+        details = warning.get("details") or {}
+        text = " ".join(str(part) for part in (
+            warning["title"], warning["description"],
+            details.get("affected_areas", ""), details.get("full_text", "")))
+        warning["areas"] = sorted(area_index.match_names(text))
+
+
+def content_version(warnings: List[Dict[str, Any]]) -> str:
+    """
+    Version of a list of parsed warnings, derived from its content.
+
+    Equal content gives the same version in every worker, replica and
+    restart, so ETags and pagination cursors built from it stay valid
+    across them and never match different content.
+
+    Args:
+        warnings (List[Dict[str, Any]]): Parsed and located warnings
+
+    Returns:
+        str: Short content hash
+    """
+    return _fingerprint(json.dumps(warnings, sort_keys=True, default=str))[:16]
+
+
+class WarningsSnapshot:
+    """
+    Immutable view of the warnings feed at one point in time.
+
+    Attributes:
+        version (str): Content hash of the warnings, see content_version()
+        warnings (List[Dict[str, Any]]): Parsed warnings, with details
+        url (Optional[str]): Feed URL the snapshot was built from
+        fetched_at (str): ISO timestamp (UTC) of the download
+        checked_at (float): Monotonic time of the last successful poll
+    """
+
+    def __init__(self, version: str, warnings: List[Dict[str, Any]],
+                 url: Optional[str], fetched_at: str):
+        self.version = version
+        self.warnings = warnings
+        self.url = url
+        self.fetched_at = fetched_at
+        self.checked_at = time.monotonic()
+
+
+_snapshot: Optional[WarningsSnapshot] = None
+_refresh_lock = asyncio.Lock()
+# Monotonic time of the last poll attempt, successful or not
+_polled_at: Optional[float] = None
+
+
+def _poll_age() -> float:
+    """Seconds since the last poll attempt (infinite if none was made)."""
+    return float("inf") if _polled_at is None else time.monotonic() - _polled_at
+
+
+async def refresh_warnings_snapshot(max_age: Optional[float] = None) -> WarningsSnapshot:
+    """
+    Poll BOM once and publish a new snapshot if the feed changed.
+
+    Feeds are revalidated with conditional GET; a 304, or a full download
+    whose parsed warnings are identical, keeps the current snapshot. A failed poll also keeps the current snapshot, so requests keep
+    being answered from the last good copy while BOM is unavailable.
+
+    Args:
+        max_age (Optional[float]): Skip the poll if another one was attempted
+            less than this many seconds ago, so requests waiting on the lock
+            share a single poll
+
+    Returns:
+        WarningsSnapshot: The snapshot in effect after the poll
+    """
+    global _snapshot, _polled_at
+    async with _refresh_lock:
+        current = _snapshot
+        if current is not None and max_age is not None and _poll_age() < max_age:
+            return current
+        _polled_at = time.monotonic()
+        feed_data = await fetch_warnings_rss(conditional=current is not None)
+        if feed_data.get("not_modified"):
+            if feed_data["url"] == current.url:
+                current.checked_at = time.monotonic()
+                return current
+            # Unchanged relative to an older download of a different feed
+            # than the one the snapshot came from; fetch it in full
+            feed_data = (await _fetch_feed(feed_data["url"], conditional=False)
+                         or {"feed": {"entries": []}, "url": None})
+        if feed_data["url"] is None and current is not None:
+            print("[WARNINGS POLLER] All feeds failed, keeping previous snapshot")
+            return current
+
+        warnings = await parse_warnings_feed(feed_data, fetch_details=True)
+        locate_warnings(warnings)
+        version = content_version(warnings)
+        if current is not None and current.version == version:
+            current.checked_at = time.monotonic()
+            return current
+        _snapshot = WarningsSnapshot(
+            version=version,
+            warnings=warnings,
+            url=feed_data["url"],
+            fetched_at=datetime.now(timezone.utc).isoformat(),
+        )
+        return _snapshot
+
+
+async def get_warnings_snapshot() -> WarningsSnapshot:
+    """
+    Return the current warnings snapshot.
+
+    Served from memory once the poller has run. If no snapshot exists yet
+    (first request after startup) one poll is made inline. With the poller
+    disabled, a snapshot last polled more than WARNINGS_POLL_INTERVAL_SECONDS
+    ago is refreshed inline as well; requests arriving during that refresh
+    are served the previous snapshot.
+
+    Returns:
+        WarningsSnapshot: Latest snapshot
+    """
+    max_age = settings.WARNINGS_POLL_INTERVAL_SECONDS
+    if _snapshot is not None and (settings.WARNINGS_POLLER_ENABLED or _poll_age() < max_age):
+        return _snapshot
+    return await refresh_warnings_snapshot(max_age=max_age)
+
+
+async def run_warnings_poller() -> None:
+    """
+    Poll the warnings feeds every WARNINGS_POLL_INTERVAL_SECONDS until cancelled.
+    """
+    while True:
+        try:
+            snapshot = await refresh_warnings_snapshot()
+            print(
+                f"[WARNINGS POLLER] Snapshot {snapshot.version}: {len(snapshot.warnings)} warnings")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[WARNINGS POLLER] Poll failed: {str(e)}")
+        await asyncio.sleep(settings.WARNINGS_POLL_INTERVAL_SECONDS)
+
+
+def start_warnings_poller() -> Optional[asyncio.Task]:
+    """
+    Start the background poller task if enabled in settings.
+
+    Returns:
+        Optional[asyncio.Task]: The poller task, or None if disabled
+    """
+    if not settings.WARNINGS_POLLER_ENABLED:
+        return None
+    return asyncio.ensure_future(run_warnings_poller())
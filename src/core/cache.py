@@ -0,0 +1,96 @@
+"""
+In-Memory Cache Module
+
+This module provides the small bounded cache used by the upstream
+integrations to keep recently fetched or parsed results in memory. Entries
+are evicted least-recently-used first once the cache is full and may carry
+an individual expiry time. Hits, misses and evictions are counted per cache
+name for /metrics.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from src.core.metrics import CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with optional per-entry time-to-live.
+
+    Not thread-safe; intended to be used from the event loop.
+
+    Attributes:
+        name (str): Cache name, used in log lines
+        max_entries (int): Maximum number of entries kept
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._hits = CACHE_HITS.labels(name)
+        self._misses = CACHE_MISSES.labels(name)
+        self._evictions = CACHE_EVICTIONS.labels(name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value for key, or default if missing or expired.
+
+        Args:
+            key (Hashable): Cache key
+            default (Any): Value returned on a miss
+
+        Returns:
+            Any: Cached value or default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses.inc()
+            return default
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            self._misses.inc()
+            return default
+        self._entries.move_to_end(key)
+        self._hits.inc()
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to store
+            ttl (Optional[float]): Seconds until the entry expires (None: never)
+        """
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions.inc()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove an entry and return its value.
+
+        Args:
+            key (Hashable): Cache key
+            default (Any): Value returned if the key is missing
+
+        Returns:
+            Any: Removed value or default
+        """
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
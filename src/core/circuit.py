@@ -0,0 +1,159 @@
+"""
+Circuit Breaker Module
+
+This module provides per-upstream circuit breakers. After
+CIRCUIT_FAILURE_THRESHOLD consecutive failures a breaker opens and calls to
+that upstream fail immediately with CircuitOpenError instead of waiting on a
+host that is down or refusing us. After CIRCUIT_RESET_SECONDS a single probe
+request is let through; its outcome closes the breaker or opens it again.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from src.core.config import settings
+from src.core.metrics import gauge, register_collector
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Response statuses that indicate an unhealthy upstream. bom.gov.au answers
+# 403 when it is rate limiting, so it counts alongside 429 and 5xx.
+FAILURE_STATUSES = {403, 429}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+def is_failure_status(status_code: int) -> bool:
+    """
+    Check whether an HTTP status counts as an upstream failure.
+
+    Args:
+        status_code (int): Response status code
+
+    Returns:
+        bool: True for 5xx and FAILURE_STATUSES
+    """
+    return status_code >= 500 or status_code in FAILURE_STATUSES
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream.
+
+    Attributes:
+        name (str): Upstream name, used in errors and log lines
+        failure_threshold (int): Consecutive failures that open the breaker
+        reset_timeout (float): Seconds the breaker stays open before a probe
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """
+        Decide whether a call may go to the upstream now.
+
+        Returns:
+            bool: True if closed, or if this call is the half-open probe
+        """
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a healthy response."""
+        if self.state != CLOSED:
+            print(f"[CIRCUIT] {self.name} recovered, closing breaker")
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold or on a failed probe."""
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                print(f"[CIRCUIT] {self.name} failing ({self.failures} in a row), opening breaker")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Forget an abandoned call (e.g. cancelled) without judging the upstream."""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current breaker state.
+
+        Returns:
+            Dict[str, Any]: state, consecutive failures and, when open, the
+                seconds until the next probe
+        """
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        return {"state": self.state, "failures": self.failures, "retry_in_seconds": retry_in}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """
+    Return the breaker for an upstream, creating it on first use.
+
+    Args:
+        name (str): Upstream identifier
+
+    Returns:
+        CircuitBreaker: Breaker configured from the CIRCUIT_* settings
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            name, settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS)
+        _breakers[name] = breaker
+    return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every breaker, keyed by upstream."""
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
+
+
+def reset_breakers() -> None:
+    """Drop all breaker state."""
+    _breakers.clear()
+
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+_breaker_state_gauge = gauge(
+    "circuit_breaker_state", "Circuit breaker state (0 closed, 1 half open, 2 open).",
+    ("upstream",))
+
+
+def _collect_breaker_states() -> None:
+    for name, breaker in _breakers.items():
+        _breaker_state_gauge.set(_STATE_VALUES[breaker.state], name)
+
+
+register_collector(_collect_breaker_states)
@@ -0,0 +1,152 @@
+"""
+Response Compression Module
+
+This module provides ASGI middleware that compresses response bodies with
+brotli or gzip, whichever the client prefers in Accept-Encoding. Bodies
+below COMPRESSION_MIN_BYTES are sent as is, since compressing a few hundred
+bytes costs more CPU than it saves on the wire. The brotli package is in
+requirements.txt; if it is missing from an environment, only gzip is offered.
+"""
+
+import gzip
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.core.config import settings
+from src.core.tracing import span
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/xml", "application/javascript")
+
+
+def available_encodings() -> Dict[str, float]:
+    """Supported encodings and the server's preference between them."""
+    encodings = {"gzip": 0.5}
+    if brotli is not None:
+        encodings["br"] = 1.0
+    return encodings
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Negotiate a content encoding.
+
+    Args:
+        accept_encoding (Optional[str]): Accept-Encoding request header
+
+    Returns:
+        Optional[str]: "br", "gzip" or None for identity
+    """
+    if not accept_encoding:
+        return None
+    supported = available_encodings()
+    best, best_key = None, (0.0, 0.0)
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        candidates = supported if name == "*" else ([name] if name in supported else [])
+        for encoding in candidates:
+            key = (q, supported[encoding])
+            if q > 0 and key > best_key:
+                best, best_key = encoding, key
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a body with the negotiated encoding.
+
+    Args:
+        body (bytes): Uncompressed body
+        encoding (str): "br" or "gzip"
+
+    Returns:
+        bytes: Compressed body
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete, compressible response bodies.
+
+    Compressed responses get an encoding-specific ETag ("<etag>-br"), so the
+    suffix is removed from If-None-Match before the request reaches the
+    application.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding"))
+        if_none_match = request_headers.get("if-none-match")
+        revalidated_suffix = None
+        if if_none_match:
+            for suffix in ("br", "gzip"):
+                if f'-{suffix}"' in if_none_match:
+                    revalidated_suffix = suffix
+            stripped = if_none_match.replace('-br"', '"').replace('-gzip"', '"')
+            if stripped != if_none_match:
+                MutableHeaders(scope=scope)["if-none-match"] = stripped
+        minimum_size = (self.minimum_size if self.minimum_size is not None
+                        else settings.COMPRESSION_MIN_BYTES)
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            if start["status"] == 304:
+                # Echo the ETag of the representation the client holds
+                etag = headers.get("etag")
+                if revalidated_suffix and etag and etag.endswith('"'):
+                    headers["ETag"] = f'{etag[:-1]}-{revalidated_suffix}"'
+            elif start["status"] != 204:
+                headers.add_vary_header("Accept-Encoding")
+            content_type = headers.get("content-type", "")
+            body = message.get("body", b"")
+            if (encoding is None or message.get("more_body", False)
+                    or "content-encoding" in headers
+                    or len(body) < minimum_size
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)):
+                await send(start)
+                await send(message)
+                return
+
+            with span("compress", encoding=encoding):
+                body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            etag = headers.get("etag")
+            if etag and etag.endswith('"'):
+                headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -24,8 +24,94 @@ class Settings(BaseSettings):
         API_TOKEN (Optional[str]): Authentication token for API access
         DT_API_TOKEN (Optional[str]): Digital twin platform authentication token
         DT_BASE_URL (Optional[str]): Base URL for digital twin platform
+        RISK_GRID_DEGREES (float): Grid spacing risk query coordinates are snapped to
+        RISK_CACHE_PATH (Optional[str]): SQLite file for cached design-event risk
+            (default: data/cache/risk.sqlite3)
+        RISK_CACHE_MAX_ENTRIES (int): Risk results kept on disk
+        RISK_CACHE_MAX_BYTES (int): Total payload bytes kept on disk
+        RISK_CACHE_TTL_SECONDS (int): Seconds a cached result is trusted if the
+            model version does not change first (0: no expiry)
+        RISK_SAMPLE_SPACING_KM (float): Default sample spacing for bbox/polyline risk
+        RISK_MAX_SAMPLES (int): Largest number of samples one area query may need
+        RISK_AREA_CONCURRENCY (int): Risk lookups in flight per area query
+        RISK_SCORE_FIELD (str): Dotted path of the numeric risk score in a
+            Digital Twin risk response, used to aggregate area queries
+        RISK_HOTSPOT_COUNT (int): Highest-risk samples returned as hot spots
+        DT_RATE_LIMIT_PER_SECOND (float): Digital Twin risk calls allowed per second
+            (0: unlimited)
+        REPORT_QUEUE_ENABLED (bool): Queue reports locally and deliver them in the
+            background instead of forwarding them synchronously
+        REPORT_QUEUE_PATH (Optional[str]): SQLite file for queued reports
+            (default: data/cache/reports.sqlite3)
+        REPORT_FLUSH_INTERVAL_SECONDS (float): Delay between flushes of an idle queue
+        REPORT_FLUSH_BATCH_SIZE (int): Reports submitted concurrently per flush
+        REPORT_RETRY_BASE_SECONDS (float): First retry delay, doubled per attempt
+        REPORT_RETRY_MAX_SECONDS (float): Longest delay between retries
+        REPORT_MAX_ATTEMPTS (int): Delivery attempts before a report is marked failed
+        REPORT_RETENTION_SECONDS (int): Seconds delivered reports are kept for
+            idempotency and status lookups
         GOOGLE_API_KEY (Optional[str]): Google API key for weather services
         GOOGLE_BASE_URL (Optional[str]): Base URL for Google services
+        GOOGLE_GRID_DEGREES (float): Grid spacing coordinates are snapped to before
+            calling Google (0.01 is roughly 1 km)
+        GOOGLE_CACHE_SIZE (int): Google Weather responses kept in memory
+        GOOGLE_CONDITIONS_TTL_SECONDS (int): Seconds current conditions are cached per cell
+        GOOGLE_HOURLY_FORECAST_TTL_SECONDS (int): Seconds hourly forecasts are cached per cell
+        GOOGLE_DAILY_FORECAST_TTL_SECONDS (int): Seconds daily forecasts are cached per cell
+        GOOGLE_BATCH_MAX_POINTS (int): Largest number of points accepted by /google/batch
+        GOOGLE_BATCH_CONCURRENCY (int): Google lookups run in parallel per batch request
+        CIRCUIT_FAILURE_THRESHOLD (int): Consecutive failures that open an upstream's
+            circuit breaker
+        CIRCUIT_RESET_SECONDS (float): Seconds a breaker stays open before a probe
+        WEATHER_CONDITION_SOURCES (str): Comma-separated fallback chain for
+            /weathercondition, from "bom", "google" and "cache"
+        WEATHER_CONDITION_MAX_AGE_SECONDS (int): Oldest last-known condition the
+            "cache" source may serve
+        LOCATION_SUMMARY_TIMEOUT_SECONDS (float): Deadline for each section of
+            /location/summary
+        LOCATION_SUMMARY_FORECAST_PERIODS (int): Forecast periods in /location/summary
+        COMPRESSION_MIN_BYTES (int): Smallest response body that is compressed
+        COMPRESSION_GZIP_LEVEL (int): gzip compression level (1-9)
+        COMPRESSION_BROTLI_QUALITY (int): brotli quality (0-11)
+        TRACING_ENABLED (bool): Time request steps when Server-Timing or
+            trace export is on
+        SERVER_TIMING_ENABLED (bool): Send the request timings to clients in a
+            Server-Timing header
+        TRACE_EXPORT_PATH (Optional[str]): JSON lines file traces are appended
+            to (default: no export)
+        TRACE_EXPORT_SAMPLE_RATE (float): Fraction of requests exported (0-1)
+        TRACE_EXPORT_FLUSH_SECONDS (float): Delay between writes of buffered
+            traces to TRACE_EXPORT_PATH
+        HTTP_CONNECT_TIMEOUT (float): Seconds allowed to open an upstream connection
+        HTTP_READ_TIMEOUT (float): Seconds allowed for an upstream read/write
+        HTTP_MAX_CONNECTIONS (int): Connection pool size per upstream
+        HTTP_MAX_KEEPALIVE_CONNECTIONS (int): Idle keep-alive connections kept per upstream
+        HTTP_KEEPALIVE_EXPIRY (float): Seconds an idle keep-alive connection is kept
+        BOM_FORECAST_TTL_SECONDS (int): Seconds the cached forecast product is served
+            before it is revalidated with BOM
+        BOM_OBSERVATION_CADENCE_MINUTES (int): Minutes between BOM station observations
+        BOM_OBSERVATION_GRACE_SECONDS (int): Allowance for BOM to publish a due observation
+        BOM_OBSERVATION_MIN_TTL_SECONDS (int): Shortest time observations are cached
+        BOM_OBSERVATION_TIMEZONE (str): Time zone of local_date_time_full in station feeds
+        BOM_OBSERVATION_CACHE_SIZE (int): Station feeds kept in memory
+        HISTORY_CACHE_DIR (Optional[str]): Directory for the on-disk history store
+            (default: data/cache/history)
+        HISTORY_CURRENT_MONTH_TTL_SECONDS (int): Seconds a cached copy of a month
+            that is still being published is reused
+        HISTORY_MAX_CONCURRENCY (int): Monthly history downloads run in parallel per request
+        HISTORY_REQUEST_DEADLINE_SECONDS (float): Time budget for loading all months
+            of one historical request
+        HISTORY_MAX_PAGE_DAYS (int): Largest date window returned per page of
+            /weather/historical; longer ranges continue via next_cursor
+        WARNINGS_MAX_PAGE_SIZE (int): Largest page of the warnings endpoints
+        WARNING_DETAILS_CONCURRENCY (int): Warning detail pages fetched in parallel
+        WARNING_DETAILS_CACHE_SIZE (int): Parsed warning pages kept in memory
+        WARNINGS_POLLER_ENABLED (bool): Run the background warnings poller
+        WARNINGS_POLL_INTERVAL_SECONDS (float): Delay between warnings feed polls
+        WARNING_AREAS_FILE (Optional[str]): GeoJSON of warning districts/catchments
+            (default: data/warning_areas.geojson)
+        WARNINGS_INCLUDE_UNLOCATED (bool): Return warnings that name no known area
+            from location-filtered queries
         env_path (ClassVar[str]): Path to the .env file
     """
 
@@ -33,8 +119,71 @@ class Settings(BaseSettings):
     API_TOKEN: Optional[str] = None
     DT_API_TOKEN: Optional[str] = None
     DT_BASE_URL: Optional[str] = None
+    RISK_GRID_DEGREES: float = 0.0001
+    RISK_CACHE_PATH: Optional[str] = None
+    RISK_CACHE_MAX_ENTRIES: int = 50000
+    RISK_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RISK_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    RISK_SAMPLE_SPACING_KM: float = 0.25
+    RISK_MAX_SAMPLES: int = 400
+    RISK_AREA_CONCURRENCY: int = 8
+    RISK_SCORE_FIELD: str = "risk_score"
+    RISK_HOTSPOT_COUNT: int = 5
+    DT_RATE_LIMIT_PER_SECOND: float = 10.0
+    REPORT_QUEUE_ENABLED: bool = True
+    REPORT_QUEUE_PATH: Optional[str] = None
+    REPORT_FLUSH_INTERVAL_SECONDS: float = 5.0
+    REPORT_FLUSH_BATCH_SIZE: int = 20
+    REPORT_RETRY_BASE_SECONDS: float = 5.0
+    REPORT_RETRY_MAX_SECONDS: float = 900.0
+    REPORT_MAX_ATTEMPTS: int = 50
+    REPORT_RETENTION_SECONDS: int = 7 * 24 * 3600
     GOOGLE_API_KEY: Optional[str] = None
     GOOGLE_BASE_URL: Optional[str] = None
+    GOOGLE_GRID_DEGREES: float = 0.01
+    GOOGLE_CACHE_SIZE: int = 2048
+    GOOGLE_CONDITIONS_TTL_SECONDS: int = 300
+    GOOGLE_HOURLY_FORECAST_TTL_SECONDS: int = 900
+    GOOGLE_DAILY_FORECAST_TTL_SECONDS: int = 3600
+    GOOGLE_BATCH_MAX_POINTS: int = 100
+    GOOGLE_BATCH_CONCURRENCY: int = 8
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: float = 30.0
+    WEATHER_CONDITION_SOURCES: str = "bom,google,cache"
+    WEATHER_CONDITION_MAX_AGE_SECONDS: int = 6 * 3600
+    LOCATION_SUMMARY_TIMEOUT_SECONDS: float = 4.0
+    LOCATION_SUMMARY_FORECAST_PERIODS: int = 3
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    TRACING_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = False
+    TRACE_EXPORT_PATH: Optional[str] = None
+    TRACE_EXPORT_SAMPLE_RATE: float = 0.1
+    TRACE_EXPORT_FLUSH_SECONDS: float = 5.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 15.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    BOM_FORECAST_TTL_SECONDS: int = 300
+    BOM_OBSERVATION_CADENCE_MINUTES: int = 30
+    BOM_OBSERVATION_GRACE_SECONDS: int = 90
+    BOM_OBSERVATION_MIN_TTL_SECONDS: int = 60
+    BOM_OBSERVATION_TIMEZONE: str = "Australia/Perth"
+    BOM_OBSERVATION_CACHE_SIZE: int = 512
+    HISTORY_CACHE_DIR: Optional[str] = None
+    HISTORY_CURRENT_MONTH_TTL_SECONDS: int = 3600
+    HISTORY_MAX_CONCURRENCY: int = 4
+    HISTORY_REQUEST_DEADLINE_SECONDS: float = 20.0
+    HISTORY_MAX_PAGE_DAYS: int = 366
+    WARNINGS_MAX_PAGE_SIZE: int = 100
+    WARNING_DETAILS_CONCURRENCY: int = 8
+    WARNING_DETAILS_CACHE_SIZE: int = 256
+    WARNINGS_POLLER_ENABLED: bool = True
+    WARNINGS_POLL_INTERVAL_SECONDS: float = 120.0
+    WARNING_AREAS_FILE: Optional[str] = None
+    WARNINGS_INCLUDE_UNLOCATED: bool = True
     env_path: ClassVar[str] = os.path.join(os.path.dirname(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".env")
     print(f"Loading environment variables from: {env_path}")
@@ -8,16 +8,26 @@ dynamic parameters from an internal API endpoint.
 
 from __future__ import annotations
 from typing import Any, Dict, Optional
+import asyncio
 import json
 import logging
-import requests
 
+from src.core import upstream
 from src.core.config import settings
+from src.core.helpers import snap_to_grid
+from src.core.ratelimit import RateLimiter
+from src.core.risk_cache import (MODEL_VERSION_FIELD, get_risk_cache,
+                                  is_cacheable_event, risk_cache_key)
+from src.core.singleflight import coalesce, make_key
+from src.core.tracing import span
 
 dt_base_url = settings.DT_BASE_URL
 
+# Shared by every risk lookup so area queries cannot flood the service
+_risk_rate_limiter = RateLimiter(settings.DT_RATE_LIMIT_PER_SECOND)
 
-def fetch_digital_twin_risk(
+
+async def fetch_digital_twin_risk(
         lat: float | None = None,
         lon: float | None = None,
         rainfall_event_id: Optional[str] = None,
@@ -33,9 +43,32 @@ def fetch_digital_twin_risk(
     Returns
     -------
     dict: Parsed JSON from the Digital Twin service or an error structure.
+          Concurrent calls with the same payload share one request.
+
+    Notes
+    -----
+    Design events are answered from the persistent risk cache. Their
+    coordinates are snapped to RISK_GRID_DEGREES so the cached answer is
+    exactly the one the service returned for the key. A response carrying a
+    new model_version clears the cache. Calls that reach the service are
+    limited to DT_RATE_LIMIT_PER_SECOND.
     """
 
     url = f"{dt_base_url}risk/point"
+    cache_key = None
+    if lat is not None and lon is not None and is_cacheable_event(rainfall_event_id):
+        lat, lon = snap_to_grid(lat, lon, settings.RISK_GRID_DEGREES)
+        cache_key = risk_cache_key(lat, lon, rainfall_event_id)
+        try:
+            with span("risk_cache.get"):
+                cached = await asyncio.get_running_loop().run_in_executor(
+                    None, get_risk_cache().get, cache_key)
+        except Exception as e:
+            print(f"[RISK CACHE] Lookup failed: {str(e)}")
+            cached = None
+        if cached is not None:
+            return cached
+
     if rainfall_event_id is None:
         payload = {
             "lat": lat,
@@ -53,18 +86,39 @@ def fetch_digital_twin_risk(
         'Authorization': f'Bearer {settings.DT_API_TOKEN}'
     }
 
-    try:
-        response = requests.post(url, headers=headers,
-                                 data=json.dumps(payload))
+    async def call():
+        with span("digitaltwin.rate_limit_wait"):
+            await _risk_rate_limiter.acquire()
+        response = await upstream.request(
+            upstream.DIGITAL_TWIN, "POST", url, operation="risk", headers=headers,
+            content=json.dumps(payload))
         response.raise_for_status()
-        data = response.json()
-        return data
+        with span("digitaltwin.parse_json"):
+            return response.json()
+
+    try:
+        # Identical concurrent risk queries share one Digital Twin call
+        data = await coalesce(make_key("POST", url, body=payload), call)
     except Exception as e:
         return e
 
+    if isinstance(data, dict):
+        def store():
+            cache = get_risk_cache()
+            cache.observe_model_version(data.get(MODEL_VERSION_FIELD))
+            if cache_key is not None:
+                cache.set(cache_key, data)
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, store)
+        except Exception as e:
+            print(f"[RISK CACHE] Store failed: {str(e)}")
+    return data
+
 
-def post_user_report(
-        IssueReport: Any
+async def post_user_report(
+        IssueReport: Any,
+        idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """POST to Digital Twin report endpoint and return JSON response.
 
@@ -74,30 +128,37 @@ def post_user_report(
 
     Parameters
     ----------
-    IssueReport: Report data structure containing issue details. Must have
-                a dict() method to serialize to dictionary format.
+    IssueReport: Report data structure containing issue details, either a
+                model with a dict() method or an already serialized dict.
+    idempotency_key: Optional key sent as the Idempotency-Key header so the
+                service can recognise redelivered reports.
 
     Returns
     -------
     dict: Parsed JSON response from the Digital Twin service containing
-          the processing result and any assigned identifiers.
+          the processing result and any assigned identifiers. Reports are
+          never coalesced, as every submission must reach the service.
     Exception: If the HTTP request fails or authentication is invalid.
     """
 
     url = f"{dt_base_url}report"
 
-    payload = IssueReport.dict()
+    payload = IssueReport if isinstance(IssueReport, dict) else IssueReport.dict()
 
     headers = {
         "Content-Type": "application/json",
         'Authorization': f'Bearer {settings.DT_API_TOKEN}'
     }
+    if idempotency_key:
+        headers["Idempotency-Key"] = idempotency_key
 
     try:
-        response = requests.post(url, headers=headers,
-                                 data=json.dumps(payload))
+        response = await upstream.request(
+            upstream.DIGITAL_TWIN, "POST", url, operation="report", headers=headers,
+            content=json.dumps(payload))
         response.raise_for_status()
-        data = response.json()
+        with span("digitaltwin.parse_json"):
+            data = response.json()
         return data
     except Exception as e:
         return e
@@ -107,5 +168,5 @@ __all__ = ["fetch_digital_twin_risk", "post_user_report"]
 
 if __name__ == "__main__":  # Simple manual test harness
     logging.basicConfig(level=logging.INFO)
-    result = fetch_digital_twin_risk()
+    result = asyncio.run(fetch_digital_twin_risk())
     print(json.dumps(result, indent=2, default=str))
@@ -5,17 +5,96 @@ Google Weather API Integration Module
 This module provides functions to fetch weather data from Google's Weather API.
 It includes support for hourly forecasts, daily forecasts, current conditions,
 and historical weather data based on geographic coordinates.
+
+Google bills per call, so coordinates are snapped to a grid of
+GOOGLE_GRID_DEGREES before the request is made and responses are cached per
+grid cell with a TTL that suits each endpoint.
 """
 
-import requests
+import time
+
+from src.core import upstream
+from src.core.cache import TTLCache
 from src.core.config import settings
+from src.core.helpers import snap_to_grid
+from src.core.singleflight import coalesce, make_key
+from src.core.tracing import span
 
 # Load Google API configuration from settings
 api_key = settings.GOOGLE_API_KEY
 base_url = settings.GOOGLE_BASE_URL
 
+# Responses keyed by (endpoint, snapped lat, snapped lon)
+_weather_cache = TTLCache("google_weather", settings.GOOGLE_CACHE_SIZE)
+
+
+async def _get_json(url, operation="other"):
+    """
+    GET a Google Weather API URL and return the decoded JSON body.
+
+    Identical concurrent calls are coalesced into one upstream request.
+
+    Args:
+        url (str): Fully built request URL
+        operation (str): Lookup name used to label upstream metrics
+
+    Returns:
+        dict: Decoded JSON response, shared by coalesced callers
+
+    Raises:
+        httpx.HTTPStatusError: If Google returns an error status
+    """
+    async def call():
+        response = await upstream.request(upstream.GOOGLE, "GET", url, operation=operation)
+        response.raise_for_status()
+        with span("google.parse_json"):
+            return response.json()
+
+    return await coalesce(make_key("GET", url), call)
+
+
+def seconds_until_next_hour(now=None):
+    """
+    Seconds left until the next UTC hour boundary.
+
+    Past history hours never change; the hourly history window only moves
+    when a new hour completes, so it can be cached until then.
+
+    Args:
+        now (float): Unix timestamp (default: current time)
+
+    Returns:
+        float: Seconds until the next full hour, at least 1
+    """
+    now = time.time() if now is None else now
+    return max(3600 - now % 3600, 1.0)
+
 
-def fetch_google_hourly_forecast(coordinates):
+async def _lookup(endpoint, coordinates, ttl):
+    """
+    Fetch a Google Weather lookup for the grid cell containing coordinates.
+
+    Args:
+        endpoint (str): Lookup path, e.g. "currentConditions:lookup"
+        coordinates (tuple): Tuple containing (latitude, longitude) as floats
+        ttl (float): Seconds a successful response is cached for the cell
+
+    Returns:
+        dict: JSON response for the snapped cell coordinates
+    """
+    lat, lon = snap_to_grid(*coordinates, settings.GOOGLE_GRID_DEGREES)
+    key = (endpoint, lat, lon)
+    data = _weather_cache.get(key)
+    if data is not None:
+        return data
+    url = f"{base_url}{endpoint}?key={api_key}&location.latitude={lat}&location.longitude={lon}"
+    # e.g. "forecast/hours:lookup" is reported as "forecast/hours"
+    data = await _get_json(url, operation=endpoint.split(":")[0])
+    _weather_cache.set(key, data, ttl=ttl)
+    return data
+
+
+async def fetch_google_hourly_forecast(coordinates):
     """
     Fetch hourly weather forecast from Google Weather API.
 
@@ -31,22 +110,19 @@ def fetch_google_hourly_forecast(coordinates):
 
     Note:
         Returns error dict with code 1 if GOOGLE_API_KEY is not configured
+        Responses are cached per grid cell for GOOGLE_HOURLY_FORECAST_TTL_SECONDS
     """
     try:
-        lat, lon = coordinates
         if not api_key:
             return {"code": 1, "message": "GOOGLE_API_KEY not set in environment", "data": None}
-        url = f"{base_url}forecast/hours:lookup?key={api_key}&location.latitude={lat}&location.longitude={lon}"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = await _lookup("forecast/hours:lookup", coordinates, settings.GOOGLE_HOURLY_FORECAST_TTL_SECONDS)
 
         return data
     except Exception as e:
         return e
 
 
-def fetch_google_daily_forecast(coordinates):
+async def fetch_google_daily_forecast(coordinates):
     """
     Fetch daily weather forecast from Google Weather API.
 
@@ -62,22 +138,19 @@ def fetch_google_daily_forecast(coordinates):
 
     Note:
         Returns error dict with code 1 if GOOGLE_API_KEY is not configured
+        Responses are cached per grid cell for GOOGLE_DAILY_FORECAST_TTL_SECONDS
     """
     try:
-        lat, lon = coordinates
         if not api_key:
             return {"code": 1, "message": "GOOGLE_API_KEY not set in environment", "data": None}
-        url = f"{base_url}forecast/days:lookup?key={api_key}&location.latitude={lat}&location.longitude={lon}"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = await _lookup("forecast/days:lookup", coordinates, settings.GOOGLE_DAILY_FORECAST_TTL_SECONDS)
 
         return data
     except Exception as e:
         return e
 
 
-def fetch_google_conditions(coordinates):
+async def fetch_google_conditions(coordinates):
     """
     Fetch current weather conditions from Google Weather API.
 
@@ -93,22 +166,19 @@ def fetch_google_conditions(coordinates):
 
     Note:
         Returns error dict with code 1 if GOOGLE_API_KEY is not configured
+        Responses are cached per grid cell for GOOGLE_CONDITIONS_TTL_SECONDS
     """
     try:
-        lat, lon = coordinates
         if not api_key:
             return {"code": 1, "message": "GOOGLE_API_KEY not set in environment", "data": None}
-        url = f"{base_url}currentConditions:lookup?key={api_key}&location.latitude={lat}&location.longitude={lon}"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = await _lookup("currentConditions:lookup", coordinates, settings.GOOGLE_CONDITIONS_TTL_SECONDS)
 
         return data
     except Exception as e:
         return e
 
 
-def fetch_google_history(coordinates):
+async def fetch_google_history(coordinates):
     """
     Fetch historical weather data from Google Weather API.
 
@@ -124,15 +194,12 @@ def fetch_google_history(coordinates):
 
     Note:
         Returns error dict with code 1 if GOOGLE_API_KEY is not configured
+        Responses are cached per grid cell until the next hour boundary
     """
     try:
-        lat, lon = coordinates
         if not api_key:
             return {"code": 1, "message": "GOOGLE_API_KEY not set in environment", "data": None}
-        url = f"{base_url}history/hours:lookup?key={api_key}&location.latitude={lat}&location.longitude={lon}"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = await _lookup("history/hours:lookup", coordinates, seconds_until_next_hour())
 
         return data
     except Exception as e:
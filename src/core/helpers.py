@@ -6,10 +6,18 @@ including distance calculations, weather station management, and
 geographic data processing functions.
 """
 
+import heapq
 import math
 import os
 import json
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.tracing import span
+
+EARTH_RADIUS_KM = 6371
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -28,7 +36,7 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         float: Distance between the two points in kilometers
     """
-    R = 6371  # Earth's radius in kilometers
+    R = EARTH_RADIUS_KM
 
     lat1_rad = math.radians(lat1)
     lon1_rad = math.radians(lon1)
@@ -44,6 +52,28 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return R * c
 
 
+def snap_to_grid(lat: float, lon: float, step: float) -> Tuple[float, float]:
+    """
+    Snap a coordinate to the nearest node of a regular lat/lon grid.
+
+    Nearby requests then share the same coordinates, which lets upstream
+    responses be cached per cell instead of per exact float.
+
+    Args:
+        lat (float): Latitude in decimal degrees
+        lon (float): Longitude in decimal degrees
+        step (float): Grid spacing in degrees (e.g. 0.01 for roughly 1 km)
+
+    Returns:
+        Tuple[float, float]: Snapped (latitude, longitude); the input is
+            returned unchanged if step is not positive
+    """
+    if step <= 0:
+        return lat, lon
+    # Rounding to 6 places removes float noise such as -31.950000000000003
+    return round(round(lat / step) * step, 6), round(round(lon / step) * step, 6)
+
+
 def load_stations() -> Dict[str, Any]:
     """
     Load weather station data from the stations JSON configuration file.
@@ -66,13 +96,176 @@ def load_stations() -> Dict[str, Any]:
         return {"PerthStations": []}
 
 
+class StationIndex:
+    """
+    Registry of weather stations for nearest-neighbour queries.
+
+    Stations are placed in a k-d tree over their unit-sphere (x, y, z)
+    positions. The straight-line distance between two such points grows
+    with their great-circle distance, so the nearest points in the tree are
+    the nearest stations, with no special cases at the poles or the
+    antimeridian. A query visits a handful of leaves instead of every
+    station, so its cost grows with the log of the registry size. Haversine
+    distances are computed for the stations returned only.
+
+    Attributes:
+        stations (List[Dict[str, Any]]): Station dictionaries in index order
+    """
+
+    # Stations per tree leaf
+    LEAF_SIZE = 8
+
+    def __init__(self, stations: List[Dict[str, Any]]):
+        self.stations = list(stations)
+        self._lat = np.radians(np.array([s['lat'] for s in self.stations], dtype=float))
+        self._lon = np.radians(np.array([s['lon'] for s in self.stations], dtype=float))
+        self._cos_lat = np.cos(self._lat)
+        self._xyz = np.column_stack((self._cos_lat * np.cos(self._lon),
+                                     self._cos_lat * np.sin(self._lon),
+                                     np.sin(self._lat)))
+        # Tree nodes as parallel lists; a node is a leaf when _leaves[node] is
+        # not None, holding (x, y, z, station index) tuples
+        self._axis: List[int] = []
+        self._split: List[float] = []
+        self._children: List[Tuple[int, int]] = []
+        self._leaves: List[Optional[List[Tuple[float, float, float, int]]]] = []
+        if self.stations:
+            self._build(np.arange(len(self.stations)))
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def _build(self, indices: np.ndarray) -> int:
+        node = len(self._leaves)
+        self._axis.append(0)
+        self._split.append(0.0)
+        self._children.append((-1, -1))
+        self._leaves.append(None)
+        points = self._xyz[indices]
+        spread = points.max(axis=0) - points.min(axis=0)
+        axis = int(np.argmax(spread))
+        if len(indices) <= self.LEAF_SIZE or spread[axis] == 0:
+            self._leaves[node] = [(x, y, z, i) for (x, y, z), i
+                                  in zip(points.tolist(), indices.tolist())]
+            return node
+        half = len(indices) // 2
+        order = np.argpartition(points[:, axis], half)
+        self._axis[node] = axis
+        self._split[node] = float(points[order[half], axis])
+        left = self._build(indices[order[:half]])
+        right = self._build(indices[order[half:]])
+        self._children[node] = (left, right)
+        return node
+
+    def _search(self, lat: float, lon: float, k: int) -> List[int]:
+        """Indices of the k stations nearest to a point, nearest first."""
+        lat_rad = math.radians(lat)
+        lon_rad = math.radians(lon)
+        cos_lat = math.cos(lat_rad)
+        query = (cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad))
+        qx, qy, qz = query
+        # Max-heap of the best k so far as (-squared chord, -station index)
+        best: List[Tuple[float, int]] = []
+        # (node, lower bound of the squared chord to any station below it)
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+            leaf = self._leaves[node]
+            if leaf is not None:
+                for x, y, z, i in leaf:
+                    d2 = (x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-d2, -i))
+                    elif d2 < -best[0][0]:
+                        heapq.heapreplace(best, (-d2, -i))
+                continue
+            diff = query[self._axis[node]] - self._split[node]
+            left, right = self._children[node]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Near side last, so it is searched first
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+        return [-i for _, i in sorted(best, key=lambda item: (-item[0], -item[1]))]
+
+    def distances(self, lat: float, lon: float) -> np.ndarray:
+        """
+        Haversine distance in kilometers from a point to every station.
+
+        Args:
+            lat (float): Latitude in decimal degrees
+            lon (float): Longitude in decimal degrees
+
+        Returns:
+            np.ndarray: Distances aligned with self.stations
+        """
+        lat_rad = math.radians(lat)
+        lon_rad = math.radians(lon)
+        a = (np.sin((self._lat - lat_rad) / 2) ** 2 +
+             math.cos(lat_rad) * self._cos_lat * np.sin((self._lon - lon_rad) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    def nearest(self, lat: float, lon: float) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Find the station closest to a point.
+
+        Args:
+            lat (float): Latitude in decimal degrees
+            lon (float): Longitude in decimal degrees
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], float]]: (station, distance_km), or
+                None if the registry is empty
+        """
+        if not self.stations:
+            return None
+        station = self.stations[self._search(lat, lon, 1)[0]]
+        return station, calculate_distance(lat, lon, station['lat'], station['lon'])
+
+    def k_nearest(self, lat: float, lon: float, k: int) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find the k stations closest to a point, nearest first.
+
+        Args:
+            lat (float): Latitude in decimal degrees
+            lon (float): Longitude in decimal degrees
+            k (int): Number of stations to return
+
+        Returns:
+            List[Tuple[Dict[str, Any], float]]: (station, distance_km) pairs
+        """
+        k = min(k, len(self.stations))
+        if k <= 0:
+            return []
+        return [(station, calculate_distance(lat, lon, station['lat'], station['lon']))
+                for station in (self.stations[i] for i in self._search(lat, lon, k))]
+
+
+@lru_cache(maxsize=1)
+def get_station_index() -> StationIndex:
+    """
+    Return the station index, loading data/station.json on first use.
+
+    Every list of stations in the file (e.g. "PerthStations") is indexed,
+    so larger station sets can be added as extra keys.
+
+    Returns:
+        StationIndex: Process-wide station index
+    """
+    stations = []
+    for group in load_stations().values():
+        if isinstance(group, list):
+            stations.extend(group)
+    return StationIndex(stations)
+
+
 def find_nearest_station(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     """
     Find the nearest weather station to the given coordinates.
 
-    Searches through all available weather stations to find the one
-    closest to the specified latitude and longitude coordinates using
-    the Haversine distance formula.
+    Looks the coordinates up in the in-memory station index, a k-d tree
+    that only measures the stations near the query.
 
     Args:
         lat (float): Target latitude in decimal degrees
@@ -83,19 +276,23 @@ def find_nearest_station(lat: float, lon: float) -> Optional[Dict[str, Any]]:
             information including name, station_id, coordinates, and API URLs.
             Returns None if no stations are available.
     """
-    stations_data = load_stations()
-    stations = stations_data.get("PerthStations", [])
+    with span("nearest_station"):
+        nearest = get_station_index().nearest(lat, lon)
+    return nearest[0] if nearest else None
 
-    if not stations:
-        return None
 
-    nearest_station = None
-    min_distance = float('inf')
+def find_nearest_stations(lat: float, lon: float, k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Find the k nearest weather stations to the given coordinates.
 
-    for station in stations:
-        distance = calculate_distance(lat, lon, station['lat'], station['lon'])
-        if distance < min_distance:
-            min_distance = distance
-            nearest_station = station
+    Args:
+        lat (float): Target latitude in decimal degrees
+        lon (float): Target longitude in decimal degrees
+        k (int): Maximum number of stations to return (default: 5)
 
-    return nearest_station
+    Returns:
+        List[Dict[str, Any]]: Station dictionaries ordered nearest first,
+            each copied with an added "distance_km" key
+    """
+    return [dict(station, distance_km=distance)
+            for station, distance in get_station_index().k_nearest(lat, lon, k)]
@@ -0,0 +1,129 @@
+"""
+Historical Weather Store Module
+
+This module keeps a persistent on-disk copy of parsed BOM daily weather
+observation CSVs (IDCJDW*.YYYYMM.csv). Each product/month is written once as
+an Arrow IPC (Feather) file and read back memory-mapped, so completed months
+are downloaded and parsed a single time. The current month, which BOM is
+still appending to, is only reused for HISTORY_CURRENT_MONTH_TTL_SECONDS.
+"""
+
+import os
+import time
+from datetime import date, timedelta
+from typing import Optional
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from src.core.config import settings
+from src.core.metrics import CACHE_HITS, CACHE_MISSES
+
+# Days after a month ends before it is treated as final. BOM publishes the
+# last day's observations the following morning.
+SETTLE_DAYS = 2
+
+
+def get_store_dir() -> str:
+    """
+    Return the directory holding cached history files.
+
+    Returns:
+        str: HISTORY_CACHE_DIR if configured, otherwise data/cache/history
+            in the project root
+    """
+    if settings.HISTORY_CACHE_DIR:
+        return settings.HISTORY_CACHE_DIR
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, "../../data/cache/history")
+
+
+def product_key(station: dict) -> str:
+    """
+    Identify the history product a station's monthly CSVs come from.
+
+    Several stations share one daily observations product, so files are
+    keyed by product (e.g. "IDCJDW6111") rather than by station id.
+
+    Args:
+        station (dict): Station dictionary with 'history_url_template'
+
+    Returns:
+        str: Product identifier taken from the template file name
+    """
+    name = os.path.basename(station['history_url_template'])
+    return name.split('.')[0] or station['station_id']
+
+
+def is_settled_month(month: str, today: Optional[date] = None) -> bool:
+    """
+    Check whether a YYYYMM month is complete and will no longer change.
+
+    Args:
+        month (str): Month in YYYYMM format
+        today (Optional[date]): Reference date (default: today)
+
+    Returns:
+        bool: True once SETTLE_DAYS have passed since the month ended
+    """
+    today = today or date.today()
+    year, mon = int(month[:4]), int(month[4:])
+    next_month = date(year + mon // 12, mon % 12 + 1, 1)
+    return today >= next_month + timedelta(days=SETTLE_DAYS)
+
+
+def _month_path(product: str, month: str) -> str:
+    return os.path.join(get_store_dir(), product, f"{month}.arrow")
+
+
+def load_month(product: str, month: str) -> Optional[pd.DataFrame]:
+    """
+    Read a cached month if it is present and still valid.
+
+    Settled months never expire. Unsettled months are ignored once the file
+    is older than HISTORY_CURRENT_MONTH_TTL_SECONDS so they get refetched.
+
+    Args:
+        product (str): History product identifier (see product_key)
+        month (str): Month in YYYYMM format
+
+    Returns:
+        Optional[pd.DataFrame]: Parsed month, or None if it must be fetched
+    """
+    path = _month_path(product, month)
+    try:
+        if not is_settled_month(month):
+            age = time.time() - os.path.getmtime(path)
+            if age > settings.HISTORY_CURRENT_MONTH_TTL_SECONDS:
+                CACHE_MISSES.inc("history")
+                return None
+        table = feather.read_table(path, memory_map=True)
+    except (FileNotFoundError, OSError):
+        CACHE_MISSES.inc("history")
+        return None
+    CACHE_HITS.inc("history")
+    return table.to_pandas()
+
+
+def save_month(product: str, month: str, df: pd.DataFrame) -> None:
+    """
+    Persist a parsed month. Failures are logged and otherwise ignored.
+
+    The file is written next to its final name and moved into place, so
+    concurrent readers never see a partial file.
+
+    Args:
+        product (str): History product identifier (see product_key)
+        month (str): Month in YYYYMM format
+        df (pd.DataFrame): Parsed month as returned by the CSV parser
+    """
+    path = _month_path(product, month)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        feather.write_feather(df.reset_index(drop=True), tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"[HISTORY STORE] Failed to cache {product} {month}: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,173 @@
+"""
+HTTP Response Caching Module
+
+This module adds HTTP caching semantics to API responses. Endpoints declare
+the version of the upstream data a response was built from (forecast issue
+time, observation timestamp, warnings snapshot version) with
+add_data_version(); the middleware turns that, together with the request
+itself, into a strong ETag, answers a matching If-None-Match with
+304 Not Modified and sets Cache-Control with stale-while-revalidate per
+endpoint class. Responses without a declared version (errors, fallbacks with
+volatile fields) are passed through untouched.
+"""
+
+import hashlib
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+# Cache-Control per endpoint class: (max-age, stale-while-revalidate seconds,
+# public). Only routes that need no token may be public: a shared cache would
+# otherwise serve an authorized response to callers without one.
+CACHE_POLICIES: Dict[str, Tuple[int, int, bool]] = {
+    # Forecast products are issued a few times a day
+    "/api/v1/forecast": (300, 900, False),
+    # Condition and observations follow the 30 minute observation cadence
+    "/api/v1/weathercondition": (60, 300, False),
+    "/api/v1/weather": (60, 300, False),
+    # Warnings are polled every couple of minutes
+    "/api/v1/warnings": (30, 120, False),
+    "/api/v1/warnings/all": (30, 120, False),
+}
+
+_data_versions: ContextVar[Optional[List[Any]]] = ContextVar("data_versions", default=None)
+
+
+def add_data_version(*parts: Any) -> None:
+    """
+    Declare the data version the current response is built from.
+
+    Call this only once the response body is fully determined by the request
+    and the declared versions, since equal versions produce equal ETags.
+
+    Args:
+        *parts (Any): Values identifying the data (e.g. "forecast", issue time)
+    """
+    versions = _data_versions.get()
+    if versions is not None:
+        versions.append(parts)
+
+
+def cache_control(max_age: int, stale_while_revalidate: int, public: bool = False) -> str:
+    """
+    Build a Cache-Control value.
+
+    Args:
+        max_age (int): Seconds a response is fresh
+        stale_while_revalidate (int): Seconds a stale response may be served
+            while it is revalidated in the background
+        public (bool): Allow shared caches (CDNs, proxies) to store the
+            response; otherwise only the client's own cache may
+
+    Returns:
+        str: Header value
+    """
+    scope = "public" if public else "private"
+    return f"{scope}, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+
+
+def compute_etag(method: str, path: str, query: bytes, body: bytes, versions: List[Any]) -> str:
+    """
+    Build a strong ETag for a request and the data versions behind its response.
+
+    Args:
+        method (str): HTTP method
+        path (str): Request path
+        query (bytes): Raw query string
+        body (bytes): Raw request body
+        versions (List[Any]): Declared data versions
+
+    Returns:
+        str: Quoted ETag
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (method.encode(), path.encode(), query, body, repr(versions).encode()):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Args:
+        if_none_match (Optional[str]): Header value (list of ETags or "*")
+        etag (str): Current ETag
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class HTTPCacheMiddleware:
+    """
+    ASGI middleware applying ETag and Cache-Control handling to the
+    endpoints listed in CACHE_POLICIES.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        policy = CACHE_POLICIES.get(scope.get("path")) if scope["type"] == "http" else None
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Keep the request body; POST endpoints answer per body
+        body_parts = []
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                body_parts.append(message.get("body", b""))
+            return message
+
+        versions: List[Any] = []
+        token = _data_versions.set(versions)
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            start, start_message = start_message, None
+            if (not versions or start["status"] != 200
+                    or message.get("more_body", False)):
+                await send(start)
+                await send(message)
+                return
+
+            etag = compute_etag(scope["method"], scope["path"], scope.get("query_string", b""),
+                                b"".join(body_parts), versions)
+            headers = MutableHeaders(scope=start)
+            headers["ETag"] = etag
+            headers["Cache-Control"] = cache_control(*policy)
+            if etag_matches(Headers(scope=scope).get("if-none-match"), etag):
+                not_modified = MutableHeaders(raw=[
+                    (k, v) for k, v in start["headers"]
+                    if k.lower() not in (b"content-length", b"content-type")])
+                await send({"type": "http.response.start", "status": 304,
+                            "headers": not_modified.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send(start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            _data_versions.reset(token)
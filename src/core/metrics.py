@@ -0,0 +1,337 @@
+"""
+Metrics Module
+
+This module provides a small in-process metrics registry with counters,
+gauges and histograms, rendered in the Prometheus text exposition format on
+/metrics. Updating a metric is a dict lookup and an addition, so it is cheap
+enough for the hot path; labelled children can be bound once with labels()
+and reused. Values that are only interesting at scrape time (circuit breaker
+state, report queue depth) are filled in by collectors registered with
+register_collector().
+
+Like the caches, metrics are meant to be updated from the event loop and are
+not locked.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Upper bounds in seconds for latency histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeValue(_CounterValue):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        # Counts are per bucket here and made cumulative when rendered
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """
+    A named metric family with optional labels.
+
+    Attributes:
+        name (str): Metric name, e.g. "upstream_requests_total"
+        documentation (str): HELP text
+        labelnames (Tuple[str, ...]): Label names, in the order values are given
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """
+        Return the child for a combination of label values, creating it on first use.
+
+        Args:
+            *values (str): One value per label name
+
+        Returns:
+            The child metric, with inc/dec/set/observe as for the family
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise Exception(
+                    f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def clear(self) -> None:
+        """Drop every child."""
+        self._children.clear()
+
+    def collect(self) -> List[str]:
+        """
+        Render the family in the text exposition format.
+
+        Returns:
+            List[str]: HELP, TYPE and one line per sample
+        """
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} "
+                         f"{_format_value(child.value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterValue()
+
+    def inc(self, *values: str, amount: float = 1.0) -> None:
+        """Increase the child for the given label values by amount."""
+        self.labels(*values).inc(amount)
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeValue()
+
+    def inc(self, *values: str, amount: float = 1.0) -> None:
+        """Increase the child for the given label values by amount."""
+        self.labels(*values).inc(amount)
+
+    def dec(self, *values: str, amount: float = 1.0) -> None:
+        """Decrease the child for the given label values by amount."""
+        self.labels(*values).dec(amount)
+
+    def set(self, value: float, *values: str) -> None:
+        """Set the child for the given label values."""
+        self.labels(*values).set(value)
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values over fixed buckets.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Sorted finite bucket upper bounds
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float, *values: str) -> None:
+        """Record a value for the given label values."""
+        self.labels(*values).observe(value)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",),
+                                        values + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+_registry: Dict[str, Metric] = {}
+_collectors: List[Callable[[], None]] = []
+
+
+def _register(metric: Metric) -> Metric:
+    existing = _registry.get(metric.name)
+    if existing is not None:
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise Exception(f"Metric {metric.name} is already registered differently")
+        return existing
+    _registry[metric.name] = metric
+    return metric
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Return the registered counter with this name, creating it if needed."""
+    return _register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """Return the registered gauge with this name, creating it if needed."""
+    return _register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Return the registered histogram with this name, creating it if needed."""
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def register_collector(collector: Callable[[], None]) -> None:
+    """
+    Register a function that updates gauges right before each scrape.
+
+    Args:
+        collector (Callable[[], None]): Called by render(); errors are logged
+            and do not fail the scrape
+    """
+    _collectors.append(collector)
+
+
+def render() -> str:
+    """
+    Render every registered metric.
+
+    Returns:
+        str: Prometheus text exposition format (version 0.0.4)
+    """
+    for collector in _collectors:
+        try:
+            collector()
+        except Exception as e:
+            print(f"[METRICS] Collector {collector.__name__} failed: {str(e)}")
+    lines: List[str] = []
+    for name in sorted(_registry):
+        lines.extend(_registry[name].collect())
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    """Zero every metric (collectors and registrations are kept)."""
+    for metric in _registry.values():
+        metric.clear()
+
+
+# Shared metric families
+HTTP_REQUEST_DURATION = histogram(
+    "http_request_duration_seconds", "API request latency by route.",
+    ("method", "route", "status"))
+HTTP_REQUESTS_IN_FLIGHT = gauge(
+    "http_requests_in_flight", "API requests currently being served.")
+UPSTREAM_REQUEST_DURATION = histogram(
+    "upstream_request_duration_seconds", "Latency of calls to upstream services.",
+    ("upstream", "operation"))
+UPSTREAM_REQUESTS = counter(
+    "upstream_requests_total", "Calls to upstream services by response status.",
+    ("upstream", "operation", "status"))
+UPSTREAM_ERRORS = counter(
+    "upstream_errors_total",
+    "Failed upstream calls (circuit_open, transport or http_status).",
+    ("upstream", "operation", "kind"))
+UPSTREAM_IN_FLIGHT = gauge(
+    "upstream_requests_in_flight", "Upstream calls currently waiting on a response.",
+    ("upstream",))
+CACHE_HITS = counter("cache_hits_total", "Cache lookups answered from the cache.", ("cache",))
+CACHE_MISSES = counter("cache_misses_total", "Cache lookups that missed or had expired.", ("cache",))
+CACHE_EVICTIONS = counter("cache_evictions_total", "Entries evicted to stay within cache limits.", ("cache",))
+COALESCED_CALLS = counter(
+    "singleflight_shared_total", "Upstream calls joined onto an identical call already in flight.")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route template and the
+    number of requests in flight.
+
+    Routes are labelled by their template (e.g. /api/v1/report/{idempotency_key})
+    and unknown paths as "unmatched", so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start, scope["method"],
+                getattr(route, "path", "unmatched"), str(status))
+
@@ -0,0 +1,86 @@
+"""
+Pagination Module
+
+This module provides the opaque cursors and field projection shared by the
+list endpoints. A cursor is URL-safe base64 of a small JSON object describing
+where the next page starts; clients pass it back unchanged.
+"""
+
+import base64
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """
+    Encode pagination state as an opaque cursor.
+
+    Args:
+        state (Dict[str, Any]): JSON-serializable position of the next page
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor from a previous page
+
+    Returns:
+        Dict[str, Any]: Pagination state
+
+    Raises:
+        Exception: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise Exception("Invalid cursor")
+    if not isinstance(state, dict):
+        raise Exception("Invalid cursor")
+    return state
+
+
+def parse_fields(fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """
+    Normalize a fields= projection.
+
+    Accepts a list of names or comma-separated strings (as sent in a query
+    string), dropping blanks and duplicates while keeping order.
+
+    Args:
+        fields (Optional[Iterable[str]]): Requested field names
+
+    Returns:
+        Optional[List[str]]: Field names, or None when no projection was asked for
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = [fields]
+    names = [name.strip() for value in fields for name in value.split(",")]
+    names = list(dict.fromkeys(name for name in names if name))
+    return names or None
+
+
+def project(item: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Keep only the requested keys of a dict.
+
+    Args:
+        item (Dict[str, Any]): Source dict (not modified)
+        fields (Optional[List[str]]): Keys to keep; None keeps everything
+
+    Returns:
+        Dict[str, Any]: Projected copy, or item itself without a projection
+    """
+    if fields is None:
+        return item
+    return {key: item[key] for key in fields if key in item}
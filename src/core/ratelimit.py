@@ -0,0 +1,48 @@
+"""
+Rate Limiting Module
+
+This module provides a token-bucket rate limiter for outgoing upstream calls,
+used to keep bursts of fan-out requests (e.g. area risk queries) within the
+rate an upstream service is willing to serve.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Asynchronous token bucket.
+
+    Tokens are added continuously at rate per second up to burst; every
+    acquire() takes one token and waits until one is available.
+
+    Attributes:
+        rate (float): Tokens added per second (0 or less: unlimited)
+        burst (int): Bucket capacity
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = max(1, burst if burst is not None else int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a call is allowed under the configured rate."""
+        if self.rate <= 0:
+            return
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,393 @@
+"""
+Report Queue Module
+
+This module implements a durable write-behind queue for user issue reports.
+Reports are committed to a local SQLite database (WAL mode) before the API
+answers, and a background flusher submits them to the Digital Twin with
+exponential backoff, so a slow or unavailable Digital Twin no longer loses
+reports. Each report carries an idempotency key; resubmitting the same key
+returns the existing report instead of queueing a duplicate.
+
+Every commit is fsynced, so the queue methods block on disk I/O. Async code
+calls them through run_queue(), which runs them in the default executor; a
+lock serializes access to the shared connection.
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from src.core.config import settings
+from src.core.digitaltwin import post_user_report
+from src.core.metrics import gauge
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+# Seconds a claimed report is hidden from other flushers while it is sent
+CLAIM_LEASE_SECONDS = 60
+
+
+def get_queue_path() -> str:
+    """
+    Return the SQLite file holding queued reports.
+
+    Returns:
+        str: REPORT_QUEUE_PATH if configured, otherwise
+            data/cache/reports.sqlite3 in the project root
+    """
+    if settings.REPORT_QUEUE_PATH:
+        return settings.REPORT_QUEUE_PATH
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, "../../data/cache/reports.sqlite3")
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Backoff before the next delivery attempt.
+
+    Args:
+        attempts (int): Attempts made so far (at least 1)
+
+    Returns:
+        float: Exponential delay capped at REPORT_RETRY_MAX_SECONDS, with up
+            to 20% jitter so retries from a backlog do not arrive in lockstep
+    """
+    delay = min(settings.REPORT_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+                settings.REPORT_RETRY_MAX_SECONDS)
+    return delay * (1 + random.random() * 0.2)
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """
+    Check whether a delivery error will not go away on retry.
+
+    Args:
+        error (Exception): Error returned by post_user_report
+
+    Returns:
+        bool: True for 4xx responses other than 408 and 429
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return 400 <= status < 500 and status not in (408, 429)
+    return False
+
+
+class ReportQueue:
+    """
+    SQLite-backed queue of reports awaiting delivery.
+
+    Attributes:
+        path (str): Database file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        # Reentrant so enqueue can return the stored report through get
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Reports are acknowledged as accepted, so every commit must be durable
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " idempotency_key TEXT NOT NULL UNIQUE,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL,"
+            " next_attempt_at REAL NOT NULL,"
+            " sent_at REAL,"
+            " last_error TEXT,"
+            " response TEXT)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS reports_due ON reports (status, next_attempt_at)")
+
+    def enqueue(self, payload: Dict[str, Any],
+                idempotency_key: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Durably store a report for delivery.
+
+        Args:
+            payload (Dict[str, Any]): JSON-serializable report body
+            idempotency_key (Optional[str]): Client-supplied key; a random
+                one is generated if omitted
+
+        Returns:
+            Tuple[Dict[str, Any], bool]: The stored report (see get) and
+                whether it was newly queued (False for a repeated key)
+        """
+        key = idempotency_key or uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO reports"
+                " (idempotency_key, payload, status, created_at, next_attempt_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(payload), PENDING, now, now))
+            return self.get(key), cursor.rowcount == 1
+
+    def get(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a report by idempotency key.
+
+        Args:
+            idempotency_key (str): Report key
+
+        Returns:
+            Optional[Dict[str, Any]]: report_id, idempotency_key, status,
+                attempts, created_at, sent_at, last_error and the Digital
+                Twin response once sent; None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM reports WHERE idempotency_key = ?", (idempotency_key,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "report_id": row["id"],
+            "idempotency_key": row["idempotency_key"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "sent_at": row["sent_at"],
+            "last_error": row["last_error"],
+            "response": json.loads(row["response"]) if row["response"] else None,
+        }
+
+    def claim_due(self, limit: int) -> List[sqlite3.Row]:
+        """
+        Claim pending reports whose next attempt is due.
+
+        Claimed reports are leased for CLAIM_LEASE_SECONDS so that another
+        worker sharing the database does not send them at the same time.
+
+        Args:
+            limit (int): Maximum number of reports to claim
+
+        Returns:
+            List[sqlite3.Row]: Claimed rows (id, idempotency_key, payload, attempts)
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, idempotency_key, payload, attempts FROM reports"
+                    " WHERE status = ? AND next_attempt_at <= ?"
+                    " ORDER BY next_attempt_at LIMIT ?", (PENDING, now, limit)).fetchall()
+                self._conn.executemany(
+                    "UPDATE reports SET next_attempt_at = ? WHERE id = ?",
+                    [(now + CLAIM_LEASE_SECONDS, row["id"]) for row in rows])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def mark_sent(self, report_id: int, response: Any) -> None:
+        """Record a successful delivery and the Digital Twin response."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE reports SET status = ?, sent_at = ?, attempts = attempts + 1,"
+                " last_error = NULL, response = ? WHERE id = ?",
+                (SENT, time.time(), json.dumps(response, default=str), report_id))
+
+    def mark_retry(self, report_id: int, error: str, delay: float) -> None:
+        """Record a failed attempt and schedule the next one after delay seconds."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE reports SET attempts = attempts + 1, last_error = ?,"
+                " next_attempt_at = ? WHERE id = ?", (error, time.time() + delay, report_id))
+
+    def mark_failed(self, report_id: int, error: str) -> None:
+        """Give up on a report; it stays in the database for inspection."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE reports SET status = ?, attempts = attempts + 1, last_error = ?"
+                " WHERE id = ?", (FAILED, error, report_id))
+
+    def prune_sent(self, older_than: float) -> int:
+        """
+        Delete delivered reports sent more than older_than seconds ago.
+
+        Args:
+            older_than (float): Retention in seconds
+
+        Returns:
+            int: Number of deleted reports
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM reports WHERE status = ? AND sent_at < ?",
+                (SENT, time.time() - older_than))
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize the queue.
+
+        Returns:
+            Dict[str, Any]: depth (pending reports), lag_seconds (age of the
+                oldest pending report, 0 if none), sent and failed counts
+        """
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM reports GROUP BY status").fetchall())
+            oldest = self._conn.execute(
+                "SELECT MIN(created_at) FROM reports WHERE status = ?", (PENDING,)).fetchone()[0]
+        return {
+            "depth": counts.get(PENDING, 0),
+            "lag_seconds": round(time.time() - oldest, 3) if oldest is not None else 0.0,
+            "sent": counts.get(SENT, 0),
+            "failed": counts.get(FAILED, 0),
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=1)
+def get_report_queue() -> ReportQueue:
+    """
+    Return the process-wide report queue, opening it on first use.
+
+    Returns:
+        ReportQueue: Queue stored at get_queue_path()
+    """
+    return ReportQueue(get_queue_path())
+
+
+async def run_queue(method: Callable[..., Any], *args: Any) -> Any:
+    """
+    Call a blocking ReportQueue method in the default executor.
+
+    Args:
+        method (Callable[..., Any]): Bound queue method, e.g. queue.enqueue
+        *args (Any): Positional arguments for the method
+
+    Returns:
+        Any: The method's return value
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+
+# Updated by the flusher after every pass, so a scrape never touches the database
+_depth_gauge = gauge("report_queue_depth", "Reports waiting for delivery.")
+_lag_gauge = gauge("report_queue_lag_seconds", "Age of the oldest undelivered report.")
+
+
+# Set when a report is queued so the flusher does not wait out its interval
+_wakeup: Optional[asyncio.Event] = None
+
+
+def _get_wakeup() -> asyncio.Event:
+    global _wakeup
+    if _wakeup is None:
+        _wakeup = asyncio.Event()
+    return _wakeup
+
+
+def notify_flusher() -> None:
+    """Wake the background flusher to deliver newly queued reports."""
+    _get_wakeup().set()
+
+
+async def flush_reports(queue: Optional[ReportQueue] = None) -> Dict[str, int]:
+    """
+    Deliver one batch of due reports to the Digital Twin.
+
+    Up to REPORT_FLUSH_BATCH_SIZE reports are submitted concurrently. Failed
+    deliveries are retried with exponential backoff; permanent client errors
+    and reports that reach REPORT_MAX_ATTEMPTS are marked failed.
+
+    Args:
+        queue (Optional[ReportQueue]): Queue to flush (default: the shared queue)
+
+    Returns:
+        Dict[str, int]: Number of reports sent, retried and failed
+    """
+    queue = queue or get_report_queue()
+    rows = await run_queue(queue.claim_due, settings.REPORT_FLUSH_BATCH_SIZE)
+    results = await asyncio.gather(*[
+        post_user_report(json.loads(row["payload"]),
+                         idempotency_key=row["idempotency_key"])
+        for row in rows])
+
+    summary = {"sent": 0, "retried": 0, "failed": 0}
+    for row, result in zip(rows, results):
+        if not isinstance(result, Exception):
+            await run_queue(queue.mark_sent, row["id"], result)
+            summary["sent"] += 1
+            continue
+        attempts = row["attempts"] + 1
+        if is_permanent_error(result) or attempts >= settings.REPORT_MAX_ATTEMPTS:
+            await run_queue(queue.mark_failed, row["id"], str(result))
+            summary["failed"] += 1
+            print(f"[REPORT QUEUE] Giving up on report {row['id']} after {attempts} attempts: {str(result)}")
+        else:
+            await run_queue(queue.mark_retry, row["id"], str(result), retry_delay(attempts))
+            summary["retried"] += 1
+    return summary
+
+
+async def run_report_flusher() -> None:
+    """
+    Flush the report queue every REPORT_FLUSH_INTERVAL_SECONDS until cancelled.
+
+    A full batch is followed immediately by the next one, and queueing a new
+    report wakes the flusher early. The queue depth and lag gauges are
+    updated after every pass.
+    """
+    queue = get_report_queue()
+    wakeup = _get_wakeup()
+    while True:
+        summary = {"sent": 0, "retried": 0, "failed": 0}
+        try:
+            summary = await flush_reports(queue)
+            await run_queue(queue.prune_sent, settings.REPORT_RETENTION_SECONDS)
+            stats = await run_queue(queue.stats)
+            _depth_gauge.set(stats["depth"])
+            _lag_gauge.set(stats["lag_seconds"])
+            if any(summary.values()):
+                print(f"[REPORT QUEUE] Flushed: {summary}, {stats['depth']} pending")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[REPORT QUEUE] Flush failed: {str(e)}")
+        if sum(summary.values()) >= settings.REPORT_FLUSH_BATCH_SIZE:
+            continue
+        wakeup.clear()
+        try:
+            await asyncio.wait_for(wakeup.wait(), settings.REPORT_FLUSH_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start_report_flusher() -> Optional[asyncio.Task]:
+    """
+    Start the background flusher task if the queue is enabled in settings.
+
+    Returns:
+        Optional[asyncio.Task]: The flusher task, or None if disabled
+    """
+    if not settings.REPORT_QUEUE_ENABLED:
+        return None
+    return asyncio.ensure_future(run_report_flusher())
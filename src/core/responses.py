@@ -0,0 +1,69 @@
+"""
+JSON Response Module
+
+This module provides the application's default response class, which
+serializes with orjson instead of the standard library. It understands the
+numpy and pandas values produced by the historical data path (numpy scalars
+and arrays, Timestamps, NaT/NA), so endpoints with large payloads can return
+it directly and skip FastAPI's jsonable_encoder pass as well.
+"""
+
+import datetime
+import decimal
+from typing import Any
+
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.core.tracing import span
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Convert values orjson does not serialize natively."""
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.tolist()
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes.
+
+    Args:
+        content (Any): JSON-compatible data, possibly with numpy/pandas values
+
+    Returns:
+        bytes: UTF-8 JSON; NaN and infinities become null
+    """
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, aware of numpy and pandas values.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return dumps(content)
@@ -0,0 +1,258 @@
+"""
+Flood Risk Cache Module
+
+This module keeps Digital Twin point-risk answers for design rainfall events
+in a small SQLite database on local disk. Design-event risk for a location
+only changes when the flood model is rerun, so results survive restarts and
+the whole cache is dropped when the Digital Twin reports a new model version.
+The cache is bounded by entry count and by total payload bytes and evicts the
+least recently used entries first. Lookups are counted as cache "risk" in
+/metrics.
+
+The entry count and payload total are kept in memory and last-used times
+are written in batches, so a hit is a single primary-key SELECT. The methods
+block on disk I/O; async callers run them in an executor. A lock serializes
+them, so they are safe to call from several executor threads.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from src.core.config import settings
+from src.core.metrics import CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES
+
+# Response field carrying the version of the model that produced a result
+MODEL_VERSION_FIELD = "model_version"
+
+
+def get_cache_path() -> str:
+    """
+    Return the SQLite file used for the risk cache.
+
+    Returns:
+        str: RISK_CACHE_PATH if configured, otherwise data/cache/risk.sqlite3
+            in the project root
+    """
+    if settings.RISK_CACHE_PATH:
+        return settings.RISK_CACHE_PATH
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, "../../data/cache/risk.sqlite3")
+
+
+def is_cacheable_event(rainfall_event_id: Optional[str]) -> bool:
+    """
+    Check whether risk results for a rainfall event are static.
+
+    Args:
+        rainfall_event_id (Optional[str]): Event identifier; None means the
+            Digital Twin default design event
+
+    Returns:
+        bool: True for design events (e.g. "design_2yr") and the default
+    """
+    return rainfall_event_id is None or rainfall_event_id.startswith("design_")
+
+
+def risk_cache_key(lat: float, lon: float, rainfall_event_id: Optional[str]) -> str:
+    """
+    Build the cache key for snapped coordinates and an event.
+
+    Args:
+        lat (float): Snapped latitude
+        lon (float): Snapped longitude
+        rainfall_event_id (Optional[str]): Event identifier
+
+    Returns:
+        str: Key such as "-31.846100,115.898600,design_2yr"
+    """
+    return f"{lat:.6f},{lon:.6f},{rainfall_event_id or ''}"
+
+
+class RiskCache:
+    """
+    Persistent LRU cache of risk responses backed by SQLite.
+
+    Attributes:
+        path (str): Database file
+        max_entries (int): Maximum number of cached results
+        max_bytes (int): Maximum total size of the stored JSON payloads
+        ttl (Optional[float]): Seconds a result is trusted (None: until the
+            model version changes)
+    """
+
+    # Pending last-used updates written in one statement
+    TOUCH_BATCH_SIZE = 64
+
+    def __init__(self, path: str, max_entries: int, max_bytes: int,
+                 ttl: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS risk ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " stored_at REAL NOT NULL, last_used REAL NOT NULL)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS risk_last_used ON risk (last_used)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE name = 'model_version'").fetchone()
+        self.model_version: Optional[str] = row[0] if row else None
+        self._count, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM risk").fetchone()
+        # key -> last-used time not yet written to the database
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def total_bytes(self) -> int:
+        """Total size of the stored payloads in bytes."""
+        return self._bytes
+
+    def _flush_touched(self) -> None:
+        if self._touched:
+            self._conn.executemany("UPDATE risk SET last_used = ? WHERE key = ?",
+                                   [(used, key) for key, used in self._touched.items()])
+            self._touched.clear()
+
+    def _delete(self, key: str, size: int) -> None:
+        self._conn.execute("DELETE FROM risk WHERE key = ?", (key,))
+        self._touched.pop(key, None)
+        self._count -= 1
+        self._bytes -= size
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached result and mark it as recently used.
+
+        Args:
+            key (str): Key from risk_cache_key
+
+        Returns:
+            Optional[Dict[str, Any]]: Cached response, or None on a miss or
+                once the entry is older than ttl
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, size FROM risk WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                CACHE_MISSES.inc("risk")
+                return None
+            now = time.time()
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._delete(key, row[2])
+                CACHE_MISSES.inc("risk")
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_BATCH_SIZE:
+                self._flush_touched()
+            CACHE_HITS.inc("risk")
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a result, evicting least recently used entries over the limits.
+
+        Args:
+            key (str): Key from risk_cache_key
+            value (Dict[str, Any]): JSON-serializable risk response
+        """
+        payload = json.dumps(value, separators=(",", ":"))
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM risk WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO risk (key, value, size, stored_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?)", (key, payload, size, now, now))
+            self._touched.pop(key, None)
+            if old is None:
+                self._count += 1
+            self._bytes += size - (old[0] if old else 0)
+            self._evict()
+
+    def _evict(self) -> None:
+        if self._count <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        # Eviction order needs the pending last-used times
+        self._flush_touched()
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM risk ORDER BY last_used"):
+            if self._count <= self.max_entries and self._bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            self._count -= 1
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM risk WHERE key = ?", victims)
+        CACHE_EVICTIONS.inc("risk", amount=len(victims))
+
+    def observe_model_version(self, version: Optional[str]) -> bool:
+        """
+        Record the model version reported by a Digital Twin response.
+
+        Args:
+            version (Optional[str]): Reported version; None is ignored
+
+        Returns:
+            bool: True if the version changed and the cache was cleared
+        """
+        if version is None or str(version) == self.model_version:
+            return False
+        version = str(version)
+        with self._lock:
+            changed = self.model_version is not None
+            if changed:
+                print(f"[RISK CACHE] Model version {self.model_version} -> {version}, clearing cache")
+                self._clear()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('model_version', ?)", (version,))
+            self.model_version = version
+        return changed
+
+    def _clear(self) -> None:
+        self._conn.execute("DELETE FROM risk")
+        self._touched.clear()
+        self._count = self._bytes = 0
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock:
+            self._clear()
+
+    def close(self) -> None:
+        """Write pending last-used times and close the database connection."""
+        with self._lock:
+            self._flush_touched()
+            self._conn.close()
+
+
+@lru_cache(maxsize=1)
+def get_risk_cache() -> RiskCache:
+    """
+    Return the process-wide risk cache, opening it on first use.
+
+    Returns:
+        RiskCache: Cache configured from the RISK_CACHE_* settings
+    """
+    return RiskCache(
+        get_cache_path(),
+        max_entries=settings.RISK_CACHE_MAX_ENTRIES,
+        max_bytes=settings.RISK_CACHE_MAX_BYTES,
+        ttl=settings.RISK_CACHE_TTL_SECONDS or None,
+    )
@@ -0,0 +1,102 @@
+"""
+Request Coalescing Module
+
+This module implements single-flight coalescing for upstream calls. While a
+call for a given key is in flight, every other caller with the same key
+awaits the same result instead of issuing its own identical request, so a
+burst of users near one station costs a single upstream round trip.
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from src.core.metrics import COALESCED_CALLS
+from src.core.tracing import span
+
+
+class SingleFlight:
+    """
+    Group of in-flight calls keyed by request identity.
+
+    The shared call runs as its own task, so a caller that is cancelled
+    (e.g. a client disconnecting) does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key (Hashable): Identity of the call (see make_key)
+            fn (Callable[[], Awaitable[Any]]): Coroutine factory performing the call
+
+        Returns:
+            Any: The result of fn, shared by every caller
+
+        Raises:
+            Exception: Whatever fn raised, re-raised in every caller
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+            return await asyncio.shield(future)
+        COALESCED_CALLS.inc()
+        # The shared call's own spans belong to the request that started it
+        with span("singleflight.wait"):
+            return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not future.cancelled():
+            future.exception()
+
+
+def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None,
+             body: Any = None) -> tuple:
+    """
+    Build a coalescing key from an upstream URL, params and body.
+
+    Args:
+        method (str): HTTP method
+        url (str): Request URL
+        params (Optional[Dict[str, Any]]): Query parameters
+        body (Any): JSON-serializable request body
+
+    Returns:
+        tuple: Hashable key; equal requests give equal keys
+    """
+    return (
+        method.upper(),
+        url,
+        tuple(sorted((params or {}).items())),
+        json.dumps(body, sort_keys=True, default=str) if body is not None else None,
+    )
+
+
+# Process-wide group shared by all upstream helpers
+_upstream_calls = SingleFlight()
+
+
+async def coalesce(key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run fn through the shared single-flight group.
+
+    Args:
+        key (Hashable): Identity of the call (see make_key)
+        fn (Callable[[], Awaitable[Any]]): Coroutine factory performing the call
+
+    Returns:
+        Any: The shared result of fn
+    """
+    return await _upstream_calls.do(key, fn)
@@ -0,0 +1,356 @@
+"""
+Spatial Indexing Module
+
+This module provides the geometry helpers used to place warnings on the map:
+a static R-tree over bounding boxes, circle/polygon intersection tests and an
+index of named areas (forecast districts, river catchments) loaded from a
+GeoJSON file. It also samples bounding boxes and routes into points for
+area risk queries.
+"""
+
+import json
+import math
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+# (min_lon, min_lat, max_lon, max_lat)
+BBox = Tuple[float, float, float, float]
+Ring = List[Tuple[float, float]]
+
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON_EQUATOR = 111.320
+
+
+def _union(boxes: Sequence[BBox]) -> BBox:
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def _overlaps(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class RTree:
+    """
+    Static R-tree over bounding boxes, bulk-loaded with Sort-Tile-Recursive.
+
+    The tree is built once from all entries and is read-only afterwards,
+    which suits geometry that only changes when its source file does.
+    """
+
+    def __init__(self, entries: Sequence[Tuple[BBox, Any]], node_capacity: int = 8):
+        """
+        Args:
+            entries (Sequence[Tuple[BBox, Any]]): (bounding box, item) pairs
+            node_capacity (int): Maximum children per node
+        """
+        self.node_capacity = max(2, node_capacity)
+        # Nodes are (bbox, children, is_leaf); leaf children are items
+        level = [(bbox, item, True) for bbox, item in entries]
+        self._size = len(level)
+        while len(level) > 1:
+            level = self._pack(level)
+        self._root = level[0] if level else None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _pack(self, nodes: List[tuple]) -> List[tuple]:
+        capacity = self.node_capacity
+        groups = math.ceil(len(nodes) / capacity)
+        slice_size = math.ceil(math.sqrt(groups)) * capacity
+        by_x = sorted(nodes, key=lambda n: n[0][0] + n[0][2])
+        parents = []
+        for i in range(0, len(by_x), slice_size):
+            by_y = sorted(by_x[i:i + slice_size], key=lambda n: n[0][1] + n[0][3])
+            for j in range(0, len(by_y), capacity):
+                children = by_y[j:j + capacity]
+                parents.append((_union([c[0] for c in children]), children, False))
+        return parents
+
+    def query(self, bbox: BBox) -> List[Any]:
+        """
+        Return every item whose bounding box overlaps bbox.
+
+        Args:
+            bbox (BBox): Query box (min_lon, min_lat, max_lon, max_lat)
+
+        Returns:
+            List[Any]: Matching items
+        """
+        if self._root is None:
+            return []
+        results = []
+        stack = [self._root]
+        while stack:
+            node_bbox, payload, is_leaf = stack.pop()
+            if not _overlaps(node_bbox, bbox):
+                continue
+            if is_leaf:
+                results.append(payload)
+            else:
+                stack.extend(payload)
+        return results
+
+
+def circle_bbox(lat: float, lon: float, radius_km: float) -> BBox:
+    """
+    Bounding box of a circle on the earth's surface.
+
+    Args:
+        lat (float): Centre latitude in decimal degrees
+        lon (float): Centre longitude in decimal degrees
+        radius_km (float): Radius in kilometers
+
+    Returns:
+        BBox: (min_lon, min_lat, max_lon, max_lat)
+    """
+    dlat = radius_km / KM_PER_DEG_LAT
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    dlon = radius_km / (KM_PER_DEG_LON_EQUATOR * cos_lat)
+    return (lon - dlon, lat - dlat, lon + dlon, lat + dlat)
+
+
+def _point_in_ring(x: float, y: float, ring: Ring) -> bool:
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _segment_distance(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def polygon_intersects_circle(rings: List[Ring], lat: float, lon: float, radius_km: float) -> bool:
+    """
+    Check whether a polygon intersects a circle.
+
+    Coordinates are projected to kilometers around the circle centre with an
+    equirectangular approximation, which is accurate enough at warning-area
+    scale. Holes are ignored.
+
+    Args:
+        rings (List[Ring]): Polygon rings as (lon, lat) pairs, outer ring first
+        lat (float): Circle centre latitude in decimal degrees
+        lon (float): Circle centre longitude in decimal degrees
+        radius_km (float): Circle radius in kilometers
+
+    Returns:
+        bool: True if the circle centre is inside the polygon or any edge
+            comes within radius_km of it
+    """
+    kx = KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(lat))
+    outer = [((x - lon) * kx, (y - lat) * KM_PER_DEG_LAT) for x, y in rings[0]]
+    if _point_in_ring(0.0, 0.0, outer):
+        return True
+    for i in range(len(outer)):
+        ax, ay = outer[i - 1]
+        bx, by = outer[i]
+        if _segment_distance(0.0, 0.0, ax, ay, bx, by) <= radius_km:
+            return True
+    return False
+
+
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Equirectangular distance, accurate to well under 1% at city scale."""
+    kx = KM_PER_DEG_LON_EQUATOR * math.cos(math.radians((lat1 + lat2) / 2))
+    return math.hypot((lon2 - lon1) * kx, (lat2 - lat1) * KM_PER_DEG_LAT)
+
+
+def _bbox_grid(bbox: BBox, spacing_km: float) -> Tuple[int, int]:
+    """Rows and columns of the sampling grid of a bounding box."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    mid_lat = (min_lat + max_lat) / 2
+    height = _distance_km(min_lat, min_lon, max_lat, min_lon)
+    width = _distance_km(mid_lat, min_lon, mid_lat, max_lon)
+    return max(1, math.ceil(height / spacing_km)), max(1, math.ceil(width / spacing_km))
+
+
+def _polyline_steps(path: Sequence[Tuple[float, float]], spacing_km: float) -> List[int]:
+    """Number of sampling steps along each segment of a polyline."""
+    return [max(1, math.ceil(_distance_km(*path[i], *path[i + 1]) / spacing_km))
+            for i in range(len(path) - 1)]
+
+
+def count_bbox_samples(bbox: BBox, spacing_km: float) -> int:
+    """
+    Number of samples sample_bbox would return, without building them.
+
+    Args:
+        bbox (BBox): (min_lon, min_lat, max_lon, max_lat)
+        spacing_km (float): Approximate distance between neighbouring samples
+
+    Returns:
+        int: Sample count
+    """
+    rows, cols = _bbox_grid(bbox, spacing_km)
+    return (rows + 1) * (cols + 1)
+
+
+def count_polyline_samples(path: Sequence[Tuple[float, float]], spacing_km: float) -> int:
+    """
+    Number of samples sample_polyline would return, without building them.
+
+    Args:
+        path (Sequence[Tuple[float, float]]): (lat, lon) vertices in order
+        spacing_km (float): Approximate distance between consecutive samples
+
+    Returns:
+        int: Sample count
+    """
+    if len(path) == 1:
+        return 1
+    return sum(steps + 1 for steps in _polyline_steps(path, spacing_km))
+
+
+def sample_bbox(bbox: BBox, spacing_km: float) -> List[Tuple[float, float]]:
+    """
+    Sample a regular grid of points covering a bounding box.
+
+    Use count_bbox_samples to check the size before sampling a box that
+    comes from a request.
+
+    Args:
+        bbox (BBox): (min_lon, min_lat, max_lon, max_lat)
+        spacing_km (float): Approximate distance between neighbouring samples
+
+    Returns:
+        List[Tuple[float, float]]: (lat, lon) samples, corners included
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    rows, cols = _bbox_grid(bbox, spacing_km)
+    return [(min_lat + (max_lat - min_lat) * r / rows,
+             min_lon + (max_lon - min_lon) * c / cols)
+            for r in range(rows + 1) for c in range(cols + 1)]
+
+
+def sample_polyline(path: Sequence[Tuple[float, float]],
+                    spacing_km: float) -> List[Tuple[int, float, float]]:
+    """
+    Sample points along a polyline, segment by segment.
+
+    Both ends of every segment are included, so each segment's samples cover
+    it fully; shared vertices appear once per adjoining segment.
+
+    Args:
+        path (Sequence[Tuple[float, float]]): (lat, lon) vertices in order
+        spacing_km (float): Approximate distance between consecutive samples
+
+    Returns:
+        List[Tuple[int, float, float]]: (segment index, lat, lon) samples
+    """
+    samples = []
+    if len(path) == 1:
+        return [(0, path[0][0], path[0][1])]
+    for index, steps in enumerate(_polyline_steps(path, spacing_km)):
+        (lat1, lon1), (lat2, lon2) = path[index], path[index + 1]
+        for k in range(steps + 1):
+            t = k / steps
+            samples.append((index, lat1 + (lat2 - lat1) * t, lon1 + (lon2 - lon1) * t))
+    return samples
+
+
+def _polygons(geometry: Dict[str, Any]) -> List[List[Ring]]:
+    """Return the polygons of a GeoJSON Polygon/MultiPolygon geometry."""
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+class AreaIndex:
+    """
+    Named areas (e.g. forecast districts) indexed for spatial and name lookup.
+
+    Every polygon is inserted into an R-tree by its bounding box; exact
+    circle intersection is only tested for the R-tree candidates.
+    """
+
+    def __init__(self, features: List[Dict[str, Any]]):
+        """
+        Args:
+            features (List[Dict[str, Any]]): GeoJSON features with a "name"
+                property and Polygon/MultiPolygon geometry
+        """
+        entries = []
+        self.names: List[str] = []
+        for feature in features:
+            name = feature.get("properties", {}).get("name")
+            if not name or not feature.get("geometry"):
+                continue
+            self.names.append(name)
+            for polygon in _polygons(feature["geometry"]):
+                outer = polygon[0]
+                bbox = (min(p[0] for p in outer), min(p[1] for p in outer),
+                        max(p[0] for p in outer), max(p[1] for p in outer))
+                entries.append((bbox, (name, polygon)))
+        self._tree = RTree(entries)
+        # Longest names first so "South East Coastal" wins over shorter overlaps
+        names = sorted(set(self.names), key=len, reverse=True)
+        self._name_pattern = re.compile(
+            r"\b(" + "|".join(re.escape(n) for n in names) + r")\b",
+            re.IGNORECASE) if names else None
+        self._canonical = {n.lower(): n for n in names}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def areas_near(self, lat: float, lon: float, radius_km: float) -> Set[str]:
+        """
+        Names of the areas that intersect a circle.
+
+        Args:
+            lat (float): Centre latitude in decimal degrees
+            lon (float): Centre longitude in decimal degrees
+            radius_km (float): Radius in kilometers
+
+        Returns:
+            Set[str]: Area names
+        """
+        found = set()
+        for name, polygon in self._tree.query(circle_bbox(lat, lon, radius_km)):
+            if name not in found and polygon_intersects_circle(polygon, lat, lon, radius_km):
+                found.add(name)
+        return found
+
+    def match_names(self, text: str) -> Set[str]:
+        """
+        Names of the areas mentioned in a piece of text.
+
+        Args:
+            text (str): Free text such as a warning title or body
+
+        Returns:
+            Set[str]: Area names, in their canonical spelling
+        """
+        if not text or self._name_pattern is None:
+            return set()
+        return {self._canonical[m.lower()] for m in self._name_pattern.findall(text)}
+
+
+def load_area_index(path: str) -> Optional[AreaIndex]:
+    """
+    Load an AreaIndex from a GeoJSON FeatureCollection file.
+
+    Args:
+        path (str): Path to the GeoJSON file
+
+    Returns:
+        Optional[AreaIndex]: The index, or None if the file does not exist
+    """
+    try:
+        with open(path, 'r') as f:
+            collection = json.load(f)
+    except FileNotFoundError:
+        return None
+    return AreaIndex(collection.get("features", []))
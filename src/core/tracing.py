@@ -0,0 +1,278 @@
+"""
+Request Tracing Module
+
+This module records lightweight timing spans for each API request. Code
+wraps upstream calls and parsing steps in span("name"); the middleware
+collects the spans of the request and, with SERVER_TIMING_ENABLED, returns
+them in a Server-Timing header, so a slow response can be broken down in
+the browser's network panel or with curl -v. When TRACE_EXPORT_PATH is set,
+a sample of the traces is buffered in memory and appended as JSON lines to
+that file by a background task, for offline analysis of real traffic.
+
+Outside a traced request span() only reads a context variable, so
+instrumented helpers cost next to nothing when called from background
+tasks or tests.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from starlette.datastructures import MutableHeaders
+
+from src.core.config import settings
+
+
+class Span:
+    """
+    One timed step of a request.
+
+    Attributes:
+        name (str): Step name, e.g. "bom.forecast_xml"
+        parent (Optional[str]): Name of the enclosing span
+        start (float): perf_counter() at entry
+        duration (Optional[float]): Seconds spent, None while running
+        attrs (Dict[str, Any]): Extra details for the exported trace
+    """
+
+    __slots__ = ("name", "parent", "start", "duration", "attrs")
+
+    def __init__(self, name: str, parent: Optional[str], attrs: Dict[str, Any]):
+        self.name = name
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.attrs = attrs
+
+
+class Trace:
+    """
+    Spans recorded while serving one request.
+
+    Attributes:
+        trace_id (str): Random identifier, also sent in the exported line
+        started_at (float): Wall-clock start (Unix time)
+        start (float): perf_counter() at the start of the request
+        spans (List[Span]): Finished and running spans, in start order
+    """
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.spans: List[Span] = []
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[None]:
+    """
+    Time a block as a step of the current request.
+
+    Works in sync and async code; concurrent tasks started from a request
+    inherit its trace. Does nothing outside a traced request.
+
+    Args:
+        name (str): Step name
+        **attrs (Any): Details stored with the span in exported traces
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    current = Span(name, _current_span.get(), attrs)
+    trace.spans.append(current)
+    token = _current_span.set(name)
+    try:
+        yield
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _current_span.reset(token)
+
+
+_METRIC_NAME = re.compile(r"[^A-Za-z0-9!#$%&'*+\-.^_`|~]")
+
+
+def server_timing(trace: Trace, total: float) -> str:
+    """
+    Build a Server-Timing header value from a trace.
+
+    Spans with the same name (e.g. several history CSV downloads) are merged
+    into one entry whose duration is the sum and whose description gives the
+    count, which keeps the header short.
+
+    Args:
+        trace (Trace): Recorded spans
+        total (float): Seconds from request start to response start
+
+    Returns:
+        str: Header value such as "bom.forecast_xml;dur=120.4, total;dur=131.0"
+    """
+    merged: Dict[str, List[float]] = {}
+    for item in trace.spans:
+        if item.duration is None:
+            continue
+        entry = merged.setdefault(_METRIC_NAME.sub("_", item.name), [0.0, 0])
+        entry[0] += item.duration
+        entry[1] += 1
+    parts = []
+    for name, (duration, count) in merged.items():
+        part = f"{name};dur={duration * 1000:.1f}"
+        if count > 1:
+            part += f';desc="{count}x"'
+        parts.append(part)
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def trace_record(trace: Trace, scope: Dict[str, Any], status: int, total: float) -> Dict[str, Any]:
+    """
+    Build the exported JSON object for a finished request.
+
+    Args:
+        trace (Trace): Recorded spans
+        scope (Dict[str, Any]): ASGI scope of the request
+        status (int): Response status
+        total (float): Request duration in seconds
+
+    Returns:
+        Dict[str, Any]: trace_id, request identity, timing and spans (offsets
+            and durations in milliseconds)
+    """
+    route = scope.get("route")
+    return {
+        "trace_id": trace.trace_id,
+        "timestamp": trace.started_at,
+        "method": scope.get("method"),
+        "path": scope.get("path"),
+        "route": getattr(route, "path", None),
+        "status": status,
+        "duration_ms": round(total * 1000, 3),
+        "spans": [
+            {
+                "name": item.name,
+                "parent": item.parent,
+                "offset_ms": round((item.start - trace.start) * 1000, 3),
+                "duration_ms": (round(item.duration * 1000, 3)
+                                if item.duration is not None else None),
+                **({"attrs": item.attrs} if item.attrs else {}),
+            }
+            for item in trace.spans
+        ],
+    }
+
+
+# Sampled trace records waiting to be written; the oldest are dropped if
+# the file cannot keep up
+MAX_PENDING_TRACES = 10_000
+_pending_traces: Deque[Dict[str, Any]] = deque(maxlen=MAX_PENDING_TRACES)
+
+
+def write_traces(records: List[Dict[str, Any]], path: str) -> None:
+    """
+    Append trace records to a JSON lines file.
+
+    Args:
+        records (List[Dict[str, Any]]): Outputs of trace_record
+        path (str): File to append to; its directory is created if needed
+    """
+    lines = "".join(json.dumps(record, separators=(",", ":"), default=str) + "\n"
+                    for record in records)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(lines)
+
+
+async def flush_traces() -> int:
+    """
+    Write the buffered trace records to TRACE_EXPORT_PATH in an executor.
+
+    Returns:
+        int: Number of records written
+    """
+    path = settings.TRACE_EXPORT_PATH
+    if not path or not _pending_traces:
+        return 0
+    records = list(_pending_traces)
+    _pending_traces.clear()
+    await asyncio.get_running_loop().run_in_executor(None, write_traces, records, path)
+    return len(records)
+
+
+async def run_trace_exporter() -> None:
+    """
+    Flush buffered traces every TRACE_EXPORT_FLUSH_SECONDS until cancelled.
+    """
+    while True:
+        await asyncio.sleep(settings.TRACE_EXPORT_FLUSH_SECONDS)
+        try:
+            await flush_traces()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[TRACING] Failed to export traces: {str(e)}")
+
+
+def start_trace_exporter() -> Optional[asyncio.Task]:
+    """
+    Start the background trace exporter if trace export is configured.
+
+    Returns:
+        Optional[asyncio.Task]: The exporter task, or None if disabled
+    """
+    if not settings.TRACING_ENABLED or not settings.TRACE_EXPORT_PATH:
+        return None
+    return asyncio.ensure_future(run_trace_exporter())
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that traces each HTTP request, optionally adds the
+    Server-Timing header and queues a sample of traces for export. Requests
+    are not traced when neither is enabled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        send_timing = settings.SERVER_TIMING_ENABLED
+        export_path = settings.TRACE_EXPORT_PATH
+        if (scope["type"] != "http" or not settings.TRACING_ENABLED
+                or not (send_timing or export_path)):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        token = _current_trace.set(trace)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if send_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing",
+                                   server_timing(trace, time.perf_counter() - trace.start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            if export_path and random.random() < settings.TRACE_EXPORT_SAMPLE_RATE:
+                _pending_traces.append(trace_record(
+                    trace, scope, status, time.perf_counter() - trace.start))
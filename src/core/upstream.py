@@ -0,0 +1,172 @@
+"""
+Upstream HTTP Client Module
+
+This module owns the shared asynchronous HTTP clients used to talk to the
+external services the backend depends on: the Bureau of Meteorology, the
+Google Weather API and the Digital Twin platform. Each upstream gets its own
+pooled httpx.AsyncClient so keep-alive connections are reused across requests
+instead of paying a TCP/TLS handshake per call, and its own circuit breaker
+so a failing host is not called again until it has had time to recover.
+Every call is timed and counted per upstream and operation for /metrics and
+recorded as a "<upstream>.<operation>" span of the request being served.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+import httpx
+
+from src.core.circuit import CircuitOpenError, get_breaker, is_failure_status
+from src.core.config import settings
+from src.core.metrics import (UPSTREAM_ERRORS, UPSTREAM_IN_FLIGHT, UPSTREAM_REQUEST_DURATION,
+                              UPSTREAM_REQUESTS)
+from src.core.tracing import span
+
+# Upstream identifiers, one connection pool each
+BOM = "bom"
+GOOGLE = "google"
+DIGITAL_TWIN = "digitaltwin"
+
+# Default headers per upstream. bom.gov.au answers 403 to non-browser user agents.
+_DEFAULT_HEADERS: Dict[str, Dict[str, str]] = {
+    BOM: {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept-Language': 'en-US,en;q=0.9',
+    },
+    GOOGLE: {},
+    DIGITAL_TWIN: {},
+}
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def _build_client(upstream: str) -> httpx.AsyncClient:
+    """
+    Create a pooled async client for an upstream using the configured limits.
+
+    Args:
+        upstream (str): Upstream identifier (BOM, GOOGLE or DIGITAL_TWIN)
+
+    Returns:
+        httpx.AsyncClient: New client with shared timeouts and pool limits
+    """
+    timeout = httpx.Timeout(
+        settings.HTTP_READ_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        headers=_DEFAULT_HEADERS.get(upstream, {}),
+        timeout=timeout,
+        limits=limits,
+        follow_redirects=True,
+    )
+
+
+def get_client(upstream: str) -> httpx.AsyncClient:
+    """
+    Return the shared client for an upstream, creating it on first use.
+
+    Args:
+        upstream (str): Upstream identifier (BOM, GOOGLE or DIGITAL_TWIN)
+
+    Returns:
+        httpx.AsyncClient: Pooled client reused by every caller of this upstream
+    """
+    client = _clients.get(upstream)
+    if client is None or client.is_closed:
+        client = _build_client(upstream)
+        _clients[upstream] = client
+    return client
+
+
+def describe_error(error: Exception) -> str:
+    """
+    Describe a failed upstream call without the request details.
+
+    httpx error messages include the request URL, and Google URLs carry the
+    API key, so their text must not reach clients or logs.
+
+    Args:
+        error (Exception): Error raised or returned by an upstream call
+
+    Returns:
+        str: "HTTP <status>", "timeout" or "connection error" for httpx
+            errors, otherwise the error's own message
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code}"
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.HTTPError):
+        return "connection error"
+    return str(error)
+
+
+async def request(upstream: str, method: str, url: str, operation: str = "other",
+                  **kwargs: Any) -> httpx.Response:
+    """
+    Send an HTTP request through the pooled client of an upstream.
+
+    Args:
+        upstream (str): Upstream identifier (BOM, GOOGLE or DIGITAL_TWIN)
+        method (str): HTTP method, e.g. "GET" or "POST"
+        url (str): Absolute request URL
+        operation (str): Kind of call (e.g. "observations", "risk"), used to
+            label latency and error metrics
+        **kwargs: Extra arguments passed to httpx (headers, params, json, ...)
+
+    Returns:
+        httpx.Response: The upstream response (status is not checked here)
+
+    Raises:
+        CircuitOpenError: If the upstream's circuit breaker is open
+        httpx.TransportError: On connection errors and timeouts
+    """
+    breaker = get_breaker(upstream)
+    if not breaker.allow():
+        UPSTREAM_ERRORS.inc(upstream, operation, "circuit_open")
+        raise CircuitOpenError(f"{upstream} circuit open, skipping {operation}")
+    in_flight = UPSTREAM_IN_FLIGHT.labels(upstream)
+    in_flight.inc()
+    start = time.perf_counter()
+    try:
+        with span(f"{upstream}.{operation}"):
+            response = await get_client(upstream).request(method, url, **kwargs)
+    except httpx.TransportError:
+        breaker.record_failure()
+        UPSTREAM_ERRORS.inc(upstream, operation, "transport")
+        UPSTREAM_REQUESTS.inc(upstream, operation, "error")
+        raise
+    except (Exception, asyncio.CancelledError):
+        breaker.release()
+        raise
+    finally:
+        in_flight.dec()
+        UPSTREAM_REQUEST_DURATION.observe(time.perf_counter() - start, upstream, operation)
+    UPSTREAM_REQUESTS.inc(upstream, operation, str(response.status_code))
+    if is_failure_status(response.status_code):
+        breaker.record_failure()
+        UPSTREAM_ERRORS.inc(upstream, operation, "http_status")
+    else:
+        breaker.record_success()
+    return response
+
+
+async def close_clients() -> None:
+    """
+    Close every upstream client and release pooled connections.
+
+    Called from the application lifespan on shutdown.
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+__all__ = ["BOM", "GOOGLE", "DIGITAL_TWIN",
+           "get_client", "request", "close_clients"]
@@ -0,0 +1,42 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks import run
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_every_benchmark_runs(self):
+        results = run.run_benchmarks(repeat=1, min_time=0)
+        self.assertEqual(sorted(results), sorted(run.BENCHMARKS))
+        for result in results.values():
+            self.assertGreater(result["median_ms"], 0)
+
+    def test_fixtures_match_the_parsers(self):
+        periods = run.bom.parse_forecast_for_station(run.read_fixture("IDW14199.xml"), "WA_PT053")
+        self.assertEqual(len(periods), 7)
+        df = run.parse_history_csv(run.read_fixture("IDCJDW6111.202502.csv"))
+        self.assertEqual(len(df), 28)
+        details = run.parse_warning_details(run.read_fixture("IDW21033.shtml"))
+        self.assertEqual(details["severity"], "Severe")
+
+    def test_scaled_stations(self):
+        stations = run.scaled_stations(50)
+        self.assertEqual(len(stations), 50)
+        self.assertEqual(len({s["station_id"] for s in stations}), 50)
+
+    def test_results_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "results.json")
+            code = run.main(["--filter", "find_nearest_station[9]", "--repeat", "2",
+                             "--min-time", "0", "--output", output])
+            self.assertEqual(code, 0)
+            with open(output) as f:
+                report = json.load(f)
+        self.assertEqual(list(report["benchmarks"]), ["find_nearest_station[9]"])
+        self.assertEqual(report["benchmarks"]["find_nearest_station[9]"]["repeat"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+from datetime import datetime, timezone
+
+import httpx
+
+from src.core import bom, upstream
+from src.core.config import settings
+
+FORECAST_XML = b"""<?xml version="1.0"?>
+<product>
+  <amoc>
+    <issue-time-utc>2025-01-01T04:50:00Z</issue-time-utc>
+  </amoc>
+  <forecast>
+    <area aac="WA_PT053" description="Perth" type="location">
+      <forecast-period index="0" start-time-local="2025-01-01T05:00:00+08:00" end-time-local="2025-01-02T00:00:00+08:00">
+        <element type="forecast_icon_code">1</element>
+        <text type="precis">Sunny.</text>
+      </forecast-period>
+    </area>
+    <area aac="WA_PT148" description="Perth Airport" type="location">
+      <forecast-period index="0" start-time-local="2025-01-01T05:00:00+08:00" end-time-local="2025-01-02T00:00:00+08:00">
+        <text type="precis">Cloudy.</text>
+      </forecast-period>
+    </area>
+  </forecast>
+</product>
+"""
+
+
+class TestForecastCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=FORECAST_XML, headers={"ETag": '"v1"'})
+
+        bom._forecast_cache = bom._ForecastProductCache()
+        upstream._clients[upstream.BOM] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await upstream.close_clients()
+
+    def test_parse_forecast_for_station(self):
+        forecasts = bom.parse_forecast_for_station(FORECAST_XML, "WA_PT053")
+        self.assertEqual(len(forecasts), 1)
+        self.assertEqual(forecasts[0]["area"], "Perth")
+        self.assertEqual(forecasts[0]["forecast"]["precis"], "Sunny.")
+        self.assertEqual(forecasts[0]["forecast"]["element"], "1")
+
+    def test_build_forecast_index(self):
+        index, issue_time = bom.build_forecast_index(FORECAST_XML)
+        self.assertEqual(set(index), {"WA_PT053", "WA_PT148"})
+        self.assertEqual(index["WA_PT148"][0]["forecast"]["precis"], "Cloudy.")
+        self.assertEqual(issue_time, "2025-01-01T04:50:00Z")
+
+    async def test_fresh_product_is_served_from_memory(self):
+        first = await bom.fetch_bom_forecast_xml()
+        second = await bom.fetch_bom_forecast_xml()
+        self.assertEqual(first, FORECAST_XML)
+        self.assertIs(first, second)
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_stale_product_is_revalidated_with_etag(self):
+        forecasts = await bom.get_forecast_for_station("WA_PT148")
+        bom._forecast_cache.checked_at -= settings.BOM_FORECAST_TTL_SECONDS + 1
+        again = await bom.get_forecast_for_station("WA_PT148")
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.requests[1].headers["If-None-Match"], '"v1"')
+        self.assertIs(forecasts, again)
+
+
+class TestObservationCache(unittest.IsolatedAsyncioTestCase):
+    station = {"url": "http://www.bom.gov.au/fwo/IDW60901/IDW60901.94608.json"}
+
+    async def asyncSetUp(self):
+        self.requests = 0
+
+        def handler(request):
+            self.requests += 1
+            latest = datetime.now(timezone.utc).astimezone(
+                bom.ZoneInfo("Australia/Perth")).strftime("%Y%m%d%H%M%S")
+            return httpx.Response(200, json={"observations": {"data": [
+                {"local_date_time_full": latest, "air_temp": 21.4}]}})
+
+        bom._observation_cache.clear()
+        upstream._clients[upstream.BOM] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await upstream.close_clients()
+
+    def test_ttl_follows_latest_observation(self):
+        now = datetime(2025, 1, 1, 2, 10, tzinfo=timezone.utc)  # 10:10 in Perth
+        observations = [{"local_date_time_full": "20250101100000"}]
+        ttl = bom.observation_ttl(self.station, observations, now=now)
+        self.assertEqual(ttl, 20 * 60 + settings.BOM_OBSERVATION_GRACE_SECONDS)
+
+    def test_ttl_for_late_or_missing_observation(self):
+        now = datetime(2025, 1, 1, 5, 0, tzinfo=timezone.utc)
+        late = [{"local_date_time_full": "20250101100000"}]
+        self.assertEqual(bom.observation_ttl(self.station, late, now=now),
+                         settings.BOM_OBSERVATION_MIN_TTL_SECONDS)
+        self.assertEqual(bom.observation_ttl(self.station, [], now=now),
+                         settings.BOM_OBSERVATION_MIN_TTL_SECONDS)
+
+    async def test_observations_fetched_once_per_interval(self):
+        first = await bom.fetch_weather_observation(self.station)
+        second = await bom.fetch_weather_observation(self.station)
+        self.assertEqual(first[0]["air_temp"], 21.4)
+        self.assertIs(first, second)
+        self.assertEqual(self.requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
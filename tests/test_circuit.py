@@ -0,0 +1,123 @@
+import time
+import unittest
+from unittest import mock
+
+import httpx
+
+from src.api.v1.endpoints import forecast
+from src.core import circuit, upstream
+from src.core.circuit import CircuitBreaker, CircuitOpenError
+from src.core.helpers import find_nearest_station
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_probes_after_timeout(self):
+        breaker = CircuitBreaker("bom", failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())   # the probe
+        self.assertFalse(breaker.allow())  # only one probe at a time
+        breaker.record_success()
+        self.assertEqual(breaker.state, circuit.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("bom", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, circuit.OPEN)
+
+
+class TestUpstreamBreaker(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = 0
+
+        def handler(request):
+            self.calls += 1
+            return httpx.Response(403)
+
+        circuit.reset_breakers()
+        self.addCleanup(circuit.reset_breakers)
+        upstream._clients[upstream.BOM] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await upstream.close_clients()
+
+    async def test_fails_fast_once_open(self):
+        threshold = circuit.get_breaker(upstream.BOM).failure_threshold
+        for _ in range(threshold):
+            await upstream.request(upstream.BOM, "GET", "https://bom.test/")
+        with self.assertRaises(CircuitOpenError) as ctx:
+            await upstream.request(upstream.BOM, "GET", "https://bom.test/?key=secret",
+                                   operation="observations")
+        self.assertEqual(str(ctx.exception), "bom circuit open, skipping observations")
+        self.assertEqual(self.calls, threshold)
+
+
+class TestConditionFallback(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        forecast._last_known_conditions.clear()
+        self.request = forecast.WeatherRequest(lat=-31.95, lon=115.86)
+        self.station = find_nearest_station(self.request.lat, self.request.lon)
+        self.bom = mock.AsyncMock(side_effect=CircuitOpenError("bom circuit open"))
+        self.google = mock.AsyncMock(return_value={"precis": "Sunny", "temperature": 20})
+        patcher = mock.patch.dict(forecast.CONDITION_SOURCES, {"bom": self.bom, "google": self.google})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_falls_back_to_google_then_cache(self):
+        condition = await forecast.resolve_condition(self.request, self.station)
+        self.assertEqual(condition["source"], "google")
+
+        self.google.side_effect = Exception("HTTP 503")
+        condition = await forecast.resolve_condition(self.request, self.station)
+        self.assertEqual(condition["source"], "cache")
+        self.assertEqual(condition["cached_source"], "google")
+        self.assertEqual(condition["precis"], "Sunny")
+
+    async def test_bom_condition_survives_one_failed_product(self):
+        observations = [{"air_temp": 24.5, "local_date_time_full": "20250101100000"}]
+        with mock.patch.object(forecast, "get_forecast_for_station",
+                               side_effect=CircuitOpenError("bom circuit open")), \
+                mock.patch.object(forecast, "fetch_weather_observation",
+                                  return_value=observations):
+            condition = await forecast.bom_condition(self.request, self.station)
+        self.assertIsNone(condition["precis"])
+        self.assertEqual(condition["temperature"], 24.5)
+
+    async def test_bom_condition_fails_without_forecast_and_observations(self):
+        with mock.patch.object(forecast, "get_forecast_for_station",
+                               side_effect=CircuitOpenError("bom circuit open")), \
+                mock.patch.object(forecast, "fetch_weather_observation",
+                                  side_effect=Exception("HTTP 503")):
+            with self.assertRaises(Exception) as ctx:
+                await forecast.bom_condition(self.request, self.station)
+        self.assertIn("bom circuit open", str(ctx.exception))
+
+    async def test_google_error_text_does_not_leak_the_api_key(self):
+        request = httpx.Request("GET", "https://weather.test/lookup?key=SECRET")
+        error = httpx.HTTPStatusError(
+            "Client error '403 Forbidden' for url 'https://weather.test/lookup?key=SECRET'",
+            request=request, response=httpx.Response(403, request=request))
+        with mock.patch.object(forecast, "fetch_google_conditions", return_value=error), \
+                mock.patch.dict(forecast.CONDITION_SOURCES,
+                                {"google": forecast.google_condition}):
+            with self.assertRaises(Exception) as ctx:
+                await forecast.resolve_condition(self.request, self.station)
+        self.assertIn("google: Google Weather lookup failed (HTTP 403)", str(ctx.exception))
+        self.assertNotIn("SECRET", str(ctx.exception))
+
+    async def test_all_sources_failing_raises(self):
+        self.google.side_effect = Exception("HTTP 503")
+        with self.assertRaises(Exception) as ctx:
+            await forecast.resolve_condition(self.request, self.station)
+        self.assertIn("bom: bom circuit open", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
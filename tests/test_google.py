@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+
+import httpx
+
+from src.api.v1.endpoints.gweather import WeatherRequest, fetch_batch
+from src.core import google, upstream
+
+
+class TestGoogleCellCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            if request.url.params["location.latitude"] == "0.0":
+                return httpx.Response(500)
+            return httpx.Response(200, json={"temperature": {"degrees": 21.5}})
+
+        google._weather_cache.clear()
+        upstream._clients[upstream.GOOGLE] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+        patcher = mock.patch.multiple(
+            google, api_key="test-key", base_url="https://weather.test/v1/")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await upstream.close_clients()
+
+    async def test_nearby_points_share_a_cell(self):
+        first = await google.fetch_google_conditions((-31.95123, 115.86049))
+        second = await google.fetch_google_conditions((-31.95301, 115.85712))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.requests), 1)
+        params = self.requests[0].url.params
+        self.assertEqual(params["location.latitude"], "-31.95")
+        self.assertEqual(params["location.longitude"], "115.86")
+
+    async def test_endpoints_are_cached_separately(self):
+        await google.fetch_google_conditions((-31.95, 115.86))
+        await google.fetch_google_daily_forecast((-31.95, 115.86))
+        await google.fetch_google_daily_forecast((-31.95, 115.86))
+
+        paths = [r.url.path for r in self.requests]
+        self.assertEqual(paths, ["/v1/currentConditions:lookup", "/v1/forecast/days:lookup"])
+
+    async def test_errors_are_not_cached(self):
+        for _ in range(2):
+            result = await google.fetch_google_conditions((0.0, 0.0))
+            self.assertIsInstance(result, Exception)
+        self.assertEqual(len(self.requests), 2)
+
+    def test_history_ttl_ends_at_next_hour(self):
+        self.assertEqual(google.seconds_until_next_hour(7200 + 600), 3000)
+        self.assertEqual(google.seconds_until_next_hour(7200), 3600)
+
+    async def test_batch_dedupes_cells_and_keeps_order(self):
+        points = [WeatherRequest(lat=lat, lon=lon) for lat, lon in [
+            (-31.951, 115.861), (0.0, 0.0), (-31.952, 115.859), (-32.05, 115.75)]]
+
+        results = await fetch_batch(points, "daily")
+
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual([r["code"] for r in results], [0, 1, 0, 0])
+        self.assertEqual([r["lat"] for r in results], [p.lat for p in points])
+        self.assertEqual(results[0]["data"], {"temperature": {"degrees": 21.5}})
+        # The upstream error text contains the URL and with it the API key
+        self.assertEqual(results[1]["message"], "Google Weather lookup failed (HTTP 500)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from src.core import helpers
@@ -34,6 +35,46 @@ class TestHelpers(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result["station_id"], station["station_id"])
 
+    def test_station_index_matches_haversine(self):
+        index = helpers.get_station_index()
+        lat, lon = -32.05, 115.75
+        distances = index.distances(lat, lon)
+        for station, distance in zip(index.stations, distances):
+            self.assertAlmostEqual(
+                distance,
+                helpers.calculate_distance(lat, lon, station["lat"], station["lon"]),
+                places=6,
+            )
+
+    def test_station_tree_matches_brute_force(self):
+        rng = random.Random(7)
+        stations = [{"station_id": str(i), "lat": rng.uniform(-60, 60),
+                     "lon": rng.choice([rng.uniform(170, 180), rng.uniform(-180, 180)])}
+                    for i in range(2000)]
+        index = helpers.StationIndex(stations)
+        for _ in range(200):
+            lat, lon = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            distances = index.distances(lat, lon)
+            expected = sorted(range(len(stations)), key=lambda i: distances[i])[:4]
+            found = index.k_nearest(lat, lon, 4)
+            self.assertEqual([s["station_id"] for s, _ in found],
+                             [stations[i]["station_id"] for i in expected])
+            self.assertAlmostEqual(index.nearest(lat, lon)[1], distances[expected[0]], places=6)
+
+    def test_find_nearest_stations_sorted(self):
+        stations = helpers.find_nearest_stations(-31.95, 115.86, k=3)
+        self.assertEqual(len(stations), min(3, len(helpers.get_station_index())))
+        distances = [s["distance_km"] for s in stations]
+        self.assertEqual(distances, sorted(distances))
+        self.assertEqual(
+            stations[0]["station_id"],
+            helpers.find_nearest_station(-31.95, 115.86)["station_id"],
+        )
+
+    def test_snap_to_grid(self):
+        self.assertEqual(helpers.snap_to_grid(-31.95123, 115.86649, 0.01), (-31.95, 115.87))
+        self.assertEqual(helpers.snap_to_grid(-31.95123, 115.86649, 0), (-31.95123, 115.86649))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest import mock
+
+import httpx
+
+from src.api.v1.endpoints.weather import fetch_historical_data, parse_history_csv
+from src.core import history_store, upstream
+from src.core.config import settings
+
+HISTORY_CSV = (
+    b'"Daily Weather Observations for Perth Airport, Western Australia for January 2025"\n'
+    b'"Prepared at 13:00 UTC on 2 Feb 2025"\n'
+    b'\n'
+    b',"Date","Minimum temperature (\xb0C)","Maximum temperature (\xb0C)","Rainfall (mm)"\n'
+    b',2025-01-01,18.2,33.1,0\n'
+    b',2025-01-02,19.0,35.4,\n'
+)
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(settings, "HISTORY_CACHE_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_parse_history_csv_finds_header(self):
+        df = parse_history_csv(HISTORY_CSV)
+        self.assertEqual(len(df), 2)
+        self.assertIn("Rainfall (mm)", df.columns)
+        self.assertEqual(str(df["Date"].iloc[0].date()), "2025-01-01")
+
+    def test_is_settled_month(self):
+        self.assertTrue(history_store.is_settled_month("202412", date(2025, 1, 3)))
+        self.assertFalse(history_store.is_settled_month("202412", date(2025, 1, 1)))
+        self.assertFalse(history_store.is_settled_month("202501", date(2025, 1, 20)))
+
+    def test_settled_month_round_trip(self):
+        df = parse_history_csv(HISTORY_CSV)
+        history_store.save_month("IDCJDW6111", "202401", df)
+        self.assertTrue(os.path.exists(
+            os.path.join(self.tmp.name, "IDCJDW6111", "202401.arrow")))
+        loaded = history_store.load_month("IDCJDW6111", "202401")
+        self.assertEqual(list(loaded.columns), list(df.columns))
+        self.assertEqual(loaded["Maximum temperature (C)"].tolist(), [33.1, 35.4])
+
+    def test_missing_month_is_not_cached(self):
+        self.assertIsNone(history_store.load_month("IDCJDW6111", "199001"))
+
+    def test_product_key(self):
+        station = {"station_id": "94610",
+                   "history_url_template": "https://www.bom.gov.au/climate/dwo/YYYYMM/text/IDCJDW6111.YYYYMM.csv"}
+        self.assertEqual(history_store.product_key(station), "IDCJDW6111")
+
+
+class TestFetchHistoricalData(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(settings, "HISTORY_CACHE_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.requested = []
+
+        def handler(request):
+            self.requested.append(request.url.path)
+            if "202501" in request.url.path:
+                return httpx.Response(200, content=HISTORY_CSV)
+            return httpx.Response(404)
+
+        upstream._clients[upstream.BOM] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+        self.station = {"station_id": "94610",
+                        "history_url_template": "https://www.bom.gov.au/climate/dwo/YYYYMM/text/IDCJDW6111.YYYYMM.csv"}
+
+    async def asyncTearDown(self):
+        await upstream.close_clients()
+
+    async def test_failed_months_are_reported(self):
+        records, failed = await fetch_historical_data(
+            self.station, datetime(2024, 12, 1), datetime(2025, 1, 31))
+        self.assertEqual([r["Date"] for r in records],
+                         ["2025-01-01T00:00:00", "2025-01-02T00:00:00"])
+        self.assertNotIn("Rainfall (mm)", records[1])
+        self.assertEqual([f["month"] for f in failed], ["202412"])
+        self.assertIn("404", failed[0]["error"])
+
+    async def test_settled_months_are_served_from_store(self):
+        await fetch_historical_data(
+            self.station, datetime(2025, 1, 1), datetime(2025, 1, 31))
+        records, failed = await fetch_historical_data(
+            self.station, datetime(2025, 1, 1), datetime(2025, 1, 31))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(failed, [])
+        self.assertEqual(len(self.requested), 1)
+
+    async def test_columnar_shape(self):
+        columns, _ = await fetch_historical_data(
+            self.station, datetime(2025, 1, 1), datetime(2025, 1, 31), columnar=True)
+        self.assertEqual(columns["Date"],
+                         ["2025-01-01T00:00:00", "2025-01-02T00:00:00"])
+        self.assertEqual(columns["Rainfall (mm)"], [0, None])
+        self.assertNotIn("Unnamed: 0", columns)
+
+    async def test_field_projection(self):
+        records, _ = await fetch_historical_data(
+            self.station, datetime(2025, 1, 2), datetime(2025, 1, 31),
+            fields=["Rainfall (mm)", "Unknown"])
+        self.assertEqual(records, [{"Date": "2025-01-02T00:00:00"}])
+        columns, _ = await fetch_historical_data(
+            self.station, datetime(2025, 1, 1), datetime(2025, 1, 31), columnar=True,
+            fields=["Rainfall (mm)"])
+        self.assertEqual(sorted(columns), ["Date", "Rainfall (mm)"])
+
+
+if __name__ == "__main__":
+    unittest.main()
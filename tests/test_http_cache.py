@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.api.v1.endpoints import warnings
+from src.core.auth import verify_token
+from src.core.bom_warnings import WarningsSnapshot
+from src.core.http_cache import etag_matches
+
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = WarningsSnapshot(3, [], "https://bom.test/feed.xml", "2025-01-01T00:00:00Z")
+
+        async def fake_snapshot():
+            return self.snapshot
+
+        patcher = mock.patch.object(warnings, "get_warnings_snapshot", side_effect=fake_snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        app = create_app()
+        app.dependency_overrides[verify_token] = lambda: "token"
+        self.client = TestClient(app)
+
+    def test_etag_and_not_modified(self):
+        first = self.client.get("/api/v1/warnings/all")
+        etag = first.headers["ETag"]
+        self.assertIn("stale-while-revalidate", first.headers["Cache-Control"])
+        # The route needs a token, so shared caches must not store it
+        self.assertTrue(first.headers["Cache-Control"].startswith("private,"))
+
+        repeat = self.client.get("/api/v1/warnings/all", headers={"If-None-Match": etag})
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat.content, b"")
+        self.assertEqual(repeat.headers["ETag"], etag)
+
+        # A different query is a different representation
+        other = self.client.get("/api/v1/warnings/all?fetch_details=false",
+                                headers={"If-None-Match": etag})
+        self.assertEqual(other.status_code, 200)
+
+    def test_new_data_version_changes_etag(self):
+        etag = self.client.get("/api/v1/warnings/all").headers["ETag"]
+        self.snapshot = WarningsSnapshot(4, [], "https://bom.test/feed.xml", "2025-01-01T00:02:00Z")
+
+        response = self.client.get("/api/v1/warnings/all", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_errors_are_not_cached(self):
+        with mock.patch.object(warnings, "get_warnings_snapshot", side_effect=Exception("down")):
+            response = self.client.get("/api/v1/warnings/all")
+        self.assertEqual(response.json()["code"], 1)
+        self.assertNotIn("ETag", response.headers)
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a", W/"b"', '"b"'))
+        self.assertTrue(etag_matches("*", '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from src.api.v1.endpoints import location
+from src.core.config import settings
+
+
+class TestLocationSummary(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def slow(request, station):
+            await asyncio.sleep(1)
+
+        async def broken(request, station):
+            raise Exception("google circuit open")
+
+        patchers = [
+            mock.patch.object(location, "_condition", return_value={"precis": "Fine"}),
+            mock.patch.object(location, "_forecast", return_value=[]),
+            mock.patch.object(location, "_warnings", return_value={"total": 0}),
+            mock.patch.object(location, "_risk", side_effect=slow),
+            mock.patch.object(location, "_google", side_effect=broken),
+            mock.patch.object(settings, "LOCATION_SUMMARY_TIMEOUT_SECONDS", 0.05),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_sections_fail_independently(self):
+        request = location.LocationSummaryRequest(lat=-31.95, lon=115.86)
+
+        result = await location.get_location_summary(request, token="t")
+
+        data = result["data"]
+        self.assertEqual(result["code"], 0)
+        self.assertEqual(data["condition"], {"precis": "Fine"})
+        self.assertIsNone(data["risk"])
+        self.assertIsNone(data["google"])
+        self.assertEqual(set(data["errors"]), {"risk", "google"})
+        self.assertIn("Timed out", data["errors"]["risk"])
+        self.assertEqual(data["errors"]["google"], "upstream error")
+        self.assertIsNotNone(data["nearest_station"]["station_id"])
+
+    async def test_include_limits_sections(self):
+        request = location.LocationSummaryRequest(lat=-31.95, lon=115.86, include=["condition"])
+
+        data = (await location.get_location_summary(request, token="t"))["data"]
+
+        self.assertNotIn("risk", data)
+        self.assertEqual(data["errors"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+
+import httpx
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.core import metrics, upstream
+from src.core.auth import verify_token
+from src.core.cache import TTLCache
+from src.core.circuit import reset_breakers
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset_metrics()
+
+    def test_counter_and_gauge_render(self):
+        requests = metrics.Counter("test_requests_total", "Test requests.", ("kind",))
+        requests.inc("a")
+        requests.inc("a", amount=2)
+        requests.inc('b"c')
+        lines = requests.collect()
+        self.assertEqual(lines[1], "# TYPE test_requests_total counter")
+        self.assertIn('test_requests_total{kind="a"} 3', lines)
+        self.assertIn('test_requests_total{kind="b\\"c"} 1', lines)
+
+        depth = metrics.Gauge("test_depth", "Test depth.")
+        depth.inc()
+        depth.inc()
+        depth.dec()
+        self.assertIn("test_depth 1", depth.collect())
+
+    def test_histogram_buckets_are_cumulative(self):
+        latency = metrics.Histogram("test_seconds", "Test latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+        lines = latency.collect()
+        self.assertIn('test_seconds_bucket{le="0.1"} 2', lines)
+        self.assertIn('test_seconds_bucket{le="1"} 3', lines)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("test_seconds_count 4", lines)
+        self.assertIn("test_seconds_sum 3.65", lines)
+
+    def test_label_count_is_checked(self):
+        with self.assertRaises(Exception):
+            metrics.CACHE_HITS.inc()
+
+    def test_cache_activity(self):
+        cache = TTLCache("test_cache", max_entries=1)
+        cache.get("a")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.set("b", 2)
+        self.assertEqual(metrics.CACHE_HITS.labels("test_cache").value, 1)
+        self.assertEqual(metrics.CACHE_MISSES.labels("test_cache").value, 1)
+        self.assertEqual(metrics.CACHE_EVICTIONS.labels("test_cache").value, 1)
+
+
+class TestUpstreamMetrics(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        metrics.reset_metrics()
+        reset_breakers()
+
+        def handler(request):
+            if request.url.path == "/down":
+                return httpx.Response(503)
+            return httpx.Response(200, json={})
+
+        upstream._clients[upstream.BOM] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await upstream.close_clients()
+        reset_breakers()
+
+    async def test_calls_are_labelled_by_operation(self):
+        await upstream.request(upstream.BOM, "GET", "https://bom.test/ok", operation="observations")
+        await upstream.request(upstream.BOM, "GET", "https://bom.test/down", operation="forecast_xml")
+
+        self.assertEqual(metrics.UPSTREAM_REQUESTS.labels("bom", "observations", "200").value, 1)
+        self.assertEqual(metrics.UPSTREAM_ERRORS.labels("bom", "forecast_xml", "http_status").value, 1)
+        self.assertEqual(metrics.UPSTREAM_REQUEST_DURATION.labels("bom", "observations").count, 1)
+        self.assertEqual(metrics.UPSTREAM_IN_FLIGHT.labels("bom").value, 0)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def setUp(self):
+        metrics.reset_metrics()
+        app = create_app()
+        app.dependency_overrides[verify_token] = lambda: "token"
+        self.client = TestClient(app)
+
+    def test_scrape(self):
+        self.client.get("/api/v1/health")
+        self.client.get("/no/such/path")
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        body = response.text
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/api/v1/health",status="200"} 1',
+                      body)
+        self.assertIn('route="unmatched",status="404"', body)
+        self.assertIn("# TYPE upstream_requests_total counter", body)
+
+
+if __name__ == "__main__":
+    unittest.main()
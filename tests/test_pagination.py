@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.api.v1.endpoints import warnings
+from src.core.auth import verify_token
+from src.core.bom_warnings import WarningsSnapshot
+from src.core.config import settings
+from src.core.pagination import decode_cursor, encode_cursor, parse_fields, project
+
+
+class TestPagination(unittest.TestCase):
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor({"v": 3, "o": 10})
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor), {"v": 3, "o": 10})
+
+    def test_invalid_cursor(self):
+        with self.assertRaisesRegex(Exception, "Invalid cursor"):
+            decode_cursor("not a cursor")
+        with self.assertRaisesRegex(Exception, "Invalid cursor"):
+            decode_cursor(encode_cursor([1, 2]))
+
+    def test_parse_fields(self):
+        self.assertIsNone(parse_fields(None))
+        self.assertIsNone(parse_fields(" , "))
+        self.assertEqual(parse_fields("title, link,title"), ["title", "link"])
+        self.assertEqual(parse_fields(["title", "pub_date,link"]), ["title", "pub_date", "link"])
+
+    def test_project(self):
+        item = {"title": "Flood Watch", "link": "x", "details": {}}
+        self.assertIs(project(item, None), item)
+        self.assertEqual(project(item, ["link", "missing"]), {"link": "x"})
+
+
+class TestWarningsPaging(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = WarningsSnapshot(
+            7, [{"title": f"Warning {i}", "link": f"https://bom.test/{i}", "details": {"n": i}}
+                for i in range(5)],
+            "https://bom.test/feed.xml", "2025-01-01T00:00:00Z")
+
+        async def fake_snapshot():
+            return self.snapshot
+
+        patcher = mock.patch.object(warnings, "get_warnings_snapshot", side_effect=fake_snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        app = create_app()
+        app.dependency_overrides[verify_token] = lambda: "token"
+        self.client = TestClient(app)
+
+    def test_pages_and_projection(self):
+        titles = []
+        cursor = None
+        while True:
+            params = {"limit": 2, "fields": "title"}
+            if cursor:
+                params["cursor"] = cursor
+            data = self.client.get("/api/v1/warnings/all", params=params).json()["data"]
+            self.assertEqual(data["total_warnings"], 5)
+            self.assertTrue(all(list(w) == ["title"] for w in data["warnings"]))
+            titles += [w["title"] for w in data["warnings"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(titles, [f"Warning {i}" for i in range(5)])
+        self.assertFalse(data["feed_info"]["details_fetched"])
+
+    def test_limit_is_capped(self):
+        with mock.patch.object(settings, "WARNINGS_MAX_PAGE_SIZE", 3):
+            data = self.client.get("/api/v1/warnings/all?limit=50").json()["data"]
+        self.assertEqual(len(data["warnings"]), 3)
+        self.assertIsNotNone(data["next_cursor"])
+
+    def test_cursor_from_old_snapshot_is_rejected(self):
+        cursor = self.client.get("/api/v1/warnings/all?limit=2").json()["data"]["next_cursor"]
+        self.snapshot = WarningsSnapshot(8, self.snapshot.warnings, self.snapshot.url,
+                                         self.snapshot.fetched_at)
+        response = self.client.get("/api/v1/warnings/all", params={"limit": 2, "cursor": cursor})
+        self.assertEqual(response.json()["code"], 1)
+        self.assertIn("first page", response.json()["message"])
+
+
+if __name__ == "__main__":
+    unittest.main()
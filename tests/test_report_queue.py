@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.api.v1.endpoints import report
+from src.core import report_queue
+from src.core.report_queue import FAILED, PENDING, SENT, ReportQueue
+
+REPORT = {
+    "issue_type": "flooding",
+    "description": "Water over the road",
+    "location": {"lat": -31.95, "lon": 115.86},
+    "user": {"uid": "u1", "display_name": "Test", "email": "t@example.com"},
+}
+
+
+def http_error(status):
+    request = httpx.Request("POST", "https://dt.test/report")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(status, request=request))
+
+
+class TestReportQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.queue = ReportQueue(":memory:")
+        self.addCleanup(self.queue.close)
+
+    def test_enqueue_is_idempotent(self):
+        first, created = self.queue.enqueue(REPORT, "key-1")
+        again, created_again = self.queue.enqueue({"other": True}, "key-1")
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(first["report_id"], again["report_id"])
+        self.assertEqual(self.queue.stats()["depth"], 1)
+
+    async def test_concurrent_calls_from_executor_threads(self):
+        reports = await asyncio.gather(*(
+            report_queue.run_queue(self.queue.enqueue, REPORT, f"key-{i}") for i in range(20)))
+        self.assertTrue(all(created for _, created in reports))
+        stats = await report_queue.run_queue(self.queue.stats)
+        self.assertEqual(stats["depth"], 20)
+
+    async def test_flush_sends_retries_and_gives_up(self):
+        self.queue.enqueue(REPORT, "ok")
+        self.queue.enqueue(REPORT, "down")
+        self.queue.enqueue(REPORT, "bad")
+        outcomes = {"ok": {"id": 42}, "down": http_error(503), "bad": http_error(422)}
+
+        async def fake_post(payload, idempotency_key=None):
+            return outcomes[idempotency_key]
+
+        with mock.patch.object(report_queue, "post_user_report", side_effect=fake_post):
+            summary = await report_queue.flush_reports(self.queue)
+
+        self.assertEqual(summary, {"sent": 1, "retried": 1, "failed": 1})
+        self.assertEqual(self.queue.get("ok")["status"], SENT)
+        self.assertEqual(self.queue.get("ok")["response"], {"id": 42})
+        self.assertEqual(self.queue.get("down")["status"], PENDING)
+        self.assertEqual(self.queue.get("bad")["status"], FAILED)
+        # The retry is scheduled with backoff, so nothing is due yet
+        self.assertEqual(self.queue.claim_due(10), [])
+        stats = self.queue.stats()
+        self.assertEqual((stats["depth"], stats["sent"], stats["failed"]), (1, 1, 1))
+        self.assertGreater(stats["lag_seconds"], 0)
+
+
+class TestReportEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.queue = ReportQueue(":memory:")
+        self.addCleanup(self.queue.close)
+        patcher = mock.patch.object(report, "get_report_queue", return_value=self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(create_app())
+
+    def test_report_accepted_and_queued(self):
+        headers = {"Idempotency-Key": "abc"}
+        response = self.client.post("/api/v1/report", json=REPORT, headers=headers)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["data"]["status"], PENDING)
+
+        repeat = self.client.post("/api/v1/report", json=REPORT, headers=headers)
+        self.assertEqual(repeat.json()["message"], "Already accepted")
+
+        status = self.client.get("/api/v1/report/abc").json()
+        self.assertEqual(status["data"]["idempotency_key"], "abc")
+        stats = self.client.get("/api/v1/report/queue").json()
+        self.assertEqual(stats["data"]["depth"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.api.v1.endpoints import warnings
+from src.core import compression
+from src.core.auth import verify_token
+from src.core.bom_warnings import WarningsSnapshot
+from src.core.responses import ORJSONResponse
+
+
+class TestORJSONResponse(unittest.TestCase):
+    def test_renders_numpy_and_pandas_values(self):
+        body = ORJSONResponse({
+            "int": np.int64(3),
+            "float": np.float32(1.5),
+            "nan": np.nan,
+            "array": np.array([1.0, np.nan]),
+            "when": pd.Timestamp("2025-01-01T09:00:00"),
+            "missing": pd.NaT,
+        }).body
+        self.assertEqual(orjson.loads(body), {
+            "int": 3, "float": 1.5, "nan": None, "array": [1.0, None],
+            "when": "2025-01-01T09:00:00", "missing": None,
+        })
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        details = "Heavy rainfall may lead to flash flooding. " * 100
+        snapshot = WarningsSnapshot(
+            1, [{"title": "Flood Watch", "details": details}], "https://bom.test/feed.xml", "now")
+
+        async def fake_snapshot():
+            return snapshot
+
+        patcher = mock.patch.object(warnings, "get_warnings_snapshot", side_effect=fake_snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        app = create_app()
+        app.dependency_overrides[verify_token] = lambda: "token"
+        self.client = TestClient(app)
+
+    def test_choose_encoding(self):
+        self.assertEqual(compression.choose_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(compression.choose_encoding("gzip;q=0, identity"))
+        self.assertIsNone(compression.choose_encoding(None))
+        with mock.patch.object(compression, "brotli", object()):
+            self.assertEqual(compression.choose_encoding("gzip, br"), "br")
+            self.assertEqual(compression.choose_encoding("gzip, br;q=0.1"), "gzip")
+
+    def test_large_response_is_gzipped_and_revalidates(self):
+        response = self.client.get(
+            "/api/v1/warnings/all", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(response.json()["data"]["total_warnings"], 1)
+        etag = response.headers["ETag"]
+        self.assertTrue(etag.endswith('-gzip"'))
+
+        repeat = self.client.get("/api/v1/warnings/all", headers={
+            "Accept-Encoding": "gzip", "If-None-Match": etag})
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat.headers["ETag"], etag)
+
+    def test_small_response_is_not_compressed(self):
+        response = self.client.get("/api/v1/health", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from src.api.v1.endpoints import risk
+from src.core.ratelimit import RateLimiter
+
+
+class TestAreaRisk(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = []
+
+        async def fake_risk(lat, lon, rainfall_event_id=None):
+            self.calls.append((lat, lon))
+            if lat > -31.9:
+                return Exception("HTTP 503")
+            return {"risk_score": round(-lat - 31.9, 4)}
+
+        patcher = mock.patch.object(risk, "fetch_digital_twin_risk", side_effect=fake_risk)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_polyline_aggregates_segments_and_hotspots(self):
+        request = risk.RiskRequest(mode="polyline", spacing_km=5, path=[
+            {"lat": -32.0, "lon": 115.8}, {"lat": -31.95, "lon": 115.8},
+            {"lat": -31.85, "lon": 115.8}])
+
+        result = await risk.get_risk(request)
+
+        data = result["data"]
+        self.assertEqual(result["code"], 0)
+        # The shared vertex is only queried once
+        self.assertEqual(data["unique_cells"], len(self.calls))
+        self.assertLess(data["unique_cells"], data["samples"])
+        self.assertEqual(data["max_risk"], {"lat": -32.0, "lon": 115.8, "score": 0.1})
+        self.assertEqual([s["max_score"] for s in data["segments"]], [0.1, 0.05])
+        self.assertGreater(data["failed"], 0)
+        self.assertEqual(data["hotspots"][0]["score"], 0.1)
+
+    async def test_sample_limit(self):
+        request = risk.RiskRequest(mode="bbox", spacing_km=0.01, bbox={
+            "min_lat": -32.0, "min_lon": 115.8, "max_lat": -31.9, "max_lon": 115.9})
+
+        result = await risk.get_risk(request)
+
+        self.assertEqual(result["code"], 1)
+        self.assertIn("increase spacing_km", result["message"])
+        self.assertEqual(self.calls, [])
+
+    async def test_huge_bbox_is_rejected_before_sampling(self):
+        # Most of Western Australia at the default spacing: billions of samples
+        request = risk.RiskRequest(mode="bbox", bbox={
+            "min_lat": -35.0, "min_lon": 113.0, "max_lat": -14.0, "max_lon": 129.0})
+
+        with mock.patch.object(risk, "sample_bbox") as sample_bbox:
+            result = await risk.get_risk(request)
+
+        self.assertEqual(result["code"], 1)
+        self.assertIn("increase spacing_km", result["message"])
+        sample_bbox.assert_not_called()
+        self.assertEqual(self.calls, [])
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_spaces_calls_after_burst(self):
+        limiter = RateLimiter(rate=50, burst=2)
+        start = time.monotonic()
+        await asyncio.gather(*[limiter.acquire() for _ in range(5)])
+        # Two immediate tokens, then three more at 20 ms each
+        self.assertGreaterEqual(time.monotonic() - start, 0.055)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+
+from src.core import digitaltwin, upstream
+from src.core.risk_cache import RiskCache, is_cacheable_event
+
+
+class TestRiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "risk.sqlite3")
+
+    def open(self, **kwargs):
+        cache = RiskCache(self.path, kwargs.get("max_entries", 10),
+                          kwargs.get("max_bytes", 10_000))
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_persists_across_restarts(self):
+        cache = self.open()
+        cache.set("a", {"risk": "high"})
+        cache.close()
+        self.assertEqual(self.open().get("a"), {"risk": "high"})
+
+    def test_evicts_least_recently_used_by_count(self):
+        cache = self.open(max_entries=2)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+        cache.get("a")
+        cache.set("c", {"v": 3})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"v": 1})
+        self.assertEqual(len(cache), 2)
+
+    def test_evicts_by_bytes(self):
+        cache = self.open(max_bytes=50)
+        cache.set("a", {"v": "x" * 20})
+        cache.set("b", {"v": "y" * 20})
+        self.assertIsNone(cache.get("a"))
+        self.assertLessEqual(cache.total_bytes(), 50)
+
+    def test_totals_track_replacements_and_reopen(self):
+        cache = self.open()
+        cache.set("a", {"v": "x" * 10})
+        cache.set("a", {"v": "x"})
+        cache.set("b", {"v": 2})
+        self.assertEqual((len(cache), cache.total_bytes()), (2, 9 + 7))
+        cache.close()
+        reopened = self.open()
+        self.assertEqual((len(reopened), reopened.total_bytes()), (2, 16))
+
+    def test_batched_last_used_survives_restart(self):
+        cache = self.open(max_entries=2)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+        cache.get("a")
+        cache.close()
+        cache = self.open(max_entries=2)
+        cache.set("c", {"v": 3})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"v": 1})
+
+    def test_new_model_version_clears_cache(self):
+        cache = self.open()
+        self.assertFalse(cache.observe_model_version("1"))
+        cache.set("a", {"v": 1})
+        self.assertFalse(cache.observe_model_version("1"))
+        self.assertTrue(cache.observe_model_version("2"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(self.open().model_version, "2")
+
+    def test_only_design_events_are_cacheable(self):
+        self.assertTrue(is_cacheable_event(None))
+        self.assertTrue(is_cacheable_event("design_10yr"))
+        self.assertFalse(is_cacheable_event("observed_2025_07_01"))
+
+
+class TestFetchRiskCached(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            return httpx.Response(200, json={"risk": "low", "model_version": "v1"})
+
+        upstream._clients[upstream.DIGITAL_TWIN] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+        self.cache = RiskCache(":memory:", 10, 10_000)
+        patchers = [
+            mock.patch.object(digitaltwin, "get_risk_cache", return_value=self.cache),
+            mock.patch.object(digitaltwin, "dt_base_url", "https://dt.test/"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await upstream.close_clients()
+        self.cache.close()
+
+    async def test_design_event_served_from_cache(self):
+        first = await digitaltwin.fetch_digital_twin_risk(-31.84612, 115.898611, "design_2yr")
+        second = await digitaltwin.fetch_digital_twin_risk(-31.84608, 115.898609, "design_2yr")
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.requests), 1)
+        self.assertIn(b'"lat": -31.8461', self.requests[0].content)
+
+    async def test_other_events_always_fetched(self):
+        for _ in range(2):
+            await digitaltwin.fetch_digital_twin_risk(-31.8, 115.9, "observed_2025_07_01")
+        self.assertEqual(len(self.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+
+from src.core.singleflight import SingleFlight, make_key
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_callers_share_one_call(self):
+        group = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"value": 1}
+
+        key = make_key("GET", "https://example.test/a")
+        results = await asyncio.gather(*[group.do(key, fetch) for _ in range(5)])
+
+        self.assertEqual(calls, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(len(group), 0)
+
+    async def test_exception_reaches_every_caller(self):
+        group = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise Exception("HTTP 500")
+
+        results = await asyncio.gather(
+            *[group.do("k", fail) for _ in range(3)], return_exceptions=True)
+
+        self.assertTrue(all(str(r) == "HTTP 500" for r in results))
+
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        group = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        first = asyncio.ensure_future(group.do("k", fetch))
+        second = asyncio.ensure_future(group.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, "ok")
+
+    def test_make_key_ignores_param_and_body_order(self):
+        self.assertEqual(
+            make_key("get", "u", {"a": 1, "b": 2}, {"x": 1, "y": 2}),
+            make_key("GET", "u", {"b": 2, "a": 1}, {"y": 2, "x": 1}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import random
+import unittest
+
+from src.api.v1.endpoints.warnings import filter_warnings_by_location
+from src.core import spatial
+from src.core.bom_warnings import get_warning_area_index, locate_warnings
+
+
+class TestRTree(unittest.TestCase):
+    def test_query_matches_linear_scan(self):
+        rng = random.Random(7)
+        entries = []
+        for i in range(500):
+            x, y = rng.uniform(110, 130), rng.uniform(-36, -13)
+            entries.append(((x, y, x + rng.uniform(0, 2), y + rng.uniform(0, 2)), i))
+        tree = spatial.RTree(entries)
+        self.assertEqual(len(tree), 500)
+        query = (115.0, -33.0, 117.0, -31.0)
+        expected = {i for box, i in entries if spatial._overlaps(box, query)}
+        self.assertEqual(set(tree.query(query)), expected)
+
+    def test_empty_tree(self):
+        self.assertEqual(spatial.RTree([]).query((0, 0, 1, 1)), [])
+
+
+class TestPolygonCircle(unittest.TestCase):
+    square = [[(115.0, -32.0), (116.0, -32.0), (116.0, -31.0), (115.0, -31.0), (115.0, -32.0)]]
+
+    def test_centre_inside(self):
+        self.assertTrue(spatial.polygon_intersects_circle(self.square, -31.5, 115.5, 1))
+
+    def test_edge_within_radius(self):
+        # About 55 km east of the square's eastern edge
+        self.assertTrue(spatial.polygon_intersects_circle(self.square, -31.5, 116.58, 60))
+        self.assertFalse(spatial.polygon_intersects_circle(self.square, -31.5, 116.58, 40))
+
+
+class TestSampling(unittest.TestCase):
+    def test_sample_bbox_covers_corners(self):
+        samples = spatial.sample_bbox((115.80, -32.00, 115.82, -31.98), 1.0)
+        self.assertEqual(len(samples), 12)  # 2.2 km x 1.9 km -> 4 x 3
+        self.assertIn((-32.00, 115.80), samples)
+        self.assertIn((-31.98, 115.82), samples)
+        self.assertEqual(spatial.count_bbox_samples((115.80, -32.00, 115.82, -31.98), 1.0), 12)
+
+    def test_sample_polyline_by_segment(self):
+        # ~2.2 km north, then ~0.95 km east
+        path = [(-32.00, 115.80), (-31.98, 115.80), (-31.98, 115.81)]
+        samples = spatial.sample_polyline(path, 1.0)
+        self.assertEqual([s[0] for s in samples], [0, 0, 0, 0, 1, 1])
+        self.assertEqual(samples[0][1:], path[0])
+        self.assertEqual(samples[-1][1:], path[-1])
+        self.assertEqual(spatial.count_polyline_samples(path, 1.0), len(samples))
+
+
+class TestWarningLocation(unittest.TestCase):
+    def setUp(self):
+        self.warnings = [
+            {"title": "Severe Weather Warning for Lower West forecast district", "description": ""},
+            {"title": "Fire Weather Warning for Kimberley forecast district", "description": ""},
+            {"title": "Marine Wind Warning Summary", "description": ""},
+        ]
+        locate_warnings(self.warnings)
+
+    def test_areas_attached_at_ingest(self):
+        self.assertEqual(self.warnings[0]["areas"], ["Lower West"])
+        self.assertEqual(self.warnings[2]["areas"], [])
+        self.assertIn("Lower West", get_warning_area_index().areas_near(-31.95, 115.86, 20))
+
+    def test_filter_keeps_only_nearby_and_unlocated(self):
+        filtered = filter_warnings_by_location(self.warnings, -31.95, 115.86, 50)
+        titles = [w["title"] for w in filtered]
+        self.assertEqual(len(filtered), 2)
+        self.assertNotIn(self.warnings[1]["title"], titles)
+        self.assertEqual(filtered[0]["matched_areas"], ["Lower West"])
+
+
+if __name__ == "__main__":
+    unittest.main()
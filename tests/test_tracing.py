@@ -0,0 +1,97 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.api.v1.endpoints import warnings
+from src.core import tracing
+from src.core.auth import verify_token
+from src.core.bom_warnings import WarningsSnapshot
+from src.core.config import settings
+
+
+class TestSpans(unittest.TestCase):
+    def test_span_outside_request_is_a_no_op(self):
+        with tracing.span("bom.forecast_xml"):
+            pass
+        self.assertIsNone(tracing._current_trace.get())
+
+    def test_nested_spans_and_server_timing(self):
+        trace = tracing.Trace()
+        token = tracing._current_trace.set(trace)
+        try:
+            with tracing.span("condition.bom"):
+                with tracing.span("google.history/hours"):
+                    pass
+                with tracing.span("google.history/hours"):
+                    pass
+        finally:
+            tracing._current_trace.reset(token)
+
+        self.assertEqual([s.parent for s in trace.spans],
+                         [None, "condition.bom", "condition.bom"])
+        header = tracing.server_timing(trace, 0.25)
+        entries = [entry.split(";")[0] for entry in header.split(", ")]
+        self.assertEqual(entries, ["condition.bom", "google.history_hours", "total"])
+        self.assertIn('desc="2x"', header)
+        self.assertTrue(header.endswith("total;dur=250.0"))
+
+
+class TestTracingMiddleware(unittest.TestCase):
+    def setUp(self):
+        snapshot = WarningsSnapshot(1, [{"title": "Flood Watch"}], "https://bom.test/feed.xml",
+                                    "2025-01-01T00:00:00Z")
+
+        async def fake_snapshot():
+            return snapshot
+
+        patcher = mock.patch.object(warnings, "get_warnings_snapshot", side_effect=fake_snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        app = create_app()
+        app.dependency_overrides[verify_token] = lambda: "token"
+        self.client = TestClient(app)
+
+    def test_server_timing_header(self):
+        with mock.patch.object(settings, "SERVER_TIMING_ENABLED", True):
+            response = self.client.get("/api/v1/warnings/all")
+        timing = response.headers["Server-Timing"]
+        self.assertIn("serialize;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+    def test_server_timing_off_by_default(self):
+        response = self.client.get("/api/v1/warnings/all")
+        self.assertNotIn("Server-Timing", response.headers)
+
+    def test_disabled(self):
+        with mock.patch.object(settings, "TRACING_ENABLED", False), \
+                mock.patch.object(settings, "SERVER_TIMING_ENABLED", True):
+            response = self.client.get("/api/v1/warnings/all")
+        self.assertNotIn("Server-Timing", response.headers)
+
+    def test_export_to_json_lines(self):
+        path = os.path.join(self.tmp.name, "traces", "traces.jsonl")
+        with mock.patch.object(settings, "TRACE_EXPORT_PATH", path), \
+                mock.patch.object(settings, "TRACE_EXPORT_SAMPLE_RATE", 1.0):
+            self.client.get("/api/v1/warnings/all")
+            self.client.get("/api/v1/health")
+            # Records are buffered until the exporter flushes them
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual(asyncio.run(tracing.flush_traces()), 2)
+
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["route"] for r in records], ["/api/v1/warnings/all", "/api/v1/health"])
+        self.assertEqual(records[0]["status"], 200)
+        self.assertIn("serialize", [s["name"] for s in records[0]["spans"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
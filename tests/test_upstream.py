@@ -0,0 +1,40 @@
+import unittest
+
+import httpx
+
+from src.core import upstream
+
+
+class TestUpstreamClients(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await upstream.close_clients()
+
+    async def test_client_is_shared_per_upstream(self):
+        bom = upstream.get_client(upstream.BOM)
+        self.assertIs(bom, upstream.get_client(upstream.BOM))
+        self.assertIsNot(bom, upstream.get_client(upstream.GOOGLE))
+        self.assertIn("Mozilla", bom.headers["User-Agent"])
+
+    async def test_client_recreated_after_close(self):
+        first = upstream.get_client(upstream.DIGITAL_TWIN)
+        await upstream.close_clients()
+        self.assertTrue(first.is_closed)
+        self.assertIsNot(first, upstream.get_client(upstream.DIGITAL_TWIN))
+
+
+class TestDescribeError(unittest.TestCase):
+    def test_httpx_errors_are_described_without_the_url(self):
+        request = httpx.Request("GET", "https://weather.test/lookup?key=SECRET")
+        status = httpx.HTTPStatusError(
+            "Client error '403 Forbidden' for url 'https://weather.test/lookup?key=SECRET'",
+            request=request, response=httpx.Response(403, request=request))
+        self.assertEqual(upstream.describe_error(status), "HTTP 403")
+        self.assertEqual(upstream.describe_error(
+            httpx.ReadTimeout("timed out", request=request)), "timeout")
+        self.assertEqual(upstream.describe_error(
+            httpx.ConnectError("refused", request=request)), "connection error")
+        self.assertEqual(upstream.describe_error(Exception("No data")), "No data")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import feedparser
+import httpx
+
+from src.core import bom_warnings as warnings
+from src.core import upstream
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>WA warnings</title>
+<item>
+  <title>Severe Weather Warning for Lower West forecast district</title>
+  <link>http://www.bom.gov.au/products/IDW21033.shtml</link>
+  <guid>http://www.bom.gov.au/products/IDW21033.shtml</guid>
+  <pubDate>Wed, 01 Jan 2025 10:00:00 GMT</pubDate>
+</item>
+<item>
+  <title>Flood Watch for the Swan River</title>
+  <link>http://www.bom.gov.au/products/IDW39610.shtml</link>
+  <guid>http://www.bom.gov.au/products/IDW39610.shtml</guid>
+  <pubDate>Wed, 01 Jan 2025 11:00:00 GMT</pubDate>
+</item>
+</channel></rss>
+"""
+
+PAGE = b"""<html><body><div class="product">
+<p>SEVERE WEATHER WARNING</p>
+<p>for damaging winds in the Lower West.</p>
+<p>Issued at 10:00 am Wednesday</p>
+</div></body></html>
+"""
+
+
+class TestWarningDetails(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requested = []
+
+        def handler(request):
+            self.requested.append(str(request.url))
+            return httpx.Response(200, content=PAGE)
+
+        warnings._details_cache.clear()
+        upstream._clients[upstream.BOM] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+        self.feed_data = {"feed": feedparser.parse(RSS), "url": None}
+
+    async def asyncTearDown(self):
+        await upstream.close_clients()
+
+    def test_parse_warning_details(self):
+        details = warnings.parse_warning_details(PAGE)
+        self.assertEqual(details["warning_type"], "SEVERE WEATHER WARNING")
+        self.assertEqual(details["severity"], "Severe")
+        self.assertEqual(details["affected_areas"], "damaging winds in the Lower West")
+
+    async def test_details_fetched_for_every_entry(self):
+        parsed = await warnings.parse_warnings_feed(self.feed_data, fetch_details=True)
+        self.assertEqual([w["type"] for w in parsed], ["Severe Weather", "Flood"])
+        self.assertTrue(all("details" in w for w in parsed))
+        self.assertEqual(len(self.requested), 2)
+
+    async def test_unchanged_warnings_are_not_refetched(self):
+        await warnings.parse_warnings_feed(self.feed_data, fetch_details=True)
+        parsed = await warnings.parse_warnings_feed(self.feed_data, fetch_details=True)
+        self.assertEqual(len(self.requested), 2)
+        self.assertEqual(parsed[0]["details"]["severity"], "Severe")
+
+
+class TestWarningsSnapshot(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.feed_requests = []
+        self.feed = RSS
+
+        def handler(request):
+            url = str(request.url)
+            if "/fwo/" not in url:
+                return httpx.Response(200, content=PAGE)
+            self.feed_requests.append((url, request.headers.get("If-None-Match")))
+            if not url.startswith("https://www.bom.gov.au/fwo/IDZ00060"):
+                return httpx.Response(503)
+            if request.headers.get("If-None-Match") == '"%d"' % len(self.feed):
+                return httpx.Response(304)
+            return httpx.Response(200, content=self.feed,
+                                  headers={"ETag": '"%d"' % len(self.feed)})
+
+        warnings._snapshot = None
+        warnings._polled_at = None
+        warnings._feed_validators.clear()
+        warnings._details_cache.clear()
+        upstream._clients[upstream.BOM] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        warnings._snapshot = None
+        warnings._polled_at = None
+        await upstream.close_clients()
+
+    async def test_snapshot_versioning_with_conditional_get(self):
+        first = await warnings.get_warnings_snapshot()
+        self.assertEqual(first.version, warnings.content_version(first.warnings))
+        self.assertEqual(first.url, warnings.WARNINGS_FEED_URLS[0])
+        self.assertEqual(len(first.warnings), 2)
+
+        unchanged = await warnings.refresh_warnings_snapshot()
+        self.assertIs(unchanged, first)
+        self.assertIn(("https://www.bom.gov.au/fwo/IDZ00060.warnings_wa.xml",
+                       '"%d"' % len(RSS)), self.feed_requests)
+
+        self.feed = RSS.replace(b"Swan River", b"Swan and Avon Rivers")
+        changed = await warnings.refresh_warnings_snapshot()
+        self.assertNotEqual(changed.version, first.version)
+        self.assertIs(await warnings.get_warnings_snapshot(), changed)
+
+    async def test_version_depends_only_on_content(self):
+        first = await warnings.refresh_warnings_snapshot()
+
+        # A full 200 download of identical content keeps the snapshot
+        warnings._feed_validators.clear()
+        self.assertIs(await warnings.refresh_warnings_snapshot(), first)
+
+        # Another process building from the same feed gets the same version
+        warnings._snapshot = None
+        warnings._feed_validators.clear()
+        restarted = await warnings.refresh_warnings_snapshot()
+        self.assertIsNot(restarted, first)
+        self.assertEqual(restarted.version, first.version)
+
+    async def test_stale_snapshot_refreshed_inline_without_poller(self):
+        with mock.patch.object(warnings.settings, "WARNINGS_POLLER_ENABLED", False), \
+                mock.patch.object(warnings.settings, "WARNINGS_POLL_INTERVAL_SECONDS", 60):
+            first = await warnings.get_warnings_snapshot()
+            self.feed = RSS.replace(b"Swan River", b"Swan and Avon Rivers")
+            self.assertIs(await warnings.get_warnings_snapshot(), first)
+            polls = len(self.feed_requests)
+
+            warnings._polled_at -= 61
+            refreshed = await asyncio.gather(
+                *(warnings.get_warnings_snapshot() for _ in range(3)))
+
+            latest = await warnings.get_warnings_snapshot()
+
+        self.assertIsNot(refreshed[0], first)
+        self.assertIs(latest, refreshed[0])
+        # Requests arriving during the refresh were served the previous
+        # snapshot instead of starting polls of their own
+        self.assertEqual(refreshed[1:], [first, first])
+        preferred = [url for url, _ in self.feed_requests[polls:]
+                     if url == warnings.WARNINGS_FEED_MIRRORS[0]]
+        self.assertEqual(len(preferred), 1)
+
+    async def test_subset_feeds_only_requested_when_mirrors_fail(self):
+        first = await warnings.refresh_warnings_snapshot()
+        requested = {url for url, _ in self.feed_requests}
+        self.assertFalse(requested & set(warnings.WARNINGS_SUBSET_FEEDS))
+
+        self.feed = b"not a feed"
+        warnings._feed_validators.clear()
+        self.feed_requests.clear()
+        self.assertIs(await warnings.refresh_warnings_snapshot(), first)
+        requested = [url for url, _ in self.feed_requests]
+        self.assertEqual(sorted(requested[:2]), sorted(warnings.WARNINGS_FEED_MIRRORS))
+        self.assertEqual(requested[2:], warnings.WARNINGS_SUBSET_FEEDS)
+
+    async def test_mirrors_are_raced(self):
+        slow_cancelled = asyncio.Event()
+
+        async def handler(request):
+            if request.url.scheme == "https":
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    slow_cancelled.set()
+                    raise
+            return httpx.Response(200, content=RSS)
+
+        await upstream.close_clients()
+        upstream._clients[upstream.BOM] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+        feed_data = await asyncio.wait_for(warnings.fetch_warnings_rss(), 1)
+        self.assertEqual(feed_data["url"], warnings.WARNINGS_FEED_MIRRORS[1])
+        await asyncio.wait_for(slow_cancelled.wait(), 1)
+
+    async def test_failed_poll_keeps_snapshot(self):
+        first = await warnings.refresh_warnings_snapshot()
+        self.feed = b"not a feed"
+        warnings._feed_validators.clear()
+        self.assertIs(await warnings.refresh_warnings_snapshot(), first)
+
+
+if __name__ == "__main__":
+    unittest.main()